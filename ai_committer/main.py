@@ -15,6 +15,7 @@ import sys
 import json
 import subprocess
 import datetime
+import tempfile
 from pathlib import Path
 from typing import Dict, List, Any
 import openai
@@ -23,6 +24,14 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Share the backend's instrumented LLM client
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from backend.app.core.llm import InstrumentedLLM
+
+# Bump when a prompt changes so its metrics can be compared per version
+NEXT_TASK_PROMPT_VERSION = "next-task-v1"
+EXECUTE_PROMPT_VERSION = "execute-v1"
+
 class AIOrchestrator:
     def __init__(self):
         self.project_root = Path(__file__).parent.parent
@@ -38,11 +47,24 @@ class AIOrchestrator:
         self.openai_client = None
         if openai_key := os.getenv('OPENAI_API_KEY'):
             from openai import OpenAI
-            self.openai_client = OpenAI(api_key=openai_key)
+            self.openai_client = InstrumentedLLM(
+                OpenAI(api_key=openai_key, base_url=os.getenv('OPENAI_BASE_URL'), max_retries=0),
+                log_path=self.llm_log_path()
+            )
         
         self.current_task = None
         self.commits_made = []
         
+    @staticmethod
+    def llm_log_path() -> str:
+        """
+        Where sampled prompts and responses go: LLM_LOG_DIR, else the temp
+        directory. Never the working tree, which the daily workflow commits
+        with `git add .`.
+        """
+        log_dir = Path(os.getenv('LLM_LOG_DIR') or Path(tempfile.gettempdir()) / 'levelup-ai')
+        return str(log_dir / 'llm_calls.jsonl')
+        
     def run_daily_loop(self):
         """Execute the complete daily development loop"""
         print("🚀 Starting AI Daily Development Loop")
@@ -153,7 +175,9 @@ class AIOrchestrator:
             }}
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = self.openai_client.create(
+                call_site="committer.next_task",
+                prompt_version=NEXT_TASK_PROMPT_VERSION,
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an AI developer working on a spaced repetition learning app. Suggest the next logical development task."},
@@ -213,7 +237,9 @@ class AIOrchestrator:
             What specific code changes should be made? Be concrete and actionable.
             """
             
-            response = self.openai_client.chat.completions.create(
+            response = self.openai_client.create(
+                call_site="committer.execute",
+                prompt_version=EXECUTE_PROMPT_VERSION,
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are an AI developer. Suggest specific, implementable code changes."},
@@ -0,0 +1,83 @@
+"""Conditional GET support: ETags derived from per-table version counters"""
+import hashlib
+from typing import Callable
+
+from fastapi import Depends, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.api.deps import get_current_user
+from backend.app.core.database import get_db
+from backend.app.core.metrics import registry
+from backend.app.core.table_versions import get_versions
+from backend.app.models import User
+
+etag_requests = registry.counter("http_etag_requests_total",
+                                 "Conditional-GET outcomes: not_modified (304), changed or unconditional",
+                                 ("result",))
+
+class NotModified(Exception):
+    """Raised by an ETag dependency when the client's copy is current"""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    # Weak comparison: W/"x" and "x" name the same representation
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+def table_etag(*tables: str) -> Callable:
+    """
+    Dependency that tags a GET response with the versions of the tables it reads.
+
+    The ETag covers the URL, the current user and each table's version, so
+    it changes with any write to those tables. A matching If-None-Match
+    raises NotModified before the endpoint runs its query.
+    """
+    def dependency(request: Request, db: Session = Depends(get_db),
+                   current_user: User = Depends(get_current_user)) -> str:
+        versions = get_versions(db, tables)
+        key = "|".join([request.url.path, request.url.query, str(current_user.id)] +
+                       [f"{table}:{versions[table]}" for table in tables])
+        etag = f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]}"'
+
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            etag_requests.inc(result="unconditional")
+        elif _matches(if_none_match, etag):
+            etag_requests.inc(result="not_modified")
+            raise NotModified(etag)
+        else:
+            etag_requests.inc(result="changed")
+        request.state.etag = etag
+        return etag
+
+    return dependency
+
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": "no-cache"})
+
+class ETagMiddleware:
+    """Add the ETag chosen by table_etag to successful responses, whatever response class the endpoint used"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get("etag")
+                if etag:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"etag", etag.encode("latin-1")))
+                    headers.append((b"cache-control", b"no-cache"))
+                    message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -0,0 +1,22 @@
+"""Home dashboard API endpoint"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from backend.app.core.database import get_db
+from backend.app.core.query_budget import query_budget
+from backend.app.api.deps import get_current_user
+from backend.app.models import User
+from backend.app.services.dashboard_service import DashboardService
+
+router = APIRouter()
+
+@router.get("")
+@router.get("/", include_in_schema=False)
+@query_budget(12)
+def get_dashboard(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Flashcard, category, YouTube, review and quiz attempt summaries in one response"""
+    service = DashboardService(db)
+    return service.get_dashboard(current_user.id)
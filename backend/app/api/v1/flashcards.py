@@ -1,29 +1,67 @@
 """Flashcard API endpoints using SQLAlchemy ORM"""
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import json
+from typing import Any, Dict, Iterator, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from backend.app.core.database import get_db
+from backend.app.core.batch import missing_ids_header, order_by_ids, parse_ids
+from backend.app.core.config import settings
+from backend.app.core.database import get_db, SessionLocal
+from backend.app.core.projection import parse_fields
+from backend.app.core.responses import FastJSONResponse
 from backend.app.api.deps import get_current_user
+from backend.app.api.etag import table_etag
+from backend.app.core.query_budget import query_budget
 from backend.app.models import User, Flashcard
-from backend.app.schemas.flashcard import FlashcardCreate, FlashcardUpdate, FlashcardResponse
-from backend.app.services.flashcard_service import FlashcardService
+from backend.app.schemas.flashcard import FlashcardCreate, FlashcardUpdate, FlashcardResponse, FlashcardGenerateRequest, FlashcardStreamRequest
+from backend.app.schemas.job import JobResponse
+from backend.app.services.ai_service import AIService
+from backend.app.services.dedupe_service import DuplicateFlashcardError
+from backend.app.services.flashcard_service import FlashcardService, FLASHCARD_FIELDS
+from backend.app.services.job_service import JobService
 
 router = APIRouter()
 
-@router.get("/", response_model=List[FlashcardResponse])
+IDS_DESCRIPTION = "Comma-separated ids to fetch in that order, replacing filters and pagination; missing ids are listed in the X-Missing-Ids header"
+
+@router.get("/", response_model=List[FlashcardResponse], dependencies=[Depends(table_etag("flashcards", "categories"))])
+@query_budget(6)
 def get_flashcards(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     category: Optional[str] = Query(None),
     difficulty: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,question (id is always included)"),
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all flashcards with optional filtering"""
+    """Get all flashcards with optional filtering, or specific ones by id"""
     service = FlashcardService(db)
     
+    try:
+        projection = parse_fields(fields, FLASHCARD_FIELDS)
+        requested_ids = parse_ids(ids, settings.batch_max_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if requested_ids is not None:
+        if projection:
+            rows = service.get_flashcard_fields(projection, ids=requested_ids)
+            rows, missing = order_by_ids({row["id"]: row for row in rows}, requested_ids)
+            return FastJSONResponse(rows, headers=missing_ids_header(missing))
+        flashcards, missing = service.get_flashcards_by_ids(requested_ids)
+        response.headers.update(missing_ids_header(missing))
+        return flashcards
+    
+    if projection:
+        return FastJSONResponse(service.get_flashcard_fields(
+            projection, skip, limit, search=search, category=category, difficulty=difficulty
+        ))
+    
     # Apply filters based on query parameters
     if search:
         flashcards = service.search_flashcards(search, skip, limit)
@@ -36,7 +74,8 @@ def get_flashcards(
     
     return flashcards
 
-@router.get("/{flashcard_id}", response_model=FlashcardResponse)
+@router.get("/{flashcard_id}", response_model=FlashcardResponse, dependencies=[Depends(table_etag("flashcards", "categories"))])
+@query_budget(6)
 def get_flashcard(
     flashcard_id: int,
     db: Session = Depends(get_db),
@@ -57,6 +96,7 @@ def get_flashcard(
 @router.post("/", response_model=FlashcardResponse, status_code=status.HTTP_201_CREATED)
 def create_flashcard(
     flashcard_data: FlashcardCreate,
+    allow_duplicate: bool = Query(False, description="Create the card even if it nearly matches an existing one"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -64,14 +104,86 @@ def create_flashcard(
     service = FlashcardService(db)
     
     try:
-        flashcard = service.create_flashcard(flashcard_data, current_user.id)
+        flashcard = service.create_flashcard(flashcard_data, current_user.id, allow_duplicates=allow_duplicate)
         return flashcard
+    except DuplicateFlashcardError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": str(e),
+                "duplicate_of": e.duplicate_of,
+                "similarity": round(e.similarity, 3)
+            }
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create flashcard: {str(e)}"
         )
 
+@router.post("/generate", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def generate_flashcards(
+    request: FlashcardGenerateRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue AI flashcard generation; poll /api/v1/jobs/{id} for the result"""
+    service = JobService(db)
+    
+    return service.enqueue_job("flashcards.generate", {
+        "text": request.text,
+        "max_cards": request.max_cards,
+        "category": request.category,
+        "owner_id": current_user.id
+    })
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def _generated_flashcard_events(ai_service: AIService, request: FlashcardStreamRequest, owner_id: int) -> Iterator[str]:
+    """Stream generated flashcards as SSE events, optionally saving each one"""
+    db = SessionLocal() if request.persist else None
+    count = 0
+    try:
+        for card in ai_service.stream_flashcards_from_text(request.text, request.max_cards):
+            if db is not None:
+                flashcard = FlashcardService(db).create_generated_flashcard(card, owner_id, request.category)
+                if not flashcard:
+                    continue
+                card = FlashcardResponse.model_validate(flashcard).model_dump(mode="json")
+            elif request.category:
+                card["category"] = request.category
+            
+            count += 1
+            yield _sse_event("flashcard", card)
+        
+        yield _sse_event("done", {"count": count})
+    except Exception as e:
+        yield _sse_event("error", {"detail": f"Failed to generate flashcards: {str(e)}", "count": count})
+    finally:
+        if db is not None:
+            db.close()
+
+@router.post("/generate/stream")
+def stream_generated_flashcards(
+    request: FlashcardStreamRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Generate flashcards and stream each one as a Server-Sent Event as soon as it is complete"""
+    ai_service = AIService()
+    if not ai_service.client:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="OpenAI API key not configured"
+        )
+    
+    return StreamingResponse(
+        _generated_flashcard_events(ai_service, request, current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.put("/{flashcard_id}", response_model=FlashcardResponse)
 def update_flashcard(
     flashcard_id: int,
@@ -131,7 +243,8 @@ def delete_flashcard(
             detail="Failed to delete flashcard"
         )
 
-@router.get("/stats/overview")
+@router.get("/stats/overview", dependencies=[Depends(table_etag("flashcards", "categories"))])
+@query_budget(8)
 def get_flashcard_statistics(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -145,7 +258,8 @@ def get_flashcard_statistics(
         "categories": [{"id": cat.id, "name": cat.name, "color": cat.color} for cat in service.get_categories()]
     }
 
-@router.get("/categories/")
+@router.get("/categories/", dependencies=[Depends(table_etag("categories"))])
+@query_budget(6)
 def get_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -156,7 +270,8 @@ def get_categories(
     
     return [{"id": cat.id, "name": cat.name, "description": cat.description, "color": cat.color} for cat in categories]
 
-@router.get("/my-flashcards/", response_model=List[FlashcardResponse])
+@router.get("/my-flashcards/", response_model=List[FlashcardResponse], dependencies=[Depends(table_etag("flashcards", "categories"))])
+@query_budget(6)
 def get_my_flashcards(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -0,0 +1,42 @@
+"""Background job API endpoints"""
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+
+from backend.app.core.database import get_db
+from backend.app.api.deps import get_current_user
+from backend.app.models import User
+from backend.app.schemas.job import JobResponse
+from backend.app.services.job_service import JobService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[JobResponse])
+def get_jobs(
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(queued|running|succeeded|failed)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get background jobs, newest first"""
+    service = JobService(db)
+    return service.get_jobs(status_filter, skip, limit)
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the status, progress and result of a background job"""
+    service = JobService(db)
+    job = service.get_job_by_id(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    
+    return job
@@ -1,10 +1,13 @@
 """Quiz API endpoints using SQLAlchemy ORM"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 
+from backend.app.core.batch import missing_ids_header, parse_ids
+from backend.app.core.config import settings
 from backend.app.core.database import get_db
 from backend.app.api.deps import get_current_user
+from backend.app.core.query_budget import query_budget
 from backend.app.models import User, Quiz, QuizAttempt
 from backend.app.schemas.quiz import (
     QuizCreate, QuizResponse, QuizAttemptCreate, QuizAttemptResponse, 
@@ -15,18 +18,32 @@ from backend.app.services.quiz_service import QuizService
 router = APIRouter()
 
 @router.get("/", response_model=List[QuizResponse])
+@query_budget(5)
 def get_quizzes(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    ids: Optional[str] = Query(None, description="Comma-separated ids to fetch in that order, replacing pagination; missing ids are listed in the X-Missing-Ids header"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all quizzes"""
+    """Get all quizzes, or specific ones by id"""
     service = QuizService(db)
+    
+    try:
+        requested_ids = parse_ids(ids, settings.batch_max_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if requested_ids is not None:
+        quizzes, missing = service.get_quizzes_by_ids(requested_ids)
+        response.headers.update(missing_ids_header(missing))
+        return quizzes
+    
     quizzes = service.get_all_quizzes(skip, limit)
     return quizzes
 
 @router.get("/{quiz_id}", response_model=QuizResponse)
+@query_budget(5)
 def get_quiz(
     quiz_id: int,
     db: Session = Depends(get_db),
@@ -45,6 +62,7 @@ def get_quiz(
     return quiz
 
 @router.post("/", response_model=QuizResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(11)
 def create_quiz(
     quiz_data: QuizCreate,
     db: Session = Depends(get_db),
@@ -63,6 +81,7 @@ def create_quiz(
         )
 
 @router.get("/{quiz_id}/questions", response_model=List[QuizQuestionResponse])
+@query_budget(5)
 def get_quiz_questions(
     quiz_id: int,
     db: Session = Depends(get_db),
@@ -106,6 +125,7 @@ def start_quiz_attempt(
         )
 
 @router.get("/attempts/{attempt_id}", response_model=QuizAttemptResponse)
+@query_budget(4)
 def get_quiz_attempt(
     attempt_id: int,
     db: Session = Depends(get_db),
@@ -199,6 +219,7 @@ def complete_quiz_attempt(
         )
 
 @router.get("/attempts/my-attempts", response_model=List[QuizAttemptResponse])
+@query_budget(4)
 def get_my_quiz_attempts(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -211,6 +232,7 @@ def get_my_quiz_attempts(
     return attempts
 
 @router.get("/{quiz_id}/statistics")
+@query_budget(7)
 def get_quiz_statistics(
     quiz_id: int,
     db: Session = Depends(get_db),
@@ -231,6 +253,7 @@ def get_quiz_statistics(
     return stats
 
 @router.delete("/{quiz_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(14)
 def delete_quiz(
     quiz_id: int,
     db: Session = Depends(get_db),
@@ -247,6 +270,7 @@ def delete_quiz(
         )
 
 @router.post("/generate-from-flashcards", response_model=QuizResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(11)
 def generate_quiz_from_flashcards(
     title: str = Query(..., description="Quiz title"),
     description: str = Query("", description="Quiz description"),
@@ -1,30 +1,80 @@
 """YouTube API endpoints using SQLAlchemy ORM"""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import os
+import shutil
+import uuid
+from fastapi import APIRouter, Depends, File, HTTPException, Response, status, Query, UploadFile
 from sqlalchemy.orm import Session
 
+from backend.app.core.batch import missing_ids_header, order_by_ids, parse_ids
+from backend.app.core.config import settings
 from backend.app.core.database import get_db
+from backend.app.core.projection import parse_fields
+from backend.app.core.responses import FastJSONResponse
 from backend.app.api.deps import get_current_user
+from backend.app.api.etag import table_etag
+from backend.app.core.query_budget import query_budget
 from backend.app.models import User, YouTubeCard
-from backend.app.schemas.youtube import YouTubeCardCreate, YouTubeCardUpdate, YouTubeCardResponse
-from backend.app.services.youtube_service import YouTubeService
+from backend.app.schemas.youtube import (
+    YouTubeCardCreate, YouTubeCardUpdate, YouTubeCardResponse, YouTubeCardSummary,
+    YouTubeExtractRequest, YouTubeExtractResponse, TranscriptSegmentResponse
+)
+from backend.app.schemas.flashcard import FlashcardResponse
+from backend.app.schemas.job import JobResponse
+from backend.app.services.youtube_service import YouTubeService, YOUTUBE_CARD_FIELDS
+from backend.app.services.flashcard_service import FlashcardService
+from backend.app.services.job_service import JobService
 
 router = APIRouter()
 
-@router.get("/", response_model=List[YouTubeCardResponse])
+FIELDS_DESCRIPTION = "Comma-separated columns to return, e.g. id,title,url (id is always included)"
+IDS_DESCRIPTION = "Comma-separated ids to fetch in that order, replacing filters and pagination; missing ids are listed in the X-Missing-Ids header"
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    try:
+        return parse_fields(fields, YOUTUBE_CARD_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/", response_model=List[YouTubeCardSummary], dependencies=[Depends(table_etag("youtube_cards"))])
+@query_budget(6)
 def get_youtube_cards(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
     channel: Optional[str] = Query(None),
     with_transcripts: Optional[bool] = Query(None),
     without_flashcards: Optional[bool] = Query(None),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    ids: Optional[str] = Query(None, description=IDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all YouTube cards with optional filtering"""
+    """Get all YouTube cards with optional filtering, or specific ones by id"""
     service = YouTubeService(db)
     
+    projection = _parse_fields(fields)
+    try:
+        requested_ids = parse_ids(ids, settings.batch_max_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if requested_ids is not None:
+        if projection:
+            rows = service.get_youtube_card_fields(projection, ids=requested_ids)
+            rows, missing = order_by_ids({row["id"]: row for row in rows}, requested_ids)
+            return FastJSONResponse(rows, headers=missing_ids_header(missing))
+        youtube_cards, missing = service.get_youtube_cards_by_ids(requested_ids)
+        response.headers.update(missing_ids_header(missing))
+        return youtube_cards
+    
+    if projection:
+        return FastJSONResponse(service.get_youtube_card_fields(
+            projection, skip, limit, search=search, channel=channel,
+            with_transcripts=with_transcripts, without_flashcards=without_flashcards
+        ))
+    
     # Apply filters based on query parameters
     if search:
         youtube_cards = service.search_youtube_cards(search, skip, limit)
@@ -39,7 +89,8 @@ def get_youtube_cards(
     
     return youtube_cards
 
-@router.get("/{card_id}", response_model=YouTubeCardResponse)
+@router.get("/{card_id}", response_model=YouTubeCardResponse, dependencies=[Depends(table_etag("youtube_cards"))])
+@query_budget(6)
 def get_youtube_card(
     card_id: int,
     db: Session = Depends(get_db),
@@ -75,6 +126,65 @@ def create_youtube_card(
             detail=f"Failed to create YouTube card: {str(e)}"
         )
 
+@router.post("/extract", response_model=YouTubeExtractResponse)
+def extract_youtube_content(
+    request: YouTubeExtractRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Fetch transcripts for one or more YouTube URLs concurrently and save them as YouTube cards"""
+    service = YouTubeService(db)
+    
+    try:
+        results = service.ingest_urls(request.all_urls(), request.languages, refresh=request.refresh)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to extract YouTube content: {str(e)}"
+        )
+    
+    # Generation jobs would only fail without an API key; the transcripts are still saved
+    if request.generate_flashcards and settings.OPENAI_API_KEY:
+        jobs = JobService(db)
+        queued = {}
+        for result in results:
+            card_id = result["card_id"]
+            if result["status"] not in ("created", "updated") or not result["transcript_length"]:
+                continue
+            if card_id not in queued:
+                # The handler reads the transcript from the card, keeping it out of the jobs table
+                queued[card_id] = jobs.enqueue_job("flashcards.generate", {
+                    "max_cards": request.max_flashcards,
+                    "owner_id": current_user.id,
+                    "source_youtube_card_id": card_id
+                }).id
+            result["generation_job_id"] = queued[card_id]
+    
+    return {
+        "results": results,
+        "created": sum(1 for result in results if result["status"] == "created"),
+        "updated": sum(1 for result in results if result["status"] == "updated"),
+        "existing": sum(1 for result in results if result["status"] == "existing"),
+        "failed": sum(1 for result in results if result["status"] == "failed")
+    }
+
+@router.post("/watch-history", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def import_watch_history(
+    file: UploadFile = File(..., description="watch-history.json from Google Takeout"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue an import of a watch-history export; poll /api/v1/jobs/{id} for progress"""
+    upload_dir = os.path.join(settings.data_dir, "uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    path = os.path.join(upload_dir, f"watch-history-{uuid.uuid4().hex}.json")
+    
+    # Copy in chunks so a large export never sits in memory
+    with open(path, "wb") as f:
+        shutil.copyfileobj(file.file, f, 1024 * 1024)
+    
+    return JobService(db).enqueue_job("youtube.watch_history", {"path": path, "owner_id": current_user.id})
+
 @router.put("/{card_id}", response_model=YouTubeCardResponse)
 def update_youtube_card(
     card_id: int,
@@ -118,7 +228,7 @@ def delete_youtube_card(
             detail="YouTube card not found"
         )
 
-@router.get("/stats/overview")
+@router.get("/stats/overview", dependencies=[Depends(table_etag("youtube_cards"))])
 def get_youtube_statistics(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -128,10 +238,12 @@ def get_youtube_statistics(
     
     return {
         "total_cards": service.get_youtube_card_count(),
-        "recent_cards": service.get_recent_youtube_cards(limit=5)
+        "recent_cards": [
+            YouTubeCardSummary.model_validate(card) for card in service.get_recent_youtube_cards(limit=5)
+        ]
     }
 
-@router.get("/recent/", response_model=List[YouTubeCardResponse])
+@router.get("/recent/", response_model=List[YouTubeCardSummary], dependencies=[Depends(table_etag("youtube_cards"))])
 def get_recent_youtube_cards(
     limit: int = Query(10, ge=1, le=50),
     db: Session = Depends(get_db),
@@ -142,7 +254,7 @@ def get_recent_youtube_cards(
     cards = service.get_recent_youtube_cards(limit)
     return cards
 
-@router.get("/with-transcripts/", response_model=List[YouTubeCardResponse])
+@router.get("/with-transcripts/", response_model=List[YouTubeCardSummary], dependencies=[Depends(table_etag("youtube_cards"))])
 def get_youtube_cards_with_transcripts(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -154,7 +266,7 @@ def get_youtube_cards_with_transcripts(
     cards = service.get_youtube_cards_with_transcripts(skip, limit)
     return cards
 
-@router.get("/without-flashcards/", response_model=List[YouTubeCardResponse])
+@router.get("/without-flashcards/", response_model=List[YouTubeCardSummary], dependencies=[Depends(table_etag("youtube_cards"))])
 def get_youtube_cards_without_flashcards(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -166,39 +278,139 @@ def get_youtube_cards_without_flashcards(
     cards = service.get_youtube_cards_without_flashcards(skip, limit)
     return cards
 
-@router.post("/{card_id}/update-flashcard-count")
-def update_flashcard_count(
+@router.get("/{card_id}/flashcards", response_model=List[FlashcardResponse],
+            dependencies=[Depends(table_etag("youtube_cards", "flashcards", "categories"))])
+def get_youtube_card_flashcards(
     card_id: int,
-    count: int = Query(..., ge=0),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Update the flashcard count for a YouTube card"""
+    """Get the flashcards generated from a YouTube card"""
+    if not YouTubeService(db).get_youtube_card_by_id(card_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="YouTube card not found"
+        )
+    
+    return FlashcardService(db).get_flashcards_by_source(card_id, skip, limit)
+
+@router.post("/{card_id}/recount-flashcards", response_model=YouTubeCardSummary)
+def recount_flashcards(
+    card_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Recompute a YouTube card's flashcard count from the flashcards linked to it"""
     service = YouTubeService(db)
     
-    success = service.update_flashcard_count(card_id, count)
-    if not success:
+    if not service.recount_flashcards(card_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="YouTube card not found"
         )
     
-    return {"message": f"Flashcard count updated to {count}"}
+    return service.get_youtube_card_by_id(card_id)
 
-@router.get("/search/")
+@router.post("/{card_id}/extract-transcript", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def extract_transcript(
+    card_id: int,
+    generate_flashcards: bool = Query(False, description="Queue flashcard generation once the transcript is saved"),
+    max_flashcards: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue transcript extraction for a YouTube card; poll /api/v1/jobs/{id} for progress"""
+    service = YouTubeService(db)
+    
+    if not service.get_youtube_card_by_id(card_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="YouTube card not found"
+        )
+    
+    return JobService(db).enqueue_job("youtube.transcript", {
+        "card_id": card_id,
+        "generate_flashcards": generate_flashcards,
+        "max_flashcards": max_flashcards,
+        "owner_id": current_user.id
+    })
+
+@router.get("/{card_id}/segments", response_model=List[TranscriptSegmentResponse],
+            dependencies=[Depends(table_etag("youtube_cards", "transcript_segments"))])
+def get_transcript_segments(
+    card_id: int,
+    start_ms: int = Query(0, ge=0, description="Window start in milliseconds"),
+    end_ms: Optional[int] = Query(None, ge=0, description="Window end in milliseconds (exclusive)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the timed transcript segments of a YouTube card that overlap a time window"""
+    service = YouTubeService(db)
+    
+    if not service.get_youtube_card_by_id(card_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="YouTube card not found"
+        )
+    
+    return service.get_segments(card_id, start_ms, end_ms)
+
+@router.post("/{card_id}/generate-flashcards", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def generate_window_flashcards(
+    card_id: int,
+    start_ms: int = Query(0, ge=0, description="Window start in milliseconds"),
+    end_ms: Optional[int] = Query(None, ge=0, description="Window end in milliseconds (exclusive)"),
+    max_flashcards: int = Query(5, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue flashcard generation from the part of a video's transcript inside a time window"""
+    service = YouTubeService(db)
+    
+    if not service.get_youtube_card_by_id(card_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="YouTube card not found"
+        )
+    
+    text = service.get_window_text(card_id, start_ms, end_ms)
+    if not text:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No timed transcript segments in this window; extract the transcript first"
+        )
+    
+    # The handler reads the window again when it runs, rather than storing the text in the job
+    return JobService(db).enqueue_job("flashcards.generate", {
+        "max_cards": max_flashcards,
+        "owner_id": current_user.id,
+        "source_youtube_card_id": card_id,
+        "start_ms": start_ms,
+        "end_ms": end_ms
+    })
+
+@router.get("/search/", response_model=List[YouTubeCardSummary], dependencies=[Depends(table_etag("youtube_cards"))])
 def search_youtube_cards(
     q: str = Query(..., min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Search YouTube cards"""
     service = YouTubeService(db)
+    
+    projection = _parse_fields(fields)
+    if projection:
+        return FastJSONResponse(service.get_youtube_card_fields(projection, skip, limit, search=q))
+    
     cards = service.search_youtube_cards(q, skip, limit)
     return cards
 
-@router.get("/by-channel/{channel}")
+@router.get("/by-channel/{channel}", response_model=List[YouTubeCardSummary], dependencies=[Depends(table_etag("youtube_cards"))])
 def get_youtube_cards_by_channel(
     channel: str,
     skip: int = Query(0, ge=0),
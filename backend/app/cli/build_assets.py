@@ -0,0 +1,139 @@
+"""
+Static asset build
+
+Copies every file under frontend/static to the asset build directory with a
+content hash in its name (js/app.js -> js/app.3f9c2a1b7d04.js), writes
+gzip and brotli variants of text assets next to it, and records the names
+in manifest.json for templates to look up. Hashed files replaced by the
+build stay in place for asset_grace_period seconds (listed in retired.json),
+so pages loaded before a deploy can still fetch them. Run from the project
+root after changing the frontend:
+
+    python -m backend.app.cli.build_assets
+    python -m backend.app.cli.build_assets --source frontend/static --output frontend/dist
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Optional
+
+from backend.app.core.config import settings
+from backend.app.core.http_compression import brotli
+from backend.app.core.static_assets import MANIFEST_NAME, PRECOMPRESSED_SUFFIXES, RETIRED_NAME
+
+# Text formats worth precompressing; images and fonts are compressed already
+COMPRESSIBLE = {".css", ".js", ".mjs", ".html", ".svg", ".json", ".map", ".txt", ".xml"}
+HASH_LENGTH = 12
+
+def fingerprinted_name(name: str, data: bytes) -> str:
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{extension}"
+
+def _write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _read_json(path: str) -> Dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _carry_over_retired(previous: str, staging: str, manifest: Dict[str, str], grace_period: int) -> Dict[str, float]:
+    """
+    Copy hashed files of the previous build that this build no longer has
+    into staging, unless they were retired more than grace_period seconds
+    ago. Returns the retired names with the time each was first retired.
+    """
+    now = time.time()
+    current = set(manifest.values())
+    retired = {name: now for name in _read_json(os.path.join(previous, MANIFEST_NAME)).values()}
+    retired.update(_read_json(os.path.join(previous, RETIRED_NAME)))
+    kept = {}
+    for name, retired_at in retired.items():
+        if name in current or now - retired_at > grace_period:
+            continue
+        for suffix in ("",) + PRECOMPRESSED_SUFFIXES:
+            source_path = os.path.join(previous, name + suffix)
+            if os.path.exists(source_path):
+                os.makedirs(os.path.dirname(os.path.join(staging, name)), exist_ok=True)
+                shutil.copy2(source_path, os.path.join(staging, name + suffix))
+        kept[name] = retired_at
+    return kept
+
+def build_assets(source: str, output: str, brotli_quality: int = 11,
+                 grace_period: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Build into a staging directory and swap it in, so the server never sees
+    a half-written build. Hashed files of the previous build stay for
+    grace_period seconds (asset_grace_period by default). Returns sizes per
+    source name.
+    """
+    grace_period = settings.asset_grace_period if grace_period is None else grace_period
+    parent = os.path.dirname(os.path.abspath(output))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".assets-", dir=parent)
+    manifest, report = {}, {}
+    for root, _, files in os.walk(source):
+        for file_name in sorted(files):
+            name = os.path.relpath(os.path.join(root, file_name), source).replace(os.sep, "/")
+            with open(os.path.join(root, file_name), "rb") as f:
+                data = f.read()
+            hashed = fingerprinted_name(name, data)
+            target = os.path.join(staging, hashed)
+            _write(target, data)
+            manifest[name] = hashed
+            sizes = {"hashed": hashed, "bytes": len(data)}
+
+            if os.path.splitext(name)[1] in COMPRESSIBLE:
+                # mtime=0 keeps the gzip output identical between builds of the same file
+                variants = {"gzip": (".gz", gzip.compress(data, compresslevel=9, mtime=0))}
+                if brotli is not None:
+                    variants["br"] = (".br", brotli.compress(data, quality=brotli_quality))
+                for encoding, (suffix, compressed) in variants.items():
+                    if len(compressed) < len(data):
+                        _write(target + suffix, compressed)
+                        sizes[encoding] = len(compressed)
+            report[name] = sizes
+
+    if os.path.isdir(output):
+        retired = _carry_over_retired(output, staging, manifest, grace_period)
+        with open(os.path.join(staging, RETIRED_NAME), "w", encoding="utf-8") as f:
+            json.dump(retired, f, indent=2, sort_keys=True)
+    with open(os.path.join(staging, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    previous = None
+    if os.path.exists(output):
+        previous = tempfile.mkdtemp(prefix=".assets-old-", dir=parent)
+        os.rename(output, os.path.join(previous, "build"))
+    os.rename(staging, output)
+    if previous:
+        shutil.rmtree(previous)
+    return report
+
+def main():
+    """Fingerprint and precompress the static assets"""
+    parser = argparse.ArgumentParser(description="Build fingerprinted, precompressed static assets")
+    parser.add_argument("--source", default="frontend/static", help="Directory of source assets")
+    parser.add_argument("--output", default=settings.asset_build_dir, help="Build directory, replaced on each run")
+    parser.add_argument("--brotli-quality", type=int, default=11)
+    args = parser.parse_args()
+
+    report = build_assets(args.source, args.output, args.brotli_quality)
+    if brotli is None:
+        print("brotli is not installed; writing gzip variants only (pip install brotli)")
+    print(f"{'asset':<24} {'bytes':>8} {'gzip':>8} {'br':>8}  fingerprinted name")
+    for name, sizes in report.items():
+        print(f"{name:<24} {sizes['bytes']:>8} {sizes.get('gzip', '-'):>8} {sizes.get('br', '-'):>8}  {sizes['hashed']}")
+    print(f"Wrote {len(report)} assets and {MANIFEST_NAME} to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Near-duplicate flashcard report
+
+Groups the deck into clusters of near-duplicate flashcards using the MinHash
+signature index. Run from the project root:
+
+    python -m backend.app.cli.dedupe_report --threshold 0.7
+    python -m backend.app.cli.dedupe_report --json > duplicates.json
+"""
+import argparse
+import json
+import time
+
+from backend.app.core.config import settings
+from backend.app.core.database import SessionLocal, init_db
+from backend.app.services.dedupe_service import DedupeService
+
+def main():
+    """Print clusters of near-duplicate flashcards"""
+    parser = argparse.ArgumentParser(description="Report near-duplicate flashcards")
+    parser.add_argument("--threshold", type=float, default=settings.dedupe_threshold,
+                        help="Estimated Jaccard similarity at which cards count as duplicates")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        service = DedupeService(db)
+        report = service.duplicate_report(args.threshold)
+        elapsed = time.perf_counter() - start
+        indexed = len(service.index)
+    finally:
+        db.close()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    duplicate_count = sum(len(cluster["duplicates"]) for cluster in report)
+    print(f"🔍 Scanned {indexed} flashcards in {elapsed:.2f}s (threshold {args.threshold})")
+    print(f"📋 {len(report)} clusters, {duplicate_count} removable duplicates")
+    for cluster in report:
+        print("-" * 50)
+        for card in cluster["flashcards"]:
+            marker = "keep" if card["id"] == cluster["keep"] else "dup "
+            print(f"  [{marker}] #{card['id']} ({card['max_similarity']:.2f}) {card['question'][:80]}")
+
+if __name__ == "__main__":
+    main()
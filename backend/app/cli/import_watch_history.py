@@ -0,0 +1,56 @@
+"""
+Watch-history importer
+
+Streams a Google Takeout watch-history.json into YouTube cards without
+loading the file into memory. Videos that already have a card are skipped.
+Run from the project root:
+
+    python -m backend.app.cli.import_watch_history Takeout/YouTube/history/watch-history.json
+    python -m backend.app.cli.import_watch_history watch-history.json --batch-size 1000 --json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from backend.app.core.config import settings
+from backend.app.core.database import SessionLocal, init_db
+from backend.app.services.watch_history_service import WatchHistoryService
+
+def main():
+    """Import a watch-history export and print progress"""
+    parser = argparse.ArgumentParser(description="Import a YouTube watch-history export")
+    parser.add_argument("path", help="Path to watch-history.json")
+    parser.add_argument("--batch-size", type=int, default=settings.watch_history_batch_size,
+                        help="Cards inserted per transaction")
+    parser.add_argument("--json", action="store_true", help="Print the final statistics as JSON")
+    args = parser.parse_args()
+
+    total = max(os.path.getsize(args.path), 1)
+    start = time.perf_counter()
+
+    def progress(stats):
+        if not args.json:
+            print(f"\r{min(stats['characters'] / total, 1.0):6.1%}  {stats['entries']} entries, "
+                  f"{stats['imported']} imported, {stats['existing']} already known", end="", file=sys.stderr, flush=True)
+
+    init_db()
+    db = SessionLocal()
+    try:
+        with open(args.path, "rb") as f:
+            stats = WatchHistoryService(db).import_file(f, args.batch_size, progress)
+    finally:
+        db.close()
+
+    stats["seconds"] = round(time.perf_counter() - start, 2)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+
+    print(file=sys.stderr)
+    print(f"Imported {stats['imported']} new videos from {stats['entries']} entries in {stats['seconds']}s "
+          f"({stats['existing']} already known, {stats['skipped']} without a video)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+LLM call report
+
+Summarises the sampled LLM call log (data/llm_calls.jsonl) per call site and
+prompt version, to spot latency or token regressions between prompt versions:
+
+    python -m backend.app.cli.llm_report
+    python -m backend.app.cli.llm_report --since 2025-01-01 --json
+"""
+import argparse
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.app.core.config import settings
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def summarise(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Aggregate log entries by call site and prompt version"""
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for entry in entries:
+        groups.setdefault((entry.get("call_site", ""), entry.get("prompt_version", "")), []).append(entry)
+
+    rows = []
+    for (call_site, prompt_version), items in sorted(groups.items()):
+        # Streams closed early by the caller (e.g. after max_cards) still measured a full round trip
+        successes = [item for item in items if item.get("outcome") != "error"]
+        latencies = [item["latency"] for item in successes]
+        first_tokens = [item["time_to_first_token"] for item in successes if item.get("time_to_first_token") is not None]
+        completion_tokens = [item["completion_tokens"] for item in successes if item.get("completion_tokens") is not None]
+        finish_reasons: Dict[str, int] = {}
+        for item in successes:
+            reason = item.get("finish_reason") or "unknown"
+            finish_reasons[reason] = finish_reasons.get(reason, 0) + 1
+
+        rows.append({
+            "call_site": call_site,
+            "prompt_version": prompt_version,
+            "calls": len(items),
+            "errors": sum(1 for item in items if item.get("outcome") == "error"),
+            "retries": sum(item.get("retries", 0) for item in items),
+            "queue_wait_p95": percentile([item.get("queue_wait", 0.0) for item in items], 95),
+            "ttft_p50": percentile(first_tokens, 50),
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "completion_tokens_mean": sum(completion_tokens) / len(completion_tokens) if completion_tokens else None,
+            "finish_reasons": finish_reasons
+        })
+    return rows
+
+def _seconds(value: Optional[float]) -> str:
+    return f"{value:.3f}" if value is not None else "-"
+
+def main():
+    """Print latency, token and retry statistics from the LLM call log"""
+    parser = argparse.ArgumentParser(description="Summarise the sampled LLM call log")
+    parser.add_argument("--log", default=os.path.join(settings.data_dir, "llm_calls.jsonl"))
+    parser.add_argument("--since", help="Only include calls at or after this ISO timestamp")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.log):
+        print(f"No LLM call log at {args.log}")
+        return
+
+    entries = []
+    with open(args.log, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if args.since and entry.get("timestamp", "") < args.since:
+                continue
+            entries.append(entry)
+
+    rows = summarise(entries)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    header = f"{'call site':<22} {'prompt':<14} {'calls':>6} {'errs':>5} {'retry':>5} {'wait p95':>9} {'ttft p50':>9} {'p50 s':>7} {'p95 s':>7} {'tokens':>7}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        tokens = f"{row['completion_tokens_mean']:.0f}" if row["completion_tokens_mean"] is not None else "-"
+        print(f"{row['call_site']:<22} {row['prompt_version']:<14} {row['calls']:>6} {row['errors']:>5} {row['retries']:>5} "
+              f"{_seconds(row['queue_wait_p95']):>9} {_seconds(row['ttft_p50']):>9} {_seconds(row['latency_p50']):>7} "
+              f"{_seconds(row['latency_p95']):>7} {tokens:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Batch fetch by primary key for list endpoints (the ids= query parameter)"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+# Response header listing requested ids that have no row, in request order
+MISSING_IDS_HEADER = "X-Missing-Ids"
+
+def parse_ids(ids: Optional[str], max_ids: int) -> Optional[List[int]]:
+    """
+    Split a comma-separated ids parameter into integers, dropping repeats.
+
+    Returns None when no ids were requested. Raises ValueError for values
+    that are not integers or for more than max_ids distinct ids.
+    """
+    if not ids:
+        return None
+
+    values = [value.strip() for value in ids.split(",") if value.strip()]
+    invalid = [value for value in values if not value.isdigit()]
+    if invalid:
+        raise ValueError(f"ids must be comma-separated integers, got: {', '.join(invalid)}")
+
+    parsed = list(dict.fromkeys(int(value) for value in values))
+    if len(parsed) > max_ids:
+        raise ValueError(f"At most {max_ids} ids can be requested at once, got {len(parsed)}")
+    return parsed
+
+def order_by_ids(rows_by_id: Dict[int, Any], ids: Sequence[int]) -> Tuple[List[Any], List[int]]:
+    """Rows in the order their ids were requested, and the requested ids with no row"""
+    return [rows_by_id[id_] for id_ in ids if id_ in rows_by_id], [id_ for id_ in ids if id_ not in rows_by_id]
+
+def fetch_by_ids(db: Session, model: Any, ids: Sequence[int], options: Iterable[Any] = ()) -> Tuple[List[Any], List[int]]:
+    """
+    Load model rows for ids with a single IN query, in request order.
+
+    Objects the session already holds come from its identity map, so only
+    the remaining ids are queried. Returns the rows and the missing ids.
+    """
+    found = {}
+    for id_ in ids:
+        instance = db.identity_map.get(identity_key(model, id_))
+        # Expired objects (e.g. after a commit) would each reload with their own query
+        if instance is not None and not inspect(instance).expired_attributes:
+            found[id_] = instance
+
+    pending = [id_ for id_ in ids if id_ not in found]
+    if pending:
+        found.update(
+            (instance.id, instance)
+            for instance in db.scalars(select(model).where(model.id.in_(pending)).options(*options))
+        )
+    return order_by_ids(found, ids)
+
+def missing_ids_header(missing: Sequence[int]) -> Dict[str, str]:
+    return {MISSING_IDS_HEADER: ",".join(map(str, missing))} if missing else {}
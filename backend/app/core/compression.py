@@ -0,0 +1,54 @@
+"""Compression for large text columns (zstd when installed, zlib otherwise)"""
+import zlib
+from typing import Optional
+
+from backend.app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+# First byte of every stored value names the codec, so rows written with
+# different codecs (or before zstandard was installed) stay readable
+RAW = b"\x00"
+ZLIB = b"\x01"
+ZSTD = b"\x02"
+
+def available_codec(preferred: Optional[str] = None) -> str:
+    """The configured codec, falling back to zlib when zstandard is missing"""
+    codec = preferred or settings.text_compression
+    if codec == "zstd" and zstandard is None:
+        return "zlib"
+    return codec
+
+def compress_text(text: Optional[str], codec: Optional[str] = None) -> Optional[bytes]:
+    """Compress text for storage; None stays None"""
+    if text is None:
+        return None
+
+    data = text.encode("utf-8")
+    codec = available_codec(codec)
+    if codec == "zstd":
+        return ZSTD + zstandard.ZstdCompressor(level=settings.text_compression_level).compress(data)
+    if codec == "zlib":
+        return ZLIB + zlib.compress(data, min(settings.text_compression_level, 9))
+    if codec == "none":
+        return RAW + data
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+def decompress_text(blob: Optional[bytes]) -> Optional[str]:
+    """Decompress a value written by compress_text"""
+    if blob is None:
+        return None
+
+    header, payload = blob[:1], blob[1:]
+    if header == ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if header == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this value; pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    if header == RAW:
+        return payload.decode("utf-8")
+    raise ValueError("Unknown compression header")
@@ -0,0 +1,153 @@
+"""Per-route-group concurrency limits with bounded queues, as ASGI middleware"""
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import registry
+
+limiter_in_flight = registry.gauge("http_limiter_in_flight", "Requests holding a concurrency slot", ("group",))
+limiter_queue_depth = registry.gauge("http_limiter_queue_depth", "Requests waiting for a concurrency slot", ("group",))
+limiter_wait = registry.histogram("http_limiter_wait_seconds", "Time requests waited for a concurrency slot", ("group",),
+                                  buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+limiter_rejected = registry.counter("http_limiter_rejected_total", "Requests turned away by a concurrency limit",
+                                    ("group", "reason"))
+
+# Checked in order; the first match names the group. Anything else under /api/ is a read or a write.
+ROUTE_GROUPS = [
+    ("imports", {"POST"}, re.compile(r"^/api/v1/youtube/watch-history$")),
+    ("ai", {"POST"}, re.compile(r"^/api/v1/(flashcards/generate/stream|youtube/extract)$")),
+]
+EXEMPT_PATHS = {"/api/v1/health"}
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+def route_group(method: str, path: str) -> Optional[str]:
+    """The limiter group for a request, or None for requests that are never limited"""
+    if not path.startswith("/api/") or path in EXEMPT_PATHS:
+        return None
+    for group, methods, pattern in ROUTE_GROUPS:
+        if method in methods and pattern.match(path):
+            return group
+    return "reads" if method in READ_METHODS else "writes"
+
+class Saturated(Exception):
+    """Raised when a group's queue is full or the wait for a slot timed out"""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+
+class GroupLimiter:
+    """
+    At most `limit` concurrent requests, with at most `max_queue` waiting in
+    FIFO order for up to `timeout` seconds. Used from the event loop only,
+    so plain counters need no lock.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            limiter_in_flight.inc(group=self.name)
+            limiter_wait.observe(0.0, group=self.name)
+            return
+        if len(self.waiters) >= self.max_queue:
+            limiter_rejected.inc(group=self.name, reason="queue_full")
+            raise Saturated("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        limiter_queue_depth.inc(group=self.name)
+        started = time.perf_counter()
+        granted = False
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+            granted = True
+        except asyncio.TimeoutError:
+            # The slot may have been handed over just as the wait expired
+            granted = waiter.done()
+        finally:
+            limiter_queue_depth.dec(group=self.name)
+            limiter_wait.observe(time.perf_counter() - started, group=self.name)
+            if not granted:
+                if waiter.done():
+                    # Cancelled (client went away) after being handed a slot: pass it on
+                    self._pass_slot()
+                else:
+                    self.waiters.remove(waiter)
+                    waiter.cancel()
+        if not granted:
+            limiter_rejected.inc(group=self.name, reason="timeout")
+            raise Saturated("timeout")
+        limiter_in_flight.inc(group=self.name)
+
+    def release(self) -> None:
+        limiter_in_flight.dec(group=self.name)
+        self._pass_slot()
+
+    def _pass_slot(self) -> None:
+        # Hand the slot straight to the oldest waiter, so active stays the same
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+class ConcurrencyLimitMiddleware:
+    """
+    Limit concurrent requests per route group (reads, writes, ai, imports).
+
+    A slot is held until the response has been sent, so streaming responses
+    count for their whole duration. Requests that find the queue full, or
+    wait longer than the queue timeout, get 503 with Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Optional[Dict[str, int]] = None,
+                 queue_sizes: Optional[Dict[str, int]] = None, timeout: Optional[float] = None,
+                 retry_after: Optional[int] = None):
+        self.app = app
+        limits = settings.concurrency_limits if limits is None else limits
+        queue_sizes = settings.concurrency_queue_sizes if queue_sizes is None else queue_sizes
+        timeout = settings.concurrency_queue_timeout if timeout is None else timeout
+        self.retry_after = settings.concurrency_retry_after if retry_after is None else retry_after
+        # A limit of 0 leaves the group unlimited
+        self.limiters = {
+            group: GroupLimiter(group, limit, queue_sizes.get(group, 0), timeout)
+            for group, limit in limits.items() if limit > 0
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = None
+        if scope["type"] == "http":
+            limiter = self.limiters.get(route_group(scope["method"], scope["path"]))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except Saturated as e:
+            response = JSONResponse(
+                {"detail": f"Server busy ({limiter.name} requests); retry shortly", "reason": e.reason},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -1,6 +1,6 @@
 """Configuration settings for LevelUp AI"""
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -15,22 +15,110 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     
+    # Server processes (run.py)
+    server_mode: str = "development"  # "development" (one process, reload when debug) or "production"
+    workers: int = 0  # Production worker processes; 0 starts one per CPU
+    server_preload: bool = False  # Import the app once and fork the workers from it (needs gunicorn)
+    server_loop: str = "auto"  # "auto" (uvloop when installed), "uvloop" or "asyncio"
+    server_http: str = "auto"  # "auto" (httptools when installed), "httptools" or "h11"
+    keepalive_timeout: int = 5  # Seconds an idle keep-alive connection is held open
+    server_backlog: int = 2048  # Connections the listening socket queues before refusing
+    graceful_timeout: int = 30  # Seconds in-flight requests get to finish on shutdown or restart
+    
     # API settings
     api_v1_prefix: str = "/api/v1"
+    batch_max_ids: int = 500  # Most ids one ids= request on a list endpoint may ask for
     
     # Directory paths
     data_dir: str = "data"
     static_dir: str = "../frontend/static"
     templates_dir: str = "../frontend/templates"
     
+    # Static assets
+    asset_build_dir: str = "frontend/dist"  # Output of `python -m backend.app.cli.build_assets`, served ahead of frontend/static
+    asset_max_age: int = 365 * 24 * 3600  # Cache lifetime of fingerprinted assets
+    asset_grace_period: int = 24 * 3600  # Seconds a rebuild keeps serving the hashed files it replaced
+    
+    # HTTP responses
+    response_compression: str = "auto"  # "auto" (brotli if installed, else gzip), "gzip" or "none"
+    compression_minimum_size: int = 1024  # Smaller bodies are sent uncompressed
+    gzip_level: int = 6
+    brotli_quality: int = 4
+    
+    # Request concurrency per route group (reads, writes, ai, imports); keep the
+    # limits' sum under threadpool_size so unlimited routes such as /health always get a thread
+    threadpool_size: int = 40  # Worker threads shared by sync endpoints
+    concurrency_limits: Dict[str, int] = {"reads": 24, "writes": 8, "ai": 4, "imports": 1}  # 0 leaves a group unlimited
+    concurrency_queue_sizes: Dict[str, int] = {"reads": 64, "writes": 32, "ai": 8, "imports": 2}
+    concurrency_queue_timeout: float = 10.0  # Longest a request waits for a slot before getting a 503
+    concurrency_retry_after: int = 2  # Retry-After seconds sent with a 503
+    
+    # Rate limits (token buckets per route group, for each client IP and authenticated user)
+    rate_limit_backend: str = "memory"  # "memory" (per process), "sqlite" (shared by a host's workers), "redis" or "off"
+    rate_limits: Dict[str, str] = {"ai": "20/minute", "extract": "30/minute", "imports": "5/hour", "search": "120/minute"}  # count/period; groups left out are unlimited
+    rate_limit_max_keys: int = 100_000  # In-memory buckets kept before refilled ones are dropped
+    rate_limit_sqlite_path: str = "data/rate_limits.db"
+    rate_limit_redis_url: str = "redis://localhost:6379/0"
+    
+    # SQL statement budgets per request (@query_budget on endpoints)
+    query_budget_mode: str = "log"  # "off", "log", or "raise" to fail requests over budget (use in tests)
+    query_budget_default: int = 0  # Budget for endpoints without @query_budget; 0 leaves them unchecked
+    query_repeat_threshold: int = 5  # Runs of one statement in a request that are logged as a likely N+1; 0 disables
+    
+    # Home dashboard
+    review_interval_days: int = 3  # Correctly answered flashcards come due for review again after this long
+    dashboard_review_max_age: float = 300.0  # Seconds the cached due-review counts may lag the clock
+    
     # CORS settings
     allowed_origins: List[str] = ["*"]
     
     # Database settings
     database_url: str = "sqlite:///./data/levelup.db"
+    sqlite_wal: bool = True  # Write-ahead logging, so readers in other workers never block the writer
+    startup_warmup: bool = True  # Open pool connections and load the distractor and dedupe indexes at startup
+    warmup_connections: int = 4  # Pool connections opened by the warm-up
+    
+    # Background job settings
+    job_workers: int = 2  # Number of in-process worker threads
+    job_lease_seconds: int = 300  # How long a claimed job stays owned without a heartbeat
+    job_max_attempts: int = 3
+    job_retry_backoff: float = 5.0  # Seconds before retrying a failed job, doubled on each further attempt
+    job_retry_backoff_max: float = 300.0
+    job_poll_interval: float = 1.0  # Seconds an idle worker waits before polling again
+    
+    # Near-duplicate flashcard detection
+    dedupe_enabled: bool = True
+    dedupe_threshold: float = 0.8  # Estimated Jaccard similarity at which a card is a duplicate
+    dedupe_num_perm: int = 64  # MinHash permutations per signature
+    dedupe_bands: int = 16  # LSH bands; must divide dedupe_num_perm
+    
+    # LLM call settings
+    ai_max_concurrency: int = 4  # Concurrent LLM calls per process; 0 disables the limit
+    ai_max_retries: int = 2  # Retries for rate limits, timeouts and server errors
+    ai_retry_backoff: float = 0.5  # Seconds before the first retry, doubled for each further retry
+    llm_log_sample_rate: float = 0.1  # Fraction of successful calls written to data/llm_calls.jsonl
+    
+    # Compression for stored transcripts
+    text_compression: str = "zstd"  # "zstd" (falls back to zlib if zstandard is not installed), "zlib" or "none"
+    text_compression_level: int = 6
+    
+    # YouTube transcript ingest
+    transcript_fetcher: str = "youtube"  # "youtube", or "fixtures" to read data/transcript_fixtures
+    transcript_fixture_dir: str = "data/transcript_fixtures"
+    transcript_fixture_latency: float = 0.0  # Simulated per-video fetch delay for the fixture fetcher
+    youtube_extract_workers: int = 8  # Concurrent transcript fetches per extract request
+    youtube_extract_max_urls: int = 50
+    watch_history_batch_size: int = 500  # Cards inserted per transaction when importing watch history
+    
+    # On-disk cache of fetched transcripts
+    transcript_cache_enabled: bool = True
+    transcript_cache_dir: str = "data/transcript_cache"
+    transcript_cache_max_bytes: int = 256 * 1024 * 1024  # Compressed size cap; least recently used entries go first
+    transcript_cache_negative_ttl: int = 24 * 3600  # Seconds to remember that a video has no transcript
     
     # AI API Keys (optional) - matching environment variable names
     OPENAI_API_KEY: Optional[str] = None
+    OPENAI_BASE_URL: Optional[str] = None  # Point at benchmarks/openai_stub.py for local testing
     YOUTUBE_API_KEY: Optional[str] = None
     
     class Config:
@@ -1,12 +1,24 @@
 """Database configuration and SQLAlchemy setup"""
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import create_engine, event, inspect, text, MetaData
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
-from typing import Generator
+from typing import Generator, Set
+import logging
 import os
+import re
 
 from backend.app.core.config import settings
+from backend.app.core import table_versions  # noqa: F401 - registers the write listeners that bump table versions
+from backend.app.core.instrumentation import InstrumentedQueuePool, instrument_engine
+
+logger = logging.getLogger(__name__)
+
+# Alembic revision files, read to find the head revision without importing Alembic
+MIGRATION_VERSIONS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "migrations", "versions"
+)
+_REVISION_LINE = re.compile(r"^(down_)?revision\b[^=\n]*=(.*)$", re.MULTILINE)
 
 # Ensure data directory exists
 os.makedirs(settings.data_dir, exist_ok=True)
@@ -14,15 +26,33 @@ os.makedirs(settings.data_dir, exist_ok=True)
 # Create SQLite database URL
 SQLALCHEMY_DATABASE_URL = f"sqlite:///./{settings.data_dir}/levelup.db"
 
-# Create engine with SQLite-specific settings
+# Create engine with SQLite-specific settings. Each thread checks out its own
+# pooled connection so request handlers and background job workers never share
+# a transaction.
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    poolclass=StaticPool,
     connect_args={
         "check_same_thread": False,  # Allow SQLite to be used with FastAPI
+        "timeout": 30,  # Wait for concurrent writers instead of failing with "database is locked"
     },
     echo=settings.debug,  # Log SQL queries in debug mode
+    poolclass=InstrumentedQueuePool,  # QueuePool that times checkouts for /metrics
 )
+instrument_engine(engine)
+
+@event.listens_for(engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    if settings.sqlite_wal:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # Durable at each checkpoint rather than each commit; safe with WAL
+        cursor.close()
+
+# A worker forked from a process that already used the engine (gunicorn
+# --preload) must not share its SQLite handles: start the child with an
+# empty pool, leaving the parent's connections for the parent to close.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -53,10 +83,56 @@ def drop_tables():
     """Drop all database tables (for testing/reset)"""
     Base.metadata.drop_all(bind=engine)
 
+def migration_heads() -> Set[str]:
+    """
+    Head revisions of the Alembic migrations. Parsed from the revision files,
+    as importing Alembic takes longer than the create_all it would save.
+    """
+    revisions, parents = set(), set()
+    if not os.path.isdir(MIGRATION_VERSIONS_DIR):
+        return set()
+    for name in os.listdir(MIGRATION_VERSIONS_DIR):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(MIGRATION_VERSIONS_DIR, name), encoding="utf-8") as f:
+            for down, value in _REVISION_LINE.findall(f.read()):
+                (parents if down else revisions).update(re.findall(r"['\"](\w+)['\"]", value))
+    return revisions - parents
+
+def current_revisions(connection: Connection) -> Set[str]:
+    """Revisions recorded in the database's alembic_version table"""
+    if not inspect(connection).has_table("alembic_version"):
+        return set()
+    return {row[0] for row in connection.execute(text("SELECT version_num FROM alembic_version"))}
+
 # Database utilities
-def init_db():
-    """Initialize database with tables"""
-    create_tables()
+def init_db() -> bool:
+    """
+    Initialize database with tables, unless Alembic has it at the latest revision.
+
+    A new database is created from the models and stamped at head, so later
+    starts skip create_all and `alembic upgrade head` has nothing to redo.
+    Returns whether create_all ran.
+    """
+    heads = migration_heads()
+    with engine.begin() as connection:
+        current = current_revisions(connection)
+        if heads and current == heads:
+            return False
+
+        is_new = not inspect(connection).get_table_names()
+        from backend.app import models  # noqa: F401 - registers the tables with Base
+        Base.metadata.create_all(bind=connection)
+        if is_new and len(heads) == 1:
+            connection.execute(text(
+                "CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL, "
+                "CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+            ))
+            connection.execute(text("INSERT INTO alembic_version (version_num) VALUES (:head)"), {"head": heads.pop()})
+        elif heads:
+            logger.warning("Database schema is at %s, not the latest migration %s; created missing tables only. "
+                           "Run `alembic upgrade head`.", ", ".join(sorted(current)) or "no revision", ", ".join(sorted(heads)))
+    return True
 
 def reset_db():
     """Reset database (drop and recreate all tables)"""
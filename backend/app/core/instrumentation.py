@@ -0,0 +1,159 @@
+"""Request, connection pool and SQL statement instrumentation exported at /metrics"""
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core.concurrency import route_group
+from backend.app.core.metrics import BoundMetric, registry
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+request_latency = registry.histogram("http_request_duration_seconds", "Request latency by route template",
+                                     ("method", "route", "status"), buckets=LATENCY_BUCKETS)
+requests_in_flight = registry.gauge("http_requests_in_flight", "Requests being handled, by route group", ("group",))
+request_statements = registry.histogram("http_request_db_statements", "SQL statements executed per request",
+                                        ("route",), buckets=STATEMENT_BUCKETS)
+request_db_time = registry.histogram("http_request_db_seconds", "Time spent in SQL statements per request",
+                                     ("route",), buckets=LATENCY_BUCKETS)
+db_statements = registry.counter("db_statements_total", "SQL statements executed, inside requests or not")
+db_statement_time = registry.counter("db_statement_seconds_total", "Time spent executing SQL statements")
+pool_checkout_wait = registry.histogram("db_pool_checkout_wait_seconds", "Time to get a connection from the pool",
+                                        buckets=LATENCY_BUCKETS)
+pool_checked_out = registry.gauge("db_pool_checked_out", "Connections currently checked out of the pool")
+pool_size = registry.gauge("db_pool_size", "Configured pool size plus allowed overflow")
+
+class RequestStats:
+    """SQL work done on behalf of one request"""
+    __slots__ = ("statements", "db_seconds", "shapes")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.shapes: Optional[Dict[str, int]] = None  # Executions per statement text, when a budget check asks for it
+
+# Set by RequestMetricsMiddleware; sync endpoints see it too, as the threadpool copies the context
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Statement counters of the request being handled, or None outside a request"""
+    return _request_stats.get()
+
+def route_template(scope: Scope) -> str:
+    """
+    The matched route as a template (/api/v1/youtube/{card_id}), so label
+    values stay bounded whatever IDs clients request.
+    """
+    route = scope.get("route")
+    path = scope["path"]
+    if route is None:
+        root_path = scope.get("root_path")
+        return f"{root_path}/*" if root_path else "unmatched"
+
+    # Included routes may only know their own part of the path; the prefix
+    # is whatever precedes the part they matched
+    template = getattr(route, "path", path)
+    try:
+        matched = getattr(route, "path_format", template).format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    if matched and path.endswith(matched):
+        return path[:len(path) - len(matched)] + template
+    return template
+
+class RequestMetricsMiddleware:
+    """Record latency, in-flight requests and SQL work per route; costs a few microseconds per request"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Bound metrics per label combination; routes are templates, so these stay small
+        self._in_flight: Dict[str, BoundMetric] = {}
+        self._per_route: Dict[Tuple[str, str, int], Tuple[BoundMetric, BoundMetric, BoundMetric]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["method"], scope["path"]) or "other"
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = [500]
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        in_flight = self._in_flight.get(group)
+        if in_flight is None:
+            in_flight = self._in_flight[group] = requests_in_flight.labels(group=group)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            _request_stats.reset(token)
+            self._record(scope["method"], route_template(scope), status[0], elapsed, stats)
+
+    def _record(self, method: str, route: str, status: int, elapsed: float, stats: RequestStats) -> None:
+        key = (method, route, status)
+        bound = self._per_route.get(key)
+        if bound is None:
+            bound = self._per_route[key] = (
+                request_latency.labels(method=method, route=route, status=status),
+                request_statements.labels(route=route),
+                request_db_time.labels(route=route),
+            )
+        latency, statements, db_time = bound
+        latency.observe(elapsed)
+        statements.observe(stats.statements)
+        if stats.statements:
+            db_time.observe(stats.db_seconds)
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe(time.perf_counter() - started)
+
+def instrument_engine(engine: Engine) -> None:
+    """Count statements and their time, globally and for the current request, and track pool usage"""
+    if isinstance(engine.pool, QueuePool):
+        pool_size.set(engine.pool.size() + max(engine.pool._max_overflow, 0))
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        db_statements.inc()
+        db_statement_time.inc(elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+            if stats.shapes is not None:
+                # Parameters are bound separately, so the SQL text is the statement's shape
+                stats.shapes[statement] = stats.shapes.get(statement, 0) + 1
+
+    @event.listens_for(engine.pool, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_checked_out.inc()
+
+    @event.listens_for(engine.pool, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        pool_checked_out.dec()
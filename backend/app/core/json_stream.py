@@ -0,0 +1,84 @@
+"""Incremental JSON parsing for streamed or very large JSON documents"""
+import json
+import re
+from typing import Any, List, Optional
+
+# Characters that can change the parser state; everything else is skipped in bulk
+_SPECIAL_CHARS = re.compile(r'[{}\[\]"\\]')
+
+class JSONArrayItemParser:
+    """
+    Extract objects that are elements of a JSON array from text fed in chunks.
+
+    Every ``{...}`` whose parent container is an array is decoded and returned
+    as soon as its closing brace arrives, so ``{"flashcards": [{...}, {...}]}``
+    yields each flashcard and a top-level ``[{...}, ...]`` yields each item.
+    Only the object currently being read is buffered, so memory use does not
+    grow with the size of the document. Text outside JSON (such as Markdown
+    code fences around a model response) is ignored.
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._capture_depth: Optional[int] = None
+        self._parts: List[str] = []
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk of text and return the objects completed by it"""
+        items: List[Any] = []
+        capture_start = 0 if self._capture_depth is not None else None
+        skip_until = 0
+
+        if self._escape and chunk:
+            # The previous chunk ended with a backslash inside a string
+            self._escape = False
+            skip_until = 1
+
+        for match in _SPECIAL_CHARS.finditer(chunk):
+            position = match.start()
+            if position < skip_until:
+                continue
+            char = match.group()
+
+            if self._in_string:
+                if char == "\\":
+                    if position + 1 < len(chunk):
+                        skip_until = position + 2
+                    else:
+                        self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._capture_depth is None and self._stack and self._stack[-1] == "[":
+                    self._capture_depth = len(self._stack)
+                    capture_start = position
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._capture_depth == len(self._stack):
+                    self._parts.append(chunk[capture_start:position + 1])
+                    item = self._decode()
+                    if item is not None:
+                        items.append(item)
+                    capture_start = None
+
+        if self._capture_depth is not None and capture_start is not None:
+            self._parts.append(chunk[capture_start:])
+
+        return items
+
+    def _decode(self) -> Any:
+        text = "".join(self._parts)
+        self._parts = []
+        self._capture_depth = None
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
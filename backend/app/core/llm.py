@@ -0,0 +1,205 @@
+"""Instrumented wrapper around LLM chat completion calls"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_LABELS = ("call_site", "prompt_version", "model")
+_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+
+llm_requests = registry.counter("llm_requests_total", "LLM calls by outcome", _LABELS + ("outcome",))
+llm_retries = registry.counter("llm_retries_total", "LLM call attempts that were retried", _LABELS + ("error",))
+llm_tokens = registry.counter("llm_tokens_total", "Tokens reported by the LLM API", _LABELS + ("kind",))
+llm_finish_reasons = registry.counter("llm_finish_reasons_total", "Completions by finish reason", _LABELS + ("finish_reason",))
+llm_queue_wait = registry.histogram("llm_queue_wait_seconds", "Time spent waiting for an LLM concurrency slot", _LABELS)
+llm_time_to_first_token = registry.histogram("llm_time_to_first_token_seconds", "Time from request to first streamed token",
+                                             _LABELS, buckets=_LATENCY_BUCKETS)
+llm_latency = registry.histogram("llm_latency_seconds", "Total LLM call latency, including retries", _LABELS,
+                                 buckets=_LATENCY_BUCKETS)
+llm_in_flight = registry.gauge("llm_in_flight", "LLM calls currently holding a concurrency slot", ("call_site",))
+
+def retryable_errors() -> Tuple[type, ...]:
+    """Errors worth another attempt; anything else (bad request, auth) fails immediately"""
+    # Imported here: the SDK takes longer to import than the rest of the app, and
+    # whoever built the client has already paid for it
+    import openai
+    return (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+_slots = threading.BoundedSemaphore(settings.ai_max_concurrency) if settings.ai_max_concurrency > 0 else None
+_log_lock = threading.Lock()
+
+class _CallRecord:
+    """Timing and usage collected for one call"""
+
+    def __init__(self, call_site: str, prompt_version: str, model: str, streaming: bool):
+        self.labels = {"call_site": call_site, "prompt_version": prompt_version, "model": model}
+        self.streaming = streaming
+        self.started = time.perf_counter()
+        self.queue_wait = 0.0
+        self.time_to_first_token: Optional[float] = None
+        self.attempts = 0
+        self.retries = 0
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.finish_reason: Optional[str] = None
+        self.error: Optional[str] = None
+
+    def usage(self, usage: Any) -> None:
+        if usage is not None:
+            self.prompt_tokens = getattr(usage, "prompt_tokens", None)
+            self.completion_tokens = getattr(usage, "completion_tokens", None)
+
+class InstrumentedLLM:
+    """
+    Chat completion client that records metrics for every call.
+
+    Each call waits for a process-wide concurrency slot (ai_max_concurrency),
+    retries transient API errors with exponential backoff, and records queue
+    wait, time to first token, total latency, token usage, retries and finish
+    reason labelled by call site and prompt version. A sample of calls, and
+    every failed call, is appended to a JSON lines log for offline analysis.
+    """
+
+    def __init__(self, client: Any, log_path: Optional[str] = None):
+        self.client = client
+        self.log_path = log_path or os.path.join(settings.data_dir, "llm_calls.jsonl")
+
+    def create(self, call_site: str, prompt_version: str, **request) -> Any:
+        """Non-streaming chat completion"""
+        record = _CallRecord(call_site, prompt_version, request.get("model", ""), streaming=False)
+        self._acquire(record)
+        try:
+            response = self._with_retries(record, request)
+            record.usage(getattr(response, "usage", None))
+            if response.choices:
+                record.finish_reason = response.choices[0].finish_reason
+            return response
+        except Exception as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            self._release(record)
+            self._finish(record, "error" if record.error else "success")
+
+    def stream(self, call_site: str, prompt_version: str, **request) -> Iterator[Any]:
+        """
+        Streaming chat completion, yielding chunks as they arrive.
+
+        Only opening the stream is retried; once chunks have been yielded an
+        error is raised to the caller. Closing the iterator early is recorded
+        as a cancelled call.
+        """
+        request = dict(request, stream=True)
+        request.setdefault("stream_options", {"include_usage": True})
+        record = _CallRecord(call_site, prompt_version, request.get("model", ""), streaming=True)
+        outcome = "cancelled"
+        self._acquire(record)
+        stream = None
+        try:
+            stream = self._with_retries(record, request)
+            for chunk in stream:
+                record.usage(getattr(chunk, "usage", None))
+                if chunk.choices:
+                    choice = chunk.choices[0]
+                    if record.time_to_first_token is None and choice.delta and choice.delta.content:
+                        record.time_to_first_token = time.perf_counter() - record.started
+                    if choice.finish_reason:
+                        record.finish_reason = choice.finish_reason
+                yield chunk
+            outcome = "success"
+        except Exception as e:
+            record.error = type(e).__name__
+            outcome = "error"
+            raise
+        finally:
+            if stream is not None:
+                stream.close()
+            self._release(record)
+            self._finish(record, outcome)
+
+    def _with_retries(self, record: _CallRecord, request: Dict[str, Any]) -> Any:
+        while True:
+            record.attempts += 1
+            try:
+                return self.client.chat.completions.create(**request)
+            except retryable_errors() as e:
+                if record.retries >= settings.ai_max_retries:
+                    raise
+                record.retries += 1
+                llm_retries.inc(error=type(e).__name__, **record.labels)
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = settings.ai_retry_backoff * (2 ** (record.retries - 1)) * random.uniform(1.0, 1.5)
+                logger.warning("LLM call %s failed with %s, retrying in %.2fs",
+                               record.labels["call_site"], type(e).__name__, delay)
+                time.sleep(delay)
+
+    def _acquire(self, record: _CallRecord) -> None:
+        if _slots is not None:
+            _slots.acquire()
+        record.queue_wait = time.perf_counter() - record.started
+        llm_in_flight.inc(call_site=record.labels["call_site"])
+
+    def _release(self, record: _CallRecord) -> None:
+        llm_in_flight.dec(call_site=record.labels["call_site"])
+        if _slots is not None:
+            _slots.release()
+
+    def _finish(self, record: _CallRecord, outcome: str) -> None:
+        latency = time.perf_counter() - record.started
+        labels = record.labels
+        llm_requests.inc(outcome=outcome, **labels)
+        llm_queue_wait.observe(record.queue_wait, **labels)
+        llm_latency.observe(latency, **labels)
+        if record.time_to_first_token is not None:
+            llm_time_to_first_token.observe(record.time_to_first_token, **labels)
+        if record.prompt_tokens is not None:
+            llm_tokens.inc(record.prompt_tokens, kind="prompt", **labels)
+        if record.completion_tokens is not None:
+            llm_tokens.inc(record.completion_tokens, kind="completion", **labels)
+        if record.finish_reason:
+            llm_finish_reasons.inc(finish_reason=record.finish_reason, **labels)
+
+        if outcome == "error" or random.random() < settings.llm_log_sample_rate:
+            self._log({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                **labels,
+                "outcome": outcome,
+                "streaming": record.streaming,
+                "queue_wait": round(record.queue_wait, 4),
+                "time_to_first_token": round(record.time_to_first_token, 4) if record.time_to_first_token is not None else None,
+                "latency": round(latency, 4),
+                "attempts": record.attempts,
+                "retries": record.retries,
+                "prompt_tokens": record.prompt_tokens,
+                "completion_tokens": record.completion_tokens,
+                "finish_reason": record.finish_reason,
+                "error": record.error
+            })
+
+    def _log(self, entry: Dict[str, Any]) -> None:
+        try:
+            with _log_lock:
+                os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+                with open(self.log_path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+        except OSError:
+            logger.exception("Could not write LLM call log %s", self.log_path)
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Delay requested by the API in a Retry-After header, capped at a minute"""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(value), 60.0) if value is not None else None
+    except ValueError:
+        return None
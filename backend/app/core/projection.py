@@ -0,0 +1,28 @@
+"""Column projection for list endpoints (the fields= query parameter)"""
+from typing import Any, Dict, Iterable, List, Optional
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Split a comma-separated fields parameter into column names.
+
+    Returns None when no projection was requested. The id is always
+    included so clients can fetch the full record later. Raises ValueError
+    for unknown names.
+    """
+    if not fields:
+        return None
+
+    allowed = list(allowed)
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}")
+
+    if "id" in allowed and "id" not in names:
+        names.insert(0, "id")
+    return names
+
+def project_rows(query: Any, columns: Dict[str, Any], names: List[str]) -> List[Dict[str, Any]]:
+    """Run the query selecting only the named columns and return plain dicts"""
+    rows = query.with_entities(*[columns[name].label(name) for name in names]).all()
+    return [dict(row._mapping) for row in rows]
@@ -0,0 +1,93 @@
+"""Per-request SQL statement budgets and N+1 detection"""
+import logging
+from typing import Callable, Optional, TypeVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.app.core.config import settings
+from backend.app.core.instrumentation import RequestStats, current_request_stats, route_template
+from backend.app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+budget_violations = registry.counter("http_query_budget_violations_total",
+                                     "Requests over their statement budget (over_budget) or repeating "
+                                     "one statement shape (repeated_statement)", ("route", "kind"))
+
+F = TypeVar("F", bound=Callable)
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in raise mode when a request ran more SQL statements than its route allows"""
+
+    def __init__(self, route: str, statements: int, budget: int):
+        super().__init__(f"{route} ran {statements} SQL statements, over its budget of {budget}")
+        self.route = route
+        self.statements = statements
+        self.budget = budget
+
+def query_budget(statements: int) -> Callable[[F], F]:
+    """
+    Declare the most SQL statements one request to an endpoint may run.
+
+    Place it under the route decorator; the count includes the user and
+    ETag lookups made by dependencies.
+    """
+    def decorator(endpoint: F) -> F:
+        endpoint.__query_budget__ = statements
+        return endpoint
+    return decorator
+
+def _shape(statement: str, width: int = 160) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= width else statement[:width] + "..."
+
+class QueryBudgetMiddleware:
+    """
+    Check each request's SQL statements against its route's budget.
+
+    Runs inside RequestMetricsMiddleware, which counts the statements.
+    Statement shapes repeated repeat_threshold times or more (the usual
+    sign of a lazy relationship loaded in a loop) are logged with the
+    route. Requests over budget are logged, or raise QueryBudgetExceeded
+    in "raise" mode so tests fail; the response has already been sent.
+    """
+
+    def __init__(self, app: ASGIApp, mode: Optional[str] = None, default_budget: Optional[int] = None,
+                 repeat_threshold: Optional[int] = None):
+        self.app = app
+        self.mode = settings.query_budget_mode if mode is None else mode
+        self.default_budget = settings.query_budget_default if default_budget is None else default_budget
+        self.repeat_threshold = settings.query_repeat_threshold if repeat_threshold is None else repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stats = current_request_stats() if scope["type"] == "http" and self.mode != "off" else None
+        if stats is None:
+            await self.app(scope, receive, send)
+            return
+
+        stats.shapes = {}
+        await self.app(scope, receive, send)
+        self.check(scope, stats)
+
+    def check(self, scope: Scope, stats: RequestStats) -> None:
+        if not stats.statements:
+            return
+        endpoint = getattr(scope.get("route"), "endpoint", None)
+        budget = getattr(endpoint, "__query_budget__", None) or self.default_budget
+
+        route = None
+        if self.repeat_threshold > 0:
+            for statement, count in stats.shapes.items():
+                if count >= self.repeat_threshold:
+                    route = route or route_template(scope)
+                    budget_violations.inc(route=route, kind="repeated_statement")
+                    logger.warning("Possible N+1 in %s %s: statement ran %d times: %s",
+                                   scope["method"], route, count, _shape(statement))
+
+        if budget and stats.statements > budget:
+            route = route or route_template(scope)
+            budget_violations.inc(route=route, kind="over_budget")
+            if self.mode == "raise":
+                raise QueryBudgetExceeded(f"{scope['method']} {route}", stats.statements, budget)
+            logger.warning("%s %s ran %d SQL statements, over its budget of %d",
+                           scope["method"], route, stats.statements, budget)
@@ -0,0 +1,249 @@
+"""Token-bucket rate limits per route group and client, as ASGI middleware"""
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import anyio.to_thread
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.app.core.concurrency import route_group
+from backend.app.core.config import settings
+from backend.app.core.metrics import registry
+
+try:
+    import redis
+except ImportError:  # Optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+rate_limited = registry.counter("http_rate_limited_total", "Requests refused with 429 by a rate limit", ("group", "key"))
+rate_limit_errors = registry.counter("http_rate_limit_backend_errors_total",
+                                     "Rate limit checks that failed and let the request through", ("backend",))
+
+# Checked before the concurrency groups: requests that spend AI quota, call YouTube, or search
+RATE_GROUPS = [
+    ("ai", {"POST"}, re.compile(r"^/api/v1/(flashcards/generate(/stream)?|youtube/\d+/generate-flashcards)$")),
+    ("extract", {"POST"}, re.compile(r"^/api/v1/youtube/(extract|\d+/extract-transcript)$")),
+    ("search", {"GET"}, re.compile(r"^/api/v1/youtube/search/?$")),
+]
+SEARCH_PARAM = re.compile(rb"(?:^|&)search=[^&]")
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+def rate_group(method: str, path: str, query_string: bytes = b"") -> Optional[str]:
+    """The rate limit group for a request: a RATE_GROUPS match, a filtered search, or its concurrency group"""
+    for group, methods, pattern in RATE_GROUPS:
+        if method in methods and pattern.match(path):
+            return group
+    group = route_group(method, path)
+    if group == "reads" and query_string and SEARCH_PARAM.search(query_string):
+        return "search"
+    return group
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """'20/minute' -> (bucket capacity 20, refill of 20/60 tokens per second)"""
+    count, _, period = rate.partition("/")
+    try:
+        capacity = int(count)
+    except ValueError:
+        capacity = 0
+    if capacity < 1 or period.strip() not in PERIODS:
+        raise ValueError(f"Invalid rate {rate!r}; expected count/period with period one of {', '.join(PERIODS)}")
+    return capacity, capacity / PERIODS[period.strip()]
+
+class MemoryBuckets:
+    """
+    Buckets in a dict owned by this process. Only the event loop touches
+    it, so updates need no lock. Buckets that have refilled are dropped
+    once there are more than max_keys.
+    """
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.buckets: Dict[str, List[float]] = {}  # key -> [tokens, updated, full_at]
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        """Take a token; returns 0 if one was available, else seconds until there is one"""
+        now = time.monotonic()
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self._evict(now)
+            self.buckets[key] = [capacity - 1.0, now, now + 1.0 / rate]
+            return 0.0
+
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+        if not wait:
+            tokens -= 1
+        bucket[0], bucket[1], bucket[2] = tokens, now, now + (capacity - tokens) / rate
+        return wait
+
+    def _evict(self, now: float) -> None:
+        # A full bucket behaves exactly like a missing one
+        full = [key for key, bucket in self.buckets.items() if bucket[2] <= now]
+        if len(full) < self.max_keys // 10:
+            # Mostly active clients: drop the oldest keys as well
+            full.extend(list(self.buckets)[:self.max_keys // 10])
+        for key in full:
+            self.buckets.pop(key, None)
+
+class SQLiteBuckets:
+    """Buckets in a SQLite file, shared by every worker process on the host"""
+    name = "sqlite"
+    blocking = True
+    PRUNE_EVERY = 1000  # Takes between deletions of refilled buckets
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._takes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        connection = sqlite3.connect(path, timeout=5.0)
+        with connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+        connection.close()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; threads started after a fork open their own
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        now = time.time()  # Wall clock, so every process agrees
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT tokens, updated FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            if not wait:
+                tokens -= 1
+            connection.execute(
+                "INSERT INTO rate_buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated, "
+                "full_at = excluded.full_at",
+                (key, tokens, now, now + (capacity - tokens) / rate)
+            )
+            self._takes += 1
+            if self._takes % self.PRUNE_EVERY == 0:
+                connection.execute("DELETE FROM rate_buckets WHERE full_at <= ?", (now,))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return wait
+
+class RedisBuckets:
+    """Buckets in redis, updated atomically by a Lua script; each key expires once its bucket is full"""
+    name = "redis"
+    blocking = True
+    SCRIPT = """
+local capacity, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1)
+return tostring(wait)
+"""
+
+    def __init__(self, url: str):
+        self.client = redis.Redis.from_url(url, socket_timeout=0.1, socket_connect_timeout=0.1)
+        self._take = self.client.register_script(self.SCRIPT)
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        return float(self._take(keys=[f"levelup:rate:{key}"], args=[capacity, rate, time.time()]))
+
+def create_buckets(backend: str):
+    """Bucket store for rate_limit_backend; redis falls back to memory when the package is missing"""
+    if backend == "redis":
+        if redis is not None:
+            return RedisBuckets(settings.rate_limit_redis_url)
+        logger.warning("rate_limit_backend=redis needs the redis package (pip install redis); "
+                       "using per-process memory buckets")
+    elif backend == "sqlite":
+        return SQLiteBuckets(settings.rate_limit_sqlite_path)
+    return MemoryBuckets(settings.rate_limit_max_keys)
+
+class RateLimitMiddleware:
+    """
+    Token-bucket limits per route group (ai, extract, imports, search...).
+
+    Each client IP has its own bucket per group, and so does each user once
+    authentication middleware has set an authenticated scope["user"]. Groups
+    without a configured rate are not checked. A request finding an empty
+    bucket gets 429 with Retry-After. If the bucket store fails, the request
+    is let through.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Optional[Dict[str, str]] = None, backend: Optional[str] = None):
+        self.app = app
+        limits = settings.rate_limits if limits is None else limits
+        self.limits = {group: parse_rate(rate) for group, rate in limits.items() if rate}
+        self.buckets = create_buckets(settings.rate_limit_backend if backend is None else backend)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = group = None
+        if scope["type"] == "http" and self.limits:
+            group = rate_group(scope["method"], scope["path"], scope["query_string"])
+            limit = self.limits.get(group)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        wait, key_type = await self.check(scope, group, limit)
+        if wait:
+            rate_limited.inc(group=group, key=key_type)
+            retry_after = max(1, math.ceil(wait))
+            response = JSONResponse(
+                {"detail": f"Too many {group} requests; retry in {retry_after} s"},
+                status_code=429,
+                headers={"Retry-After": str(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def check(self, scope: Scope, group: str, limit: Tuple[int, float]) -> Tuple[float, str]:
+        """Take a token from each of the request's buckets; returns the wait and key type of the first empty one"""
+        client = scope.get("client")
+        keys = [("ip", f"{group}:ip:{client[0] if client else 'unknown'}")]
+        user = scope.get("user")
+        if getattr(user, "is_authenticated", False):
+            keys.append(("user", f"{group}:user:{user.identity}"))
+
+        for key_type, key in keys:
+            try:
+                if self.buckets.blocking:
+                    wait = await anyio.to_thread.run_sync(self.buckets.take, key, *limit)
+                else:
+                    wait = self.buckets.take(key, *limit)
+            except Exception as e:
+                rate_limit_errors.inc(backend=self.buckets.name)
+                logger.warning("Rate limit check for %s failed, allowing the request: %s", key, e)
+                continue
+            if wait:
+                return wait, key_type
+        return 0.0, ""
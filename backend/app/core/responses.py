@@ -0,0 +1,34 @@
+"""JSON response class that renders with orjson when it is installed"""
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+def _encode_default(value: Any) -> Any:
+    # Types orjson does not know (Decimal, sets, Pydantic models) go through FastAPI's encoder
+    return jsonable_encoder(value)
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered by orjson, falling back to the standard library.
+
+    Content may hold datetimes and other values jsonable_encoder accepts,
+    so handlers can pass raw query rows without pre-encoding them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
@@ -0,0 +1,152 @@
+"""Fingerprinted static assets: manifest lookup for templates and a precompression-aware static handler"""
+import json
+import mimetypes
+import os
+from typing import Dict, List, Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from backend.app.core.config import settings
+from backend.app.core.http_compression import accepted_encodings
+
+MANIFEST_NAME = "manifest.json"
+# Hashed names from earlier builds, still served until their grace period ends: {name: retired_at}
+RETIRED_NAME = "retired.json"
+
+# Variants written by the asset build, in order of preference
+PRECOMPRESSED: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+PRECOMPRESSED_SUFFIXES = tuple(suffix for _, suffix in PRECOMPRESSED)
+
+class AssetManifest:
+    """
+    Maps source asset names (js/app.js) to their content-hashed build names.
+
+    Re-read whenever the manifest file changes, so a rebuild is picked up
+    without a restart. Without a build every name maps to itself. Names
+    retired by recent builds still count as fingerprinted, so pages loaded
+    before a deploy keep getting their assets as immutable.
+    """
+
+    def __init__(self, build_dir: str, url_prefix: str = "/static"):
+        self.path = os.path.join(build_dir, MANIFEST_NAME)
+        self.retired_path = os.path.join(build_dir, RETIRED_NAME)
+        self.url_prefix = url_prefix
+        self._mtime: Optional[float] = None
+        self._names: Dict[str, str] = {}
+        self._hashed: frozenset = frozenset()
+
+    def _refresh(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        names, retired = {}, {}
+        if mtime is not None:
+            with open(self.path, encoding="utf-8") as f:
+                names = json.load(f)
+            # Written before the manifest by the same build
+            try:
+                with open(self.retired_path, encoding="utf-8") as f:
+                    retired = json.load(f)
+            except FileNotFoundError:
+                pass
+        self._names, self._hashed, self._mtime = names, frozenset(names.values()) | frozenset(retired), mtime
+
+    def resolve(self, name: str) -> str:
+        self._refresh()
+        return self._names.get(name.lstrip("/"), name.lstrip("/"))
+
+    def is_fingerprinted(self, path: str) -> bool:
+        self._refresh()
+        return path in self._hashed
+
+    def url(self, name: str) -> str:
+        """URL of an asset, fingerprinted when the build has it"""
+        return f"{self.url_prefix}/{self.resolve(name)}"
+
+asset_manifest = AssetManifest(settings.asset_build_dir)
+
+def asset_url(name: str) -> str:
+    """Jinja global: {{ asset_url('js/app.js') }}"""
+    return asset_manifest.url(name)
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that serves the asset build ahead of the source directory.
+
+    Fingerprinted files never change, so they are cached as immutable and
+    sent as their .br or .gz variant when the client accepts it. Anything
+    else (source files, builds not run yet) must be revalidated. The build's
+    own bookkeeping files and compressed variants are never served directly.
+    """
+
+    def __init__(self, *, directory: str, build_directory: Optional[str] = None,
+                 manifest: AssetManifest = asset_manifest, max_age: Optional[int] = None, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.build_directory = build_directory
+        if build_directory:
+            # Looked up first; a missing build directory is simply skipped
+            self.all_directories.insert(0, build_directory)
+        self.manifest = manifest
+        self.max_age = settings.asset_max_age if max_age is None else max_age
+
+    def lookup_path(self, path: str) -> Tuple[str, Optional[os.stat_result]]:
+        if self.build_directory and (path in (MANIFEST_NAME, RETIRED_NAME) or path.endswith(PRECOMPRESSED_SUFFIXES)):
+            # Only the source directories can answer these names
+            return self._lookup(path, [directory for directory in self.all_directories
+                                       if directory != self.build_directory])
+        return super().lookup_path(path)
+
+    @staticmethod
+    def _lookup(path: str, directories: List[str]) -> Tuple[str, Optional[os.stat_result]]:
+        """StaticFiles.lookup_path over the given directories"""
+        if path.startswith(("/", "\\")):
+            return "", None
+        for directory in directories:
+            directory = os.path.realpath(directory)
+            full_path = os.path.realpath(os.path.join(directory, path))
+            if os.path.commonpath([full_path, directory]) != directory:
+                continue
+            try:
+                return full_path, os.stat(full_path)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+        return "", None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD") or not self.manifest.is_fingerprinted(path):
+            response = await super().get_response(path, scope)
+            response.headers.setdefault("Cache-Control", "no-cache")
+            return response
+
+        response = await self._precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        response.headers["Cache-Control"] = f"public, max-age={self.max_age}, immutable"
+        response.headers.add_vary_header("Accept-Encoding")
+        return response
+
+    async def _precompressed_response(self, path: str, scope: Scope) -> Optional[Response]:
+        if not self.build_directory:
+            return None
+        request_headers = Headers(scope=scope)
+        encodings = accepted_encodings(request_headers.get("Accept-Encoding", ""))
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in encodings:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self._lookup, path + suffix, [self.build_directory])
+            if stat_result is None:
+                continue
+            media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            response = FileResponse(full_path, stat_result=stat_result, media_type=media_type,
+                                    headers={"Content-Encoding": encoding})
+            if self.is_not_modified(response.headers, request_headers):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
@@ -0,0 +1,56 @@
+"""Per-table version counters, bumped by session events on every ORM write"""
+from itertools import chain
+from typing import Dict, Iterable, Set
+
+import sqlalchemy as sa
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+# Written constantly by the job workers and never served with an ETag
+UNVERSIONED_TABLES = {"jobs", "table_versions"}
+
+table_versions = sa.table(
+    "table_versions",
+    sa.column("table_name", sa.String),
+    sa.column("version", sa.Integer),
+)
+
+def bump_versions(session: Session, tables: Iterable[str]) -> None:
+    """Increment the version of each table in the session's current transaction"""
+    names = sorted(set(tables) - UNVERSIONED_TABLES)
+    if not names:
+        return
+    statement = insert(table_versions).values([{"table_name": name, "version": 1} for name in names])
+    statement = statement.on_conflict_do_update(
+        index_elements=["table_name"],
+        set_={"version": table_versions.c.version + 1}
+    )
+    session.connection().execute(statement)
+
+def get_versions(session: Session, tables: Iterable[str]) -> Dict[str, int]:
+    """Current version of each table; tables never written are at version 0"""
+    names = list(tables)
+    versions = dict.fromkeys(names, 0)
+    versions.update(session.execute(
+        sa.select(table_versions.c.table_name, table_versions.c.version)
+        .where(table_versions.c.table_name.in_(names))
+    ).all())
+    return versions
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session: Session, flush_context) -> None:
+    # new/dirty/deleted still describe the flush that just ran
+    tables: Set[str] = set()
+    for instance in chain(session.new, session.dirty, session.deleted):
+        tables.update(table.name for table in inspect(instance).mapper.tables)
+    bump_versions(session, tables)
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_bulk_statement_tables(orm_execute_state) -> None:
+    # Bulk insert/update/delete statements bypass the flush
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    result = orm_execute_state.invoke_statement()
+    bump_versions(orm_execute_state.session, [orm_execute_state.statement.table.name])
+    return result
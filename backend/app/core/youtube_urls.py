@@ -0,0 +1,39 @@
+"""YouTube URL parsing and canonicalization"""
+import re
+from typing import Optional
+from urllib.parse import urlparse, parse_qs
+
+_VIDEO_ID = re.compile(r"[A-Za-z0-9_-]{11}")
+_PATH_ID = re.compile(r"^/(?:embed|shorts|live|v|e)/([^/?#]+)")
+
+def extract_video_id(url: str) -> Optional[str]:
+    """
+    Video ID from a watch, youtu.be, embed, shorts or live URL.
+
+    Timestamps, playlist and tracking parameters are ignored, so every
+    link to the same video yields the same ID. A bare 11-character ID is
+    accepted as well.
+    """
+    url = url.strip()
+    if _VIDEO_ID.fullmatch(url):
+        return url
+    if "://" not in url:
+        url = f"https://{url}"
+
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host.endswith("youtu.be"):
+        candidate = parsed.path.lstrip("/").split("/")[0]
+    elif "youtube" not in host:
+        return None
+    elif parsed.path.rstrip("/") == "/watch":
+        candidate = parse_qs(parsed.query).get("v", [""])[0]
+    else:
+        match = _PATH_ID.match(parsed.path)
+        candidate = match.group(1) if match else ""
+
+    return candidate if _VIDEO_ID.fullmatch(candidate) else None
+
+def canonical_url(video_id: str) -> str:
+    """Standard watch URL for a video ID"""
+    return f"https://www.youtube.com/watch?v={video_id}"
@@ -1,17 +1,56 @@
 """Main FastAPI application with SQLAlchemy database support"""
+from contextlib import asynccontextmanager
+import anyio.to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi import Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse
 
+from backend.app.api.etag import ETagMiddleware, NotModified, not_modified_handler
+from backend.app.core.concurrency import ConcurrencyLimitMiddleware
 from backend.app.core.config import settings
-from backend.app.core.database import init_db
-from backend.app.api.v1 import flashcards, quiz, youtube
+from backend.app.core.http_compression import CompressionMiddleware
+from backend.app.core.instrumentation import RequestMetricsMiddleware
+from backend.app.core.query_budget import QueryBudgetMiddleware
+from backend.app.core.rate_limit import RateLimitMiddleware
+from backend.app.core.static_assets import PrecompressedStaticFiles, asset_url
+from backend.app.core.database import SessionLocal, engine, init_db
+from backend.app.core.metrics import render_prometheus
+from backend.app.api.v1 import dashboard, flashcards, quiz, youtube, jobs
 
-# Initialize database tables
-init_db()
+def warm_up():
+    """Open pooled connections and load the in-memory indexes before the first request needs them"""
+    from backend.app.services.dedupe_service import DedupeService  # Deferred with the warm-up that needs them
+    from backend.app.services.distractor_service import DistractorService
+    
+    connections = [engine.connect() for _ in range(max(settings.warmup_connections, 1))]
+    for connection in connections:
+        connection.close()
+    
+    db = SessionLocal()
+    try:
+        DistractorService(db).ensure_loaded()
+        if settings.dedupe_enabled:
+            DedupeService(db).ensure_loaded()
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create or check the database, warm up, size the endpoint threadpool and
+    run the background job workers for the lifetime of the application.
+    """
+    from backend.app.services.job_service import job_pool  # Deferred until the app starts
+    
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    await anyio.to_thread.run_sync(init_db)
+    if settings.startup_warmup:
+        await anyio.to_thread.run_sync(warm_up)
+    job_pool.start()
+    yield
+    job_pool.stop()
 
 # Create FastAPI app
 app = FastAPI(
@@ -20,10 +59,38 @@ app = FastAPI(
     description="LevelUp AI - Smart Learning Platform with SQLAlchemy",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    lifespan=lifespan
 )
 
-# Add CORS middleware
+# Conditional GETs: table_etag dependencies answer 304 or leave an ETag for this middleware to add
+app.add_middleware(ETagMiddleware)
+app.add_exception_handler(NotModified, not_modified_handler)
+
+# Bounded concurrency per route group, so slow AI calls and imports cannot take every worker thread
+app.add_middleware(ConcurrencyLimitMiddleware)
+
+# Token buckets per client for AI, extraction, import and search requests; refused requests never queue for a slot
+if settings.rate_limit_backend != "off":
+    app.add_middleware(RateLimitMiddleware)
+
+# Compresses every response body once on the way out
+if settings.response_compression != "none":
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.gzip_level,
+        brotli_quality=settings.brotli_quality,
+        use_brotli=settings.response_compression == "auto"
+    )
+
+# Statement budgets and N+1 warnings, from the counts RequestMetricsMiddleware collects around it
+app.add_middleware(QueryBudgetMiddleware)
+
+# Wraps everything else, so latency covers limiter queueing and compression too
+app.add_middleware(RequestMetricsMiddleware)
+
+# Added last so it wraps everything, including the limiters: browsers can read their 429s and 503s
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify actual origins
@@ -32,21 +99,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="frontend/static"), name="static")
+# Mount static files: fingerprinted build output first (immutable, precompressed), then the sources
+app.mount("/static", PrecompressedStaticFiles(directory="frontend/static", build_directory=settings.asset_build_dir),
+          name="static")
 
 # Jinja2 templates
 templates = Jinja2Templates(directory="frontend/templates")
+templates.env.globals["asset_url"] = asset_url
 
 # Include API routers
 app.include_router(flashcards.router, prefix="/api/v1/flashcards", tags=["flashcards"])
 app.include_router(quiz.router, prefix="/api/v1/quiz", tags=["quiz"])
 app.include_router(youtube.router, prefix="/api/v1/youtube", tags=["youtube"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["jobs"])
+app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["dashboard"])
 
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
     """Home page"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    # Revalidated on every load, so a new build's asset names are picked up at once
+    return templates.TemplateResponse(request, "index.html", headers={"Cache-Control": "no-cache"})
 
 @app.get("/health")
 async def health_check():
@@ -57,6 +129,11 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/v1/health")
 async def api_health():
     """API health check"""
@@ -81,11 +158,9 @@ async def api_info():
         "endpoints": {
             "flashcards": "/api/v1/flashcards",
             "quiz": "/api/v1/quiz",
-            "youtube": "/api/v1/youtube"
+            "youtube": "/api/v1/youtube",
+            "jobs": "/api/v1/jobs",
+            "dashboard": "/api/v1/dashboard"
         },
         "docs": "/api/docs"
-    }
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    } 
@@ -1,8 +1,10 @@
 """Models package - imports all models for easy access"""
 from .user import User
-from .flashcard import Category, Flashcard
+from .flashcard import Category, Flashcard, FlashcardSignature
 from .quiz import Quiz, QuizQuestion, QuizAttempt, QuizAnswer
-from .youtube import YouTubeCard
+from .youtube import YouTubeCard, TranscriptSegment
+from .job import Job
+from .table_version import TableVersion
 from .base import Base
 
 __all__ = [
@@ -10,9 +12,13 @@ __all__ = [
     "User",
     "Category", 
     "Flashcard",
+    "FlashcardSignature",
     "Quiz",
     "QuizQuestion", 
     "QuizAttempt",
     "QuizAnswer",
-    "YouTubeCard"
+    "YouTubeCard",
+    "TranscriptSegment",
+    "Job",
+    "TableVersion"
 ]
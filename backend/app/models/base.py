@@ -1,7 +1,7 @@
 """Base model class and common imports"""
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, ForeignKey, JSON, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.app.core.database import Base
 
-__all__ = ["Base", "Column", "Integer", "String", "Text", "DateTime", "Float", "Boolean", "ForeignKey", "JSON", "relationship", "func"]
+__all__ = ["Base", "Column", "Integer", "String", "Text", "DateTime", "Float", "Boolean", "ForeignKey", "JSON", "LargeBinary", "relationship", "func"]
@@ -1,5 +1,5 @@
 """Flashcard and Category models"""
-from .base import Base, Column, Integer, String, Text, DateTime, JSON, ForeignKey, func, relationship
+from .base import Base, Column, Integer, String, Text, DateTime, JSON, ForeignKey, LargeBinary, func, relationship
 
 class Category(Base):
     """Category model for organizing flashcards"""
@@ -26,12 +26,14 @@ class Flashcard(Base):
     answer = Column(Text, nullable=False)
     difficulty = Column(String(20), default="medium")  # easy, medium, hard
     tags = Column(JSON, default=list)  # List of string tags
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), index=True)
     
     # Foreign keys
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    # YouTube card the flashcard was generated from; its flashcard_count tracks these rows
+    source_youtube_card_id = Column(Integer, ForeignKey("youtube_cards.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Relationships
     owner = relationship("User", back_populates="flashcards")
@@ -40,3 +42,15 @@ class Flashcard(Base):
 
     def __repr__(self):
         return f"<Flashcard(id={self.id}, question='{self.question[:50]}...')>"
+
+class FlashcardSignature(Base):
+    """MinHash signature of a flashcard's normalized text, used for near-duplicate detection"""
+    __tablename__ = "flashcard_signatures"
+
+    flashcard_id = Column(Integer, ForeignKey("flashcards.id", ondelete="CASCADE"), primary_key=True)
+    num_perm = Column(Integer, nullable=False)
+    signature = Column(LargeBinary, nullable=False)  # num_perm packed unsigned 32-bit minimums
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), index=True)
+
+    def __repr__(self):
+        return f"<FlashcardSignature(flashcard_id={self.flashcard_id})>"
@@ -12,7 +12,8 @@ class Quiz(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan")
+    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan",
+                             order_by="QuizQuestion.question_order")
     attempts = relationship("QuizAttempt", back_populates="quiz", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -0,0 +1,12 @@
+"""Per-table write counters used to derive ETags"""
+from .base import Base, Column, Integer, String
+
+class TableVersion(Base):
+    """Version of a table, incremented in the same transaction as every write to it"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion(table_name='{self.table_name}', version={self.version})>"
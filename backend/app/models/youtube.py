@@ -1,5 +1,9 @@
 """YouTube card model for storing extracted video information"""
-from .base import Base, Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Index
+from sqlalchemy.orm import deferred
+
+from backend.app.core.compression import compress_text, decompress_text
+from .base import Base, Column, Integer, String, Text, DateTime, ForeignKey, LargeBinary, func
 
 class YouTubeCard(Base):
     """YouTube card model for storing extracted video information"""
@@ -8,12 +12,44 @@ class YouTubeCard(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     url = Column(String(500), nullable=False, unique=True)
+    video_id = Column(String(11), nullable=True, unique=True, index=True)  # Canonical YouTube video ID
     description = Column(Text, nullable=True)
-    transcript = Column(Text, nullable=True)
+    # Compressed transcript, only loaded when .transcript is accessed
+    transcript_data = deferred(Column(LargeBinary, nullable=True))
+    transcript_size = Column(Integer, nullable=False, default=0, server_default="0")  # Uncompressed length in characters
     duration = Column(Integer, nullable=True)  # Duration in seconds
     channel = Column(String(100), nullable=True)
     extracted_at = Column(DateTime(timezone=True), server_default=func.now())
-    flashcard_count = Column(Integer, default=0)
+    # Flashcards whose source is this card, kept in step by FlashcardService
+    flashcard_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+
+    @property
+    def transcript(self):
+        """Decompressed transcript text"""
+        return decompress_text(self.transcript_data)
+
+    @transcript.setter
+    def transcript(self, text):
+        self.transcript_data = compress_text(text)
+        self.transcript_size = len(text) if text else 0
 
     def __repr__(self):
         return f"<YouTubeCard(id={self.id}, title='{self.title}')>"
+
+
+class TranscriptSegment(Base):
+    """One timed caption line of a YouTube card's transcript"""
+    __tablename__ = "transcript_segments"
+    __table_args__ = (
+        # Range reads are always "segments of one card ordered by time"
+        Index("ix_transcript_segments_card_start", "card_id", "start_ms"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    card_id = Column(Integer, ForeignKey("youtube_cards.id", ondelete="CASCADE"), nullable=False)
+    start_ms = Column(Integer, nullable=False)
+    end_ms = Column(Integer, nullable=False)
+    text = Column(Text, nullable=False)
+
+    def __repr__(self):
+        return f"<TranscriptSegment(card_id={self.card_id}, start_ms={self.start_ms})>"
@@ -1,5 +1,5 @@
 """Flashcard Pydantic schemas for API validation"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
@@ -10,6 +10,7 @@ class FlashcardBase(BaseModel):
     category: Optional[str] = Field(None, max_length=100, description="Category name")
     difficulty: Optional[str] = Field(None, pattern="^(easy|medium|hard)$", description="Difficulty level")
     tags: Optional[List[str]] = Field(default_factory=list, description="List of tags")
+    source_youtube_card_id: Optional[int] = Field(None, description="YouTube card the flashcard came from")
 
 class FlashcardCreate(FlashcardBase):
     """Schema for creating a new flashcard"""
@@ -31,9 +32,25 @@ class FlashcardResponse(FlashcardBase):
     owner_id: Optional[int] = None
     category_id: Optional[int] = None
     
+    @field_validator("category", mode="before")
+    @classmethod
+    def category_name(cls, value):
+        """ORM flashcards expose the Category relationship; responses use its name"""
+        return getattr(value, "name", value)
+    
     class Config:
         from_attributes = True
 
 class Flashcard(FlashcardResponse):
     """Full flashcard schema"""
-    pass 
\ No newline at end of file
+    pass
+
+class FlashcardGenerateRequest(BaseModel):
+    """Schema for requesting AI flashcard generation from text"""
+    text: str = Field(..., min_length=1, max_length=50000, description="Source text to generate flashcards from")
+    max_cards: int = Field(5, ge=1, le=50, description="Maximum number of flashcards to generate")
+    category: Optional[str] = Field(None, max_length=100, description="Category for all generated flashcards")
+
+class FlashcardStreamRequest(FlashcardGenerateRequest):
+    """Schema for streaming AI flashcard generation"""
+    persist: bool = Field(False, description="Save each flashcard as it arrives")
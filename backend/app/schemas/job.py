@@ -0,0 +1,24 @@
+"""Job Pydantic schemas for API validation"""
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class JobResponse(BaseModel):
+    """Schema for background job status response"""
+    id: int
+    kind: str
+    status: str
+    progress: float = 0.0
+    progress_message: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int
+    payload: Dict[str, Any] = {}
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    run_after: Optional[datetime] = None  # Set while a failed job waits to be retried
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -32,15 +32,6 @@ class QuizCreate(BaseModel):
     difficulty: Optional[str] = Field(None, pattern="^(easy|medium|hard)$", description="Difficulty filter")
     limit: Optional[int] = Field(10, ge=1, le=50, description="Number of questions")
 
-class QuizResponse(QuizBase):
-    """Schema for quiz response"""
-    id: int
-    total_questions: int
-    created_at: datetime
-
-    class Config:
-        from_attributes = True
-
 class QuizQuestionResponse(QuizQuestionBase):
     """Schema for quiz question response"""
     id: int
@@ -51,6 +42,17 @@ class QuizQuestionResponse(QuizQuestionBase):
     class Config:
         from_attributes = True
 
+class QuizResponse(BaseModel):
+    """Schema for quiz response; questions, with their answers, come from /quiz/{id}/questions"""
+    id: int
+    title: str
+    description: Optional[str] = None
+    total_questions: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class QuizAttemptCreate(BaseModel):
     """Schema for creating a quiz attempt"""
     quiz_id: int
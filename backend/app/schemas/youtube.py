@@ -1,8 +1,10 @@
 """YouTube Pydantic schemas for API validation"""
-from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
 
+from backend.app.core.config import settings
+
 class YouTubeCardBase(BaseModel):
     """Base YouTube card schema"""
     title: str = Field(..., min_length=1, max_length=200, description="Video title")
@@ -23,11 +25,28 @@ class YouTubeCardUpdate(BaseModel):
     channel: Optional[str] = Field(None, max_length=100)
     duration: Optional[int] = Field(None, ge=0)
     transcript: Optional[str] = None
-    flashcard_count: Optional[int] = Field(None, ge=0)
 
 class YouTubeCardResponse(YouTubeCardBase):
     """Schema for YouTube card response"""
     id: int
+    video_id: Optional[str] = None
+    flashcard_count: int
+    transcript_size: int = 0
+    extracted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class YouTubeCardSummary(BaseModel):
+    """Schema for YouTube card list items; the transcript is only returned by the detail view"""
+    id: int
+    title: str
+    url: str
+    video_id: Optional[str] = None
+    description: Optional[str] = None
+    channel: Optional[str] = None
+    duration: Optional[int] = None
+    transcript_size: int = 0
     flashcard_count: int
     extracted_at: datetime
 
@@ -38,8 +57,49 @@ class YouTubeCard(YouTubeCardResponse):
     """Full YouTube card schema"""
     pass
 
+class TranscriptSegmentResponse(BaseModel):
+    """One timed line of a transcript"""
+    start_ms: int
+    end_ms: int
+    text: str
+
+    class Config:
+        from_attributes = True
+
 class YouTubeExtractRequest(BaseModel):
-    """Schema for YouTube content extraction request"""
-    url: HttpUrl = Field(..., description="YouTube video URL")
+    """Schema for YouTube content extraction request (one URL or many)"""
+    url: Optional[str] = Field(None, description="YouTube video URL")
+    urls: List[str] = Field(default_factory=list, description="Several YouTube video URLs")
+    languages: List[str] = Field(default_factory=lambda: ["en"], description="Preferred transcript languages")
+    refresh: bool = Field(default=False, description="Fetch transcripts again for videos that already have one")
     generate_flashcards: bool = Field(default=True, description="Whether to generate flashcards")
-    max_flashcards: int = Field(default=10, ge=1, le=50, description="Maximum number of flashcards to generate") 
\ No newline at end of file
+    max_flashcards: int = Field(default=10, ge=1, le=50, description="Maximum number of flashcards to generate")
+
+    @model_validator(mode="after")
+    def check_urls(self):
+        if not self.all_urls():
+            raise ValueError("Provide url or urls")
+        if len(self.all_urls()) > settings.youtube_extract_max_urls:
+            raise ValueError(f"At most {settings.youtube_extract_max_urls} URLs per request")
+        return self
+
+    def all_urls(self) -> List[str]:
+        return ([self.url] if self.url else []) + self.urls
+
+class YouTubeExtractResult(BaseModel):
+    """Outcome of extracting one URL"""
+    url: str
+    video_id: Optional[str] = None
+    status: str = Field(..., description="created, updated, existing (already had a transcript) or failed")
+    card_id: Optional[int] = None
+    transcript_length: int = 0
+    error: Optional[str] = None
+    generation_job_id: Optional[int] = None
+
+class YouTubeExtractResponse(BaseModel):
+    """Schema for YouTube content extraction response"""
+    results: List[YouTubeExtractResult]
+    created: int
+    updated: int
+    existing: int = 0
+    failed: int
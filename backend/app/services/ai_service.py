@@ -1,22 +1,34 @@
 """AI service for OpenAI integration"""
-import openai
-from typing import List, Dict, Any, Optional
+import logging
+from typing import TYPE_CHECKING, List, Dict, Any, Iterator, Optional
 from backend.app.core.config import settings
+from backend.app.core.json_stream import JSONArrayItemParser
+from backend.app.core.llm import InstrumentedLLM
+
+if TYPE_CHECKING:
+    from backend.app.services.distractor_service import DistractorService
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt text changes so latency and token metrics can be compared per version
+FLASHCARD_PROMPT_VERSION = "flashcards-v1"
 
 class AIService:
     """Service class for AI operations"""
     
     def __init__(self):
-        if settings.openai_api_key:
-            openai.api_key = settings.openai_api_key
+        self.client = None
+        if settings.OPENAI_API_KEY:
+            from openai import OpenAI  # Deferred so the app starts without importing the SDK
+            
+            # Retries are handled (and counted) by InstrumentedLLM
+            self.client = InstrumentedLLM(
+                OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL, max_retries=0)
+            )
     
-    def generate_flashcards_from_text(self, text: str, max_cards: int = 5) -> List[Dict[str, Any]]:
-        """Generate flashcards from text using OpenAI"""
-        if not settings.openai_api_key:
-            raise Exception("OpenAI API key not configured")
-        
-        try:
-            prompt = f"""
+    def _flashcard_messages(self, text: str, max_cards: int) -> List[Dict[str, str]]:
+        """Build the chat messages for flashcard generation"""
+        prompt = f"""
             Create {max_cards} flashcards from the following text. 
             Each flashcard should have a question and answer.
             Format as JSON with this structure:
@@ -33,13 +45,23 @@ class AIService:
             
             Text: {text}
             """
-            
-            response = openai.ChatCompletion.create(
+        
+        return [
+            {"role": "system", "content": "You are a helpful assistant that creates educational flashcards."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def generate_flashcards_from_text(self, text: str, max_cards: int = 5) -> List[Dict[str, Any]]:
+        """Generate flashcards from text using OpenAI"""
+        if not self.client:
+            raise Exception("OpenAI API key not configured")
+        
+        try:
+            response = self.client.create(
+                call_site="flashcards.generate",
+                prompt_version=FLASHCARD_PROMPT_VERSION,
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that creates educational flashcards."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._flashcard_messages(text, max_cards),
                 max_tokens=1000,
                 temperature=0.7
             )
@@ -55,10 +77,47 @@ class AIService:
                 # Fallback: try to extract flashcards from text
                 return self._extract_flashcards_from_text(content)
                 
-        except Exception as e:
-            print(f"Error generating flashcards: {e}")
+        except Exception:
+            logger.exception("Error generating flashcards")
             return []
     
+    def stream_flashcards_from_text(self, text: str, max_cards: int = 5) -> Iterator[Dict[str, Any]]:
+        """
+        Generate flashcards with a streaming completion, yielding each card
+        as soon as its JSON object is complete instead of waiting for the
+        whole response.
+        """
+        if not self.client:
+            raise Exception("OpenAI API key not configured")
+        
+        stream = self.client.stream(
+            call_site="flashcards.stream",
+            prompt_version=FLASHCARD_PROMPT_VERSION,
+            model="gpt-3.5-turbo",
+            messages=self._flashcard_messages(text, max_cards),
+            max_tokens=1000,
+            temperature=0.7
+        )
+        
+        parser = JSONArrayItemParser()
+        emitted = 0
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                
+                for card in parser.feed(delta):
+                    if isinstance(card, dict) and "question" in card:
+                        yield card
+                        emitted += 1
+                        if emitted >= max_cards:
+                            return
+        finally:
+            stream.close()
+    
     def _extract_flashcards_from_text(self, text: str) -> List[Dict[str, Any]]:
         """Fallback method to extract flashcards from text"""
         # Simple extraction - could be improved
@@ -80,7 +139,8 @@ class AIService:
         
         return flashcards
     
-    def generate_quiz_questions(self, flashcards: List[Dict[str, Any]], num_questions: int = 5) -> List[Dict[str, Any]]:
+    def generate_quiz_questions(self, flashcards: List[Dict[str, Any]], num_questions: int = 5,
+                                distractor_service: Optional["DistractorService"] = None) -> List[Dict[str, Any]]:
         """Generate quiz questions from flashcards"""
         import random
         
@@ -92,31 +152,28 @@ class AIService:
         
         quiz_questions = []
         for card in selected_cards:
+            options = self._generate_multiple_choice_options(card, distractor_service)
             question = {
                 "question": card.get("question", ""),
                 "answer": card.get("answer", ""),
-                "type": "multiple_choice",
-                "options": self._generate_multiple_choice_options(card.get("answer", ""))
+                "type": "multiple_choice" if len(options) > 1 else "open_text",
+                "options": options
             }
             quiz_questions.append(question)
         
         return quiz_questions
     
-    def _generate_multiple_choice_options(self, correct_answer: str) -> List[str]:
-        """Generate multiple choice options for a question"""
-        # Simple implementation - could be improved with AI
-        options = [correct_answer]
+    def _generate_multiple_choice_options(self, card: Dict[str, Any],
+                                          distractor_service: Optional["DistractorService"] = None) -> List[str]:
+        """
+        Generate multiple choice options for a question.
         
-        # Add some dummy options
-        dummy_options = [
-            "Option A",
-            "Option B", 
-            "Option C",
-            "None of the above"
-        ]
-        
-        import random
-        options.extend(random.sample(dummy_options, 3))
-        random.shuffle(options)
+        Distractors are other flashcards' answers from the same category,
+        picked from the precomputed TF-IDF index. Cards without an ID or a
+        distractor service only get their correct answer.
+        """
+        correct_answer = card.get("answer", "")
+        if distractor_service is None or card.get("id") is None:
+            return [correct_answer]
         
-        return options 
\ No newline at end of file
+        return distractor_service.get_options(card["id"], correct_answer)
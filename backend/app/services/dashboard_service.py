@@ -0,0 +1,194 @@
+"""Home dashboard summary, assembled from pieces cached until the tables they read change"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, case, func, or_, select
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import registry
+from backend.app.core.table_versions import get_versions
+from backend.app.models import Category, Flashcard, Quiz, QuizAnswer, QuizAttempt, QuizQuestion, YouTubeCard
+from backend.app.schemas.youtube import YouTubeCardSummary
+
+dashboard_cache_requests = registry.counter("dashboard_cache_requests_total",
+                                            "Dashboard pieces served from cache or recomputed", ("piece", "result"))
+
+class Piece(NamedTuple):
+    name: str
+    tables: Tuple[str, ...]  # Any write to these invalidates the cached value
+    per_user: bool = False
+    max_age: Optional[float] = None  # Seconds; for pieces that also depend on the clock
+
+class PieceCache:
+    """
+    Computed dashboard pieces keyed by (piece, user), each stored with the
+    table versions it was computed at. Shared by all requests in a process.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[int, ...], float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, versions: Tuple[int, ...], max_age: Optional[float]) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            cached_versions, computed_at, value = entry
+            if cached_versions != versions or (max_age is not None and time.monotonic() - computed_at > max_age):
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def put(self, key: Hashable, versions: Tuple[int, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (versions, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+dashboard_cache = PieceCache()
+
+class DashboardService:
+    """Service for the single-request home dashboard"""
+
+    PIECES = (
+        Piece("flashcards", ("flashcards",)),
+        Piece("categories", ("categories", "flashcards")),
+        Piece("youtube", ("youtube_cards",)),
+        Piece("reviews", ("flashcards", "quiz_questions", "quiz_answers", "quiz_attempts"), per_user=True,
+              max_age=settings.dashboard_review_max_age),
+        Piece("attempts", ("quiz_attempts", "quizzes"), per_user=True),
+    )
+    RECENT_LIMIT = 5
+
+    def __init__(self, db: Session, cache: PieceCache = dashboard_cache):
+        self.db = db
+        self.cache = cache
+
+    def get_dashboard(self, user_id: int) -> Dict[str, Any]:
+        """
+        Every piece, recomputing only those whose tables were written since
+        they were cached. One query reads the versions of all the tables.
+        """
+        versions = get_versions(self.db, sorted({table for piece in self.PIECES for table in piece.tables}))
+        dashboard = {}
+        for piece in self.PIECES:
+            key = (piece.name, user_id if piece.per_user else None)
+            piece_versions = tuple(versions[table] for table in piece.tables)
+            hit, value = self.cache.get(key, piece_versions, piece.max_age)
+            if not hit:
+                compute: Callable[[int], Any] = getattr(self, f"_{piece.name}")
+                value = compute(user_id)
+                # Versions read before computing: a write in between only makes the next request recompute
+                self.cache.put(key, piece_versions, value)
+            dashboard_cache_requests.inc(piece=piece.name, result="hit" if hit else "miss")
+            dashboard[piece.name] = value
+        return dashboard
+
+    def _flashcards(self, user_id: int) -> Dict[str, Any]:
+        by_difficulty = dict(self.db.execute(
+            select(Flashcard.difficulty, func.count(Flashcard.id)).group_by(Flashcard.difficulty)
+        ).all())
+        return {"total": sum(by_difficulty.values()), "by_difficulty": by_difficulty}
+
+    def _categories(self, user_id: int) -> list:
+        rows = self.db.execute(
+            select(Category.id, Category.name, Category.color, func.count(Flashcard.id))
+            .outerjoin(Flashcard, Flashcard.category_id == Category.id)
+            .group_by(Category.id)
+            .order_by(Category.name)
+        ).all()
+        return [
+            {"id": category_id, "name": name, "color": color, "flashcard_count": count}
+            for category_id, name, color, count in rows
+        ]
+
+    def _youtube(self, user_id: int) -> Dict[str, Any]:
+        total = self.db.scalar(select(func.count(YouTubeCard.id)))
+        recent = self.db.scalars(
+            select(YouTubeCard).order_by(YouTubeCard.extracted_at.desc()).limit(self.RECENT_LIMIT)
+        ).all()
+        return {
+            "total_cards": total,
+            "recent_cards": [YouTubeCardSummary.model_validate(card).model_dump(mode="json") for card in recent],
+        }
+
+    def _reviews(self, user_id: int) -> Dict[str, int]:
+        """
+        Flashcards the user has never answered are new. Answered ones are due
+        when the latest answer was wrong or is older than review_interval_days.
+        """
+        ranked = (
+            select(
+                QuizQuestion.flashcard_id.label("flashcard_id"),
+                QuizAnswer.is_correct.label("is_correct"),
+                QuizAnswer.answered_at.label("answered_at"),
+                func.row_number().over(
+                    partition_by=QuizQuestion.flashcard_id,
+                    order_by=(QuizAnswer.answered_at.desc(), QuizAnswer.id.desc())
+                ).label("position"),
+            )
+            .join(QuizQuestion, QuizAnswer.question_id == QuizQuestion.id)
+            .join(QuizAttempt, QuizAnswer.attempt_id == QuizAttempt.id)
+            .where(QuizAttempt.user_id == user_id, QuizQuestion.flashcard_id.is_not(None))
+            .subquery()
+        )
+        latest = select(ranked).where(ranked.c.position == 1).subquery()
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=settings.review_interval_days)
+
+        new, due = self.db.execute(
+            select(
+                func.count(case((latest.c.flashcard_id.is_(None), 1))),
+                func.count(case((and_(
+                    latest.c.flashcard_id.is_not(None),
+                    or_(latest.c.is_correct.is_(False), latest.c.answered_at < cutoff)
+                ), 1))),
+            )
+            .select_from(Flashcard)
+            .outerjoin(latest, latest.c.flashcard_id == Flashcard.id)
+        ).one()
+        return {"due": due, "new": new}
+
+    def _attempts(self, user_id: int) -> Dict[str, Any]:
+        total, completed, average_score = self.db.execute(
+            select(
+                func.count(QuizAttempt.id),
+                func.count(case((QuizAttempt.completed.is_(True), 1))),
+                func.avg(case((QuizAttempt.completed.is_(True), QuizAttempt.score))),
+            ).where(QuizAttempt.user_id == user_id)
+        ).one()
+        recent = self.db.execute(
+            select(QuizAttempt.id, QuizAttempt.quiz_id, Quiz.title, QuizAttempt.score, QuizAttempt.completed,
+                   QuizAttempt.started_at, QuizAttempt.completed_at)
+            .join(Quiz, QuizAttempt.quiz_id == Quiz.id)
+            .where(QuizAttempt.user_id == user_id)
+            .order_by(QuizAttempt.started_at.desc(), QuizAttempt.id.desc())
+            .limit(self.RECENT_LIMIT)
+        ).all()
+        return {
+            "total": total,
+            "completed": completed,
+            "average_score": round(average_score or 0, 2),
+            "recent": [
+                {
+                    "id": row.id,
+                    "quiz_id": row.quiz_id,
+                    "quiz_title": row.title,
+                    "score": row.score,
+                    "completed": row.completed,
+                    "started_at": row.started_at.isoformat() if row.started_at else None,
+                    "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+                }
+                for row in recent
+            ],
+        }
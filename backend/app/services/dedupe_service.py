@@ -0,0 +1,299 @@
+"""Near-duplicate flashcard detection with MinHash signatures and an LSH index"""
+import hashlib
+import re
+import threading
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.core.table_versions import get_versions
+from backend.app.models import Flashcard, FlashcardSignature
+
+Signature = Tuple[int, ...]
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+def shingles(question: str, answer: str) -> Set[str]:
+    """Word unigrams and bigrams of the normalized question and answer"""
+    result: Set[str] = set()
+    for prefix, text in (("q", question), ("a", answer)):
+        words = normalize_text(text).split()
+        result.update(f"{prefix}:{word}" for word in words)
+        result.update(f"{prefix}:{first} {second}" for first, second in zip(words, words[1:]))
+    return result
+
+def compute_signature(question: str, answer: str, num_perm: Optional[int] = None) -> Signature:
+    """
+    MinHash signature of a flashcard.
+
+    Each shingle is hashed once with SHAKE-128 into num_perm independent 32-bit
+    values, and the signature is the element-wise minimum across shingles, so
+    the fraction of equal positions between two signatures estimates the
+    Jaccard similarity of their shingle sets.
+    """
+    num_perm = num_perm or settings.dedupe_num_perm
+    rows = [
+        array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(4 * num_perm))
+        for shingle in shingles(question, answer)
+    ]
+    if not rows:
+        return tuple([0xFFFFFFFF] * num_perm)
+    return tuple(map(min, zip(*rows)))
+
+def estimate_similarity(first: Signature, second: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+def pack_signature(signature: Signature) -> bytes:
+    return array("I", signature).tobytes()
+
+def unpack_signature(data: bytes) -> Signature:
+    return tuple(array("I", data))
+
+class NearDuplicateIndex:
+    """
+    In-memory locality-sensitive hashing index over flashcard signatures.
+
+    Signatures are split into bands; cards sharing any band bucket become
+    candidates, and candidates are ranked by estimated similarity. Lookups
+    touch only a handful of buckets regardless of deck size.
+    """
+
+    def __init__(self, num_perm: int, bands: int):
+        if num_perm % bands:
+            raise ValueError("dedupe_bands must divide dedupe_num_perm")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.loaded = False
+        self.max_loaded_id = 0
+        self.updated_after: Optional[datetime] = None  # Newest signature updated_at seen
+        self.versions: Tuple[int, ...] = ()  # Table versions the index was last synced at
+        self._signatures: Dict[int, Signature] = {}
+        self._buckets: List[Dict[Tuple[int, ...], Set[int]]] = [{} for _ in range(bands)]
+        self._lock = threading.RLock()
+        self.load_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: Signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, flashcard_id: int, signature: Signature) -> None:
+        with self._lock:
+            self.remove(flashcard_id)
+            self._signatures[flashcard_id] = signature
+            for band, key in self._band_keys(signature):
+                self._buckets[band].setdefault(key, set()).add(flashcard_id)
+            self.max_loaded_id = max(self.max_loaded_id, flashcard_id)
+
+    def remove(self, flashcard_id: int) -> None:
+        with self._lock:
+            signature = self._signatures.pop(flashcard_id, None)
+            if signature is None:
+                return
+            for band, key in self._band_keys(signature):
+                bucket = self._buckets[band].get(key)
+                if bucket:
+                    bucket.discard(flashcard_id)
+                    if not bucket:
+                        del self._buckets[band][key]
+
+    def query(self, signature: Signature, threshold: float, exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Cards whose estimated similarity is at least threshold, most similar first"""
+        with self._lock:
+            candidates: Set[int] = set()
+            for band, key in self._band_keys(signature):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(exclude_id)
+
+            matches = []
+            for candidate in candidates:
+                similarity = estimate_similarity(signature, self._signatures[candidate])
+                if similarity >= threshold:
+                    matches.append((candidate, similarity))
+
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def signatures(self) -> Dict[int, Signature]:
+        """Snapshot of all indexed signatures"""
+        with self._lock:
+            return dict(self._signatures)
+
+    def retain(self, flashcard_ids: Set[int]) -> None:
+        """Drop every card not in flashcard_ids"""
+        with self._lock:
+            for flashcard_id in set(self._signatures) - flashcard_ids:
+                self.remove(flashcard_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._signatures.clear()
+            self._buckets = [{} for _ in range(self.bands)]
+            self.max_loaded_id = 0
+            self.updated_after = None
+            self.versions = ()
+            self.loaded = False
+
+# Process-wide index, loaded from flashcard_signatures on first use
+flashcard_index = NearDuplicateIndex(settings.dedupe_num_perm, settings.dedupe_bands)
+
+class DuplicateFlashcardError(ValueError):
+    """Raised when a new flashcard nearly matches an existing one"""
+
+    def __init__(self, duplicate_of: int, similarity: float):
+        self.duplicate_of = duplicate_of
+        self.similarity = similarity
+        super().__init__(f"Flashcard is a near-duplicate of flashcard {duplicate_of} (similarity {similarity:.2f})")
+
+class DedupeService:
+    """Service class for near-duplicate detection backed by the flashcard_signatures table"""
+
+    def __init__(self, db: Session, index: NearDuplicateIndex = flashcard_index):
+        self.db = db
+        self.index = index
+
+    TABLES = ("flashcard_signatures", "flashcards")
+
+    def ensure_loaded(self) -> None:
+        """
+        Load signatures into the in-memory index and keep it in step with
+        writes made by other processes.
+
+        The first call loads every stored signature and backfills cards that
+        do not have one yet. Later calls read the table versions and, only
+        if they changed, pick up signatures added or rewritten since the last
+        sync (by primary key and the indexed updated_at), then drop deleted
+        cards if the stored count no longer matches the index.
+        """
+        versions = tuple(get_versions(self.db, self.TABLES).values())
+        if not self.index.loaded:
+            with self.index.load_lock:
+                if not self.index.loaded:
+                    self._load_signatures()
+                    self.backfill_signatures()
+                    self.index.versions = versions
+                    self.index.loaded = True
+            return
+
+        if versions != self.index.versions:
+            self._catch_up()
+            self.index.versions = versions
+
+    def _load_signatures(self, changed_since: Optional[datetime] = None) -> None:
+        query = self.db.query(FlashcardSignature.flashcard_id, FlashcardSignature.num_perm,
+                              FlashcardSignature.signature, FlashcardSignature.updated_at)
+        if changed_since is not None:
+            query = query.filter(or_(FlashcardSignature.flashcard_id > self.index.max_loaded_id,
+                                     FlashcardSignature.updated_at > changed_since))
+        for flashcard_id, num_perm, data, updated_at in query.all():
+            if num_perm == self.index.num_perm:
+                self.index.add(flashcard_id, unpack_signature(data))
+            if updated_at and (self.index.updated_after is None or updated_at > self.index.updated_after):
+                self.index.updated_after = updated_at
+
+    def _catch_up(self) -> None:
+        # updated_at has one-second resolution, so rows from the newest second seen are read again
+        since = self.index.updated_after - timedelta(seconds=1) if self.index.updated_after else datetime.min
+        self._load_signatures(since)
+        stored = (
+            self.db.query(func.count(FlashcardSignature.flashcard_id))
+            .filter(FlashcardSignature.num_perm == self.index.num_perm)
+            .scalar()
+        )
+        if stored != len(self.index):
+            ids = self.db.query(FlashcardSignature.flashcard_id).filter(FlashcardSignature.num_perm == self.index.num_perm)
+            self.index.retain({flashcard_id for (flashcard_id,) in ids})
+
+    def backfill_signatures(self, batch_size: int = 500) -> int:
+        """Compute signatures for flashcards that were created without one"""
+        missing = (
+            self.db.query(Flashcard.id, Flashcard.question, Flashcard.answer)
+            .outerjoin(FlashcardSignature, FlashcardSignature.flashcard_id == Flashcard.id)
+            .filter((FlashcardSignature.flashcard_id.is_(None)) | (FlashcardSignature.num_perm != self.index.num_perm))
+            .all()
+        )
+        for start in range(0, len(missing), batch_size):
+            for flashcard_id, question, answer in missing[start:start + batch_size]:
+                signature = compute_signature(question, answer, self.index.num_perm)
+                self.store_signature(flashcard_id, signature)
+                self.index.add(flashcard_id, signature)
+            self.db.commit()
+
+        return len(missing)
+
+    def signature_for(self, question: str, answer: str) -> Signature:
+        return compute_signature(question, answer, self.index.num_perm)
+
+    def find_duplicates(self, signature: Signature, threshold: Optional[float] = None,
+                        exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Existing flashcards that nearly match the signature, most similar first"""
+        self.ensure_loaded()
+        return self.index.query(signature, threshold or settings.dedupe_threshold, exclude_id)
+
+    def store_signature(self, flashcard_id: int, signature: Signature) -> None:
+        """Add or replace a flashcard's signature row in the current transaction"""
+        self.db.merge(FlashcardSignature(
+            flashcard_id=flashcard_id,
+            num_perm=len(signature),
+            signature=pack_signature(signature)
+        ))
+
+    def delete_signature(self, flashcard_id: int) -> None:
+        """Remove a flashcard's signature row in the current transaction"""
+        self.db.query(FlashcardSignature).filter(FlashcardSignature.flashcard_id == flashcard_id).delete()
+
+    def duplicate_report(self, threshold: Optional[float] = None) -> List[Dict]:
+        """
+        Group the whole deck into clusters of near-duplicates.
+
+        Pairs at or above the threshold are joined with union-find, so a
+        cluster may contain cards linked through an intermediate card.
+        """
+        threshold = threshold or settings.dedupe_threshold
+        self.ensure_loaded()
+
+        parent: Dict[int, int] = {}
+
+        def find(item: int) -> int:
+            while parent.setdefault(item, item) != item:
+                parent[item] = parent[parent[item]]
+                item = parent[item]
+            return item
+
+        best: Dict[int, float] = {}
+        for flashcard_id, signature in self.index.signatures().items():
+            for other_id, similarity in self.index.query(signature, threshold, exclude_id=flashcard_id):
+                parent[find(flashcard_id)] = find(other_id)
+                best[flashcard_id] = max(best.get(flashcard_id, 0.0), similarity)
+
+        clusters: Dict[int, List[int]] = {}
+        for flashcard_id in best:
+            clusters.setdefault(find(flashcard_id), []).append(flashcard_id)
+
+        ids = [flashcard_id for members in clusters.values() for flashcard_id in members]
+        questions = dict(self.db.query(Flashcard.id, Flashcard.question).filter(Flashcard.id.in_(ids)).all()) if ids else {}
+
+        report = []
+        for members in clusters.values():
+            members.sort()
+            report.append({
+                "keep": members[0],
+                "duplicates": members[1:],
+                "flashcards": [
+                    {"id": member, "question": questions.get(member), "max_similarity": round(best[member], 3)}
+                    for member in members
+                ]
+            })
+
+        return sorted(report, key=lambda cluster: -len(cluster["flashcards"]))
@@ -0,0 +1,264 @@
+"""Multiple-choice distractor selection from other flashcards' answers using TF-IDF"""
+import bisect
+import math
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from backend.app.core.metrics import registry
+from backend.app.core.table_versions import get_versions
+from backend.app.models import Flashcard
+from backend.app.services.dedupe_service import normalize_text
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were "
+    "which with you your can does do not no".split()
+)
+
+distractor_cache_requests = registry.counter("distractor_cache_requests_total",
+                                             "Distractor lookups served from the per-card cache or recomputed", ("result",))
+
+def _terms(text: str) -> Counter:
+    return Counter(word for word in normalize_text(text).split() if word not in _STOPWORDS)
+
+class _CategoryIndex:
+    """TF-IDF vectors and an inverted index for the answers in one category"""
+
+    def __init__(self):
+        self.answers: Dict[int, str] = {}
+        self.terms: Dict[int, Counter] = {}
+        self.document_frequency: Counter = Counter()
+        self.version = 0
+        self._built_version = -1
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._weights: Dict[int, Dict[str, float]] = {}
+        self._by_length: List[Tuple[int, int]] = []
+
+    def add(self, flashcard_id: int, answer: str) -> None:
+        self.remove(flashcard_id)
+        terms = _terms(answer)
+        self.answers[flashcard_id] = answer
+        self.terms[flashcard_id] = terms
+        self.document_frequency.update(terms.keys())
+        self.version += 1
+
+    def remove(self, flashcard_id: int) -> None:
+        terms = self.terms.pop(flashcard_id, None)
+        if terms is None:
+            return
+        self.answers.pop(flashcard_id, None)
+        self.document_frequency.subtract(terms.keys())
+        self.document_frequency += Counter()  # Drop terms whose count reached zero
+        self.version += 1
+
+    def build(self) -> None:
+        """Recompute vectors for this category only; other categories are untouched"""
+        if self._built_version == self.version:
+            return
+
+        documents = len(self.terms)
+        idf = {term: math.log((1 + documents) / (1 + count)) + 1 for term, count in self.document_frequency.items()}
+        self._postings = {}
+        self._weights = {}
+        for flashcard_id, terms in self.terms.items():
+            weights = {term: count * idf[term] for term, count in terms.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            weights = {term: weight / norm for term, weight in weights.items()}
+            self._weights[flashcard_id] = weights
+            for term, weight in weights.items():
+                self._postings.setdefault(term, {})[flashcard_id] = weight
+
+        self._by_length = sorted((len(answer), flashcard_id) for flashcard_id, answer in self.answers.items())
+        self._built_version = self.version
+
+    def similar(self, flashcard_id: int) -> List[Tuple[float, int]]:
+        """Other cards sharing at least one term, by cosine similarity (uses only the card's postings)"""
+        scores: Dict[int, float] = {}
+        for term, weight in self._weights.get(flashcard_id, {}).items():
+            for other_id, other_weight in self._postings[term].items():
+                if other_id != flashcard_id:
+                    scores[other_id] = scores.get(other_id, 0.0) + weight * other_weight
+        return sorted(((score, other_id) for other_id, score in scores.items()), key=lambda item: (-item[0], item[1]))
+
+    def nearest_by_length(self, length: int, limit: int) -> List[int]:
+        """Cards whose answers are closest in length, for filling when few answers share terms"""
+        position = bisect.bisect_left(self._by_length, (length, -1))
+        left, right = position - 1, position
+        result = []
+        while len(result) < limit and (left >= 0 or right < len(self._by_length)):
+            take_left = right >= len(self._by_length) or (
+                left >= 0 and length - self._by_length[left][0] <= self._by_length[right][0] - length
+            )
+            if take_left:
+                result.append(self._by_length[left][1])
+                left -= 1
+            else:
+                result.append(self._by_length[right][1])
+                right += 1
+        return result
+
+class DistractorIndex:
+    """
+    Per-category TF-IDF indexes over flashcard answers.
+
+    Adding, updating or removing a card only marks its own category dirty;
+    that category's vectors are rebuilt on the next lookup. Distractor sets
+    are cached per card and reused until the card's category changes.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self.max_loaded_id = 0
+        self.updated_after: Optional[datetime] = None  # Newest flashcard created_at or updated_at seen
+        self.version: Optional[int] = None  # flashcards table version the index was last synced at
+        self.load_lock = threading.Lock()
+        self._categories: Dict[Optional[int], _CategoryIndex] = {}
+        self._card_category: Dict[int, Optional[int]] = {}
+        self._cache: Dict[int, Tuple[int, int, List[str]]] = {}  # card -> (category version, count, answers)
+        self._lock = threading.RLock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self) -> int:
+        return len(self._card_category)
+
+    def add(self, flashcard_id: int, answer: str, category_id: Optional[int]) -> None:
+        with self._lock:
+            self.remove(flashcard_id)
+            self._categories.setdefault(category_id, _CategoryIndex()).add(flashcard_id, answer)
+            self._card_category[flashcard_id] = category_id
+            self.max_loaded_id = max(self.max_loaded_id, flashcard_id)
+
+    def remove(self, flashcard_id: int) -> None:
+        with self._lock:
+            if flashcard_id not in self._card_category:
+                return
+            category_id = self._card_category.pop(flashcard_id)
+            self._categories[category_id].remove(flashcard_id)
+            self._cache.pop(flashcard_id, None)
+
+    def retain(self, flashcard_ids: Set[int]) -> None:
+        """Drop every card not in flashcard_ids"""
+        with self._lock:
+            for flashcard_id in set(self._card_category) - flashcard_ids:
+                self.remove(flashcard_id)
+
+    def distractors(self, flashcard_id: int, count: int = 3) -> List[str]:
+        """Answers from the same category that are most similar to this card's answer"""
+        with self._lock:
+            if flashcard_id not in self._card_category:
+                return []
+
+            category = self._categories[self._card_category[flashcard_id]]
+            cached = self._cache.get(flashcard_id)
+            if cached and cached[0] == category.version and cached[1] == count:
+                self.cache_hits += 1
+                distractor_cache_requests.inc(result="hit")
+                return list(cached[2])
+
+            self.cache_misses += 1
+            distractor_cache_requests.inc(result="miss")
+            category.build()
+            correct = category.answers[flashcard_id]
+            seen: Set[str] = {normalize_text(correct)}
+            chosen: List[str] = []
+
+            candidates = [other_id for _, other_id in category.similar(flashcard_id)]
+            candidates += category.nearest_by_length(len(correct), count * 4 + 1)
+            for other_id in candidates:
+                answer = category.answers.get(other_id)
+                if other_id == flashcard_id or answer is None:
+                    continue
+                normalized = normalize_text(answer)
+                if normalized in seen:
+                    continue
+                seen.add(normalized)
+                chosen.append(answer)
+                if len(chosen) == count:
+                    break
+
+            self._cache[flashcard_id] = (category.version, count, chosen)
+            return list(chosen)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._categories.clear()
+            self._card_category.clear()
+            self._cache.clear()
+            self.max_loaded_id = 0
+            self.updated_after = None
+            self.version = None
+            self.loaded = False
+
+# Process-wide index, loaded from the flashcards table on first use
+distractor_index = DistractorIndex()
+
+class DistractorService:
+    """Service class for picking multiple-choice distractors"""
+
+    def __init__(self, db: Session, index: DistractorIndex = distractor_index):
+        self.db = db
+        self.index = index
+        self.caught_up = False
+
+    def ensure_loaded(self) -> None:
+        """
+        Load all answers on first use, then follow writes from other
+        processes; once per service instance, so building a whole quiz
+        costs one version check while the flashcards table is unchanged.
+
+        When its version moved, cards created or edited since the last sync
+        are reloaded (by the indexed created_at and updated_at, since SQLite
+        reuses the ID of a deleted newest row), and deleted cards are dropped
+        if the row count no longer matches the index.
+        """
+        if self.caught_up:
+            return
+        self.caught_up = True
+        version = get_versions(self.db, ["flashcards"])["flashcards"]
+        if not self.index.loaded:
+            with self.index.load_lock:
+                if not self.index.loaded:
+                    self._load_flashcards()
+                    self.index.version = version
+                    self.index.loaded = True
+            return
+
+        if version != self.index.version:
+            self._catch_up()
+            self.index.version = version
+
+    def _load_flashcards(self, changed_since: Optional[datetime] = None) -> None:
+        query = self.db.query(Flashcard.id, Flashcard.answer, Flashcard.category_id,
+                              Flashcard.created_at, Flashcard.updated_at)
+        if changed_since is not None:
+            query = query.filter(or_(Flashcard.id > self.index.max_loaded_id, Flashcard.created_at > changed_since,
+                                     Flashcard.updated_at > changed_since))
+        for flashcard_id, answer, category_id, created_at, updated_at in query.all():
+            self.index.add(flashcard_id, answer, category_id)
+            changed_at = max(filter(None, (created_at, updated_at)), default=None)
+            if changed_at and (self.index.updated_after is None or changed_at > self.index.updated_after):
+                self.index.updated_after = changed_at
+
+    def _catch_up(self) -> None:
+        # The timestamps have one-second resolution, so cards from the newest second seen are read again
+        since = self.index.updated_after - timedelta(seconds=1) if self.index.updated_after else datetime.min
+        self._load_flashcards(since)
+        if self.db.query(func.count(Flashcard.id)).scalar() != len(self.index):
+            self.index.retain({flashcard_id for (flashcard_id,) in self.db.query(Flashcard.id)})
+
+    def get_distractors(self, flashcard_id: int, count: int = 3) -> List[str]:
+        """Distractor answers for a flashcard"""
+        self.ensure_loaded()
+        return self.index.distractors(flashcard_id, count)
+
+    def get_options(self, flashcard_id: int, correct_answer: str, count: int = 3) -> List[str]:
+        """Correct answer plus distractors in a stable per-card shuffled order"""
+        options = [correct_answer] + self.get_distractors(flashcard_id, count)
+        random.Random(flashcard_id).shuffle(options)
+        return options
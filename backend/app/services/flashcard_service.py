@@ -1,10 +1,31 @@
 """Flashcard service for business logic using SQLAlchemy ORM"""
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy import and_, or_, update
 
-from backend.app.models import Flashcard, User, Category
+from backend.app.core.batch import fetch_by_ids
+from backend.app.core.config import settings
+from backend.app.core.projection import project_rows
+from backend.app.models import Flashcard, User, Category, YouTubeCard
 from backend.app.schemas.flashcard import FlashcardCreate, FlashcardUpdate
+from backend.app.services.dedupe_service import DedupeService, DuplicateFlashcardError
+from backend.app.services.distractor_service import distractor_index
+
+# Columns list endpoints can return with fields=; category is the category name
+FLASHCARD_FIELDS = {
+    **{name: getattr(Flashcard, name) for name in ("id", "question", "answer", "difficulty", "tags",
+                                                    "created_at", "updated_at", "owner_id", "category_id",
+                                                    "source_youtube_card_id")},
+    "category": Category.name,
+}
+
+class SourceCardNotFoundError(ValueError):
+    """Raised when a flashcard names a source YouTube card that does not exist (or was deleted)"""
+
+    def __init__(self, youtube_card_id: int):
+        self.youtube_card_id = youtube_card_id
+        super().__init__(f"YouTube card {youtube_card_id} not found")
 
 class FlashcardService:
     """Service class for flashcard operations using SQLAlchemy"""
@@ -12,22 +33,53 @@ class FlashcardService:
     def __init__(self, db: Session):
         self.db = db
     
+    def _query(self):
+        """Flashcards with their category joined in, so serializing category names runs no extra queries"""
+        return self.db.query(Flashcard).options(joinedload(Flashcard.category))
+    
     def get_all_flashcards(self, skip: int = 0, limit: int = 100) -> List[Flashcard]:
         """Get all flashcards with pagination"""
-        return self.db.query(Flashcard).offset(skip).limit(limit).all()
+        return self._query().offset(skip).limit(limit).all()
     
     def get_flashcard_by_id(self, flashcard_id: int) -> Optional[Flashcard]:
         """Get a specific flashcard by ID"""
-        return self.db.query(Flashcard).filter(Flashcard.id == flashcard_id).first()
+        return self._query().filter(Flashcard.id == flashcard_id).first()
     
-    def create_flashcard(self, flashcard_data: FlashcardCreate, owner_id: Optional[int] = None) -> Flashcard:
-        """Create a new flashcard"""
+    def get_flashcards_by_ids(self, flashcard_ids: Sequence[int]) -> Tuple[List[Flashcard], List[int]]:
+        """Get flashcards in the order of flashcard_ids with one query, plus the ids that do not exist"""
+        return fetch_by_ids(self.db, Flashcard, flashcard_ids, options=[joinedload(Flashcard.category)])
+    
+    def create_flashcard(self, flashcard_data: FlashcardCreate, owner_id: Optional[int] = None,
+                         allow_duplicates: bool = False) -> Flashcard:
+        """
+        Create a new flashcard.
+        
+        Raises DuplicateFlashcardError if the card nearly matches an existing
+        one, unless duplicates are allowed or detection is disabled, and
+        SourceCardNotFoundError if its source YouTube card is gone. The
+        category, source count and card are written in one transaction.
+        """
+        dedupe = DedupeService(self.db) if settings.dedupe_enabled else None
+        signature = None
+        if dedupe:
+            signature = dedupe.signature_for(flashcard_data.question, flashcard_data.answer)
+            if not allow_duplicates:
+                duplicates = dedupe.find_duplicates(signature)
+                if duplicates:
+                    raise DuplicateFlashcardError(*duplicates[0])
+        
         # Get or create category if provided
         category_id = None
         if flashcard_data.category:
             category = self.get_or_create_category(flashcard_data.category)
             category_id = category.id
         
+        # Counted in the same transaction as the insert, so the count cannot drift
+        if flashcard_data.source_youtube_card_id is not None:
+            if not self._adjust_source_count(flashcard_data.source_youtube_card_id, 1):
+                self.db.rollback()
+                raise SourceCardNotFoundError(flashcard_data.source_youtube_card_id)
+        
         # Create flashcard
         db_flashcard = Flashcard(
             question=flashcard_data.question,
@@ -35,15 +87,52 @@ class FlashcardService:
             difficulty=flashcard_data.difficulty or "medium",
             tags=flashcard_data.tags or [],
             owner_id=owner_id,
-            category_id=category_id
+            category_id=category_id,
+            source_youtube_card_id=flashcard_data.source_youtube_card_id
         )
         
         self.db.add(db_flashcard)
+        if dedupe:
+            self.db.flush()
+            dedupe.store_signature(db_flashcard.id, signature)
         self.db.commit()
         self.db.refresh(db_flashcard)
         
+        if dedupe:
+            dedupe.index.add(db_flashcard.id, signature)
+        if distractor_index.loaded:
+            distractor_index.add(db_flashcard.id, db_flashcard.answer, db_flashcard.category_id)
+        
         return db_flashcard
     
+    def create_generated_flashcard(self, card: Dict[str, Any], owner_id: Optional[int] = None,
+                                   category: Optional[str] = None,
+                                   source_youtube_card_id: Optional[int] = None) -> Optional[Flashcard]:
+        """
+        Create a flashcard from AI-generated output, skipping invalid cards,
+        near-duplicates, and cards whose source YouTube card was deleted
+        while they were being generated.
+        """
+        difficulty = card.get("difficulty")
+        tags = card.get("tags")
+        
+        try:
+            flashcard_data = FlashcardCreate(
+                question=str(card.get("question") or "").strip(),
+                answer=str(card.get("answer") or "").strip(),
+                category=category or card.get("category"),
+                difficulty=difficulty if difficulty in ("easy", "medium", "hard") else None,
+                tags=tags if isinstance(tags, list) else [],
+                source_youtube_card_id=source_youtube_card_id
+            )
+        except ValidationError:
+            return None
+        
+        try:
+            return self.create_flashcard(flashcard_data, owner_id)
+        except (DuplicateFlashcardError, SourceCardNotFoundError):
+            return None
+    
     def update_flashcard(self, flashcard_id: int, update_data: FlashcardUpdate) -> Optional[Flashcard]:
         """Update an existing flashcard"""
         db_flashcard = self.get_flashcard_by_id(flashcard_id)
@@ -66,9 +155,21 @@ class FlashcardService:
         for field, value in update_dict.items():
             setattr(db_flashcard, field, value)
         
+        # Keep the near-duplicate index in step with the new text
+        signature = None
+        if settings.dedupe_enabled and ("question" in update_dict or "answer" in update_dict):
+            dedupe = DedupeService(self.db)
+            signature = dedupe.signature_for(db_flashcard.question, db_flashcard.answer)
+            dedupe.store_signature(db_flashcard.id, signature)
+        
         self.db.commit()
         self.db.refresh(db_flashcard)
         
+        if signature:
+            dedupe.index.add(db_flashcard.id, signature)
+        if distractor_index.loaded:
+            distractor_index.add(db_flashcard.id, db_flashcard.answer, db_flashcard.category_id)
+        
         return db_flashcard
     
     def delete_flashcard(self, flashcard_id: int) -> bool:
@@ -77,16 +178,44 @@ class FlashcardService:
         if not db_flashcard:
             return False
         
+        dedupe = DedupeService(self.db)
+        dedupe.delete_signature(flashcard_id)
+        self._adjust_source_count(db_flashcard.source_youtube_card_id, -1)
         self.db.delete(db_flashcard)
         self.db.commit()
+        dedupe.index.remove(flashcard_id)
+        distractor_index.remove(flashcard_id)
         
         return True
     
+    def _adjust_source_count(self, youtube_card_id: Optional[int], delta: int) -> bool:
+        """Move a YouTube card's flashcard_count in the current transaction; False if the card is gone"""
+        if youtube_card_id is None:
+            return False
+        result = self.db.execute(
+            update(YouTubeCard)
+            .where(YouTubeCard.id == youtube_card_id)
+            .values(flashcard_count=YouTubeCard.flashcard_count + delta)
+        )
+        return result.rowcount > 0
+    
+    def get_flashcards_by_source(self, youtube_card_id: int, skip: int = 0, limit: int = 100) -> List[Flashcard]:
+        """Get flashcards generated from a YouTube card"""
+        return (
+            self._query()
+            .filter(Flashcard.source_youtube_card_id == youtube_card_id)
+            .order_by(Flashcard.id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
     def get_flashcards_by_category(self, category_name: str, skip: int = 0, limit: int = 100) -> List[Flashcard]:
         """Get flashcards by category name"""
         return (
             self.db.query(Flashcard)
             .join(Category)
+            .options(contains_eager(Flashcard.category))
             .filter(Category.name == category_name)
             .offset(skip)
             .limit(limit)
@@ -96,7 +225,7 @@ class FlashcardService:
     def get_flashcards_by_difficulty(self, difficulty: str, skip: int = 0, limit: int = 100) -> List[Flashcard]:
         """Get flashcards by difficulty"""
         return (
-            self.db.query(Flashcard)
+            self._query()
             .filter(Flashcard.difficulty == difficulty)
             .offset(skip)
             .limit(limit)
@@ -106,7 +235,7 @@ class FlashcardService:
     def get_flashcards_by_owner(self, owner_id: int, skip: int = 0, limit: int = 100) -> List[Flashcard]:
         """Get flashcards by owner"""
         return (
-            self.db.query(Flashcard)
+            self._query()
             .filter(Flashcard.owner_id == owner_id)
             .offset(skip)
             .limit(limit)
@@ -121,21 +250,46 @@ class FlashcardService:
         )
         
         return (
-            self.db.query(Flashcard)
+            self._query()
             .filter(search_filter)
             .offset(skip)
             .limit(limit)
             .all()
         )
     
+    def get_flashcard_fields(self, fields: List[str], skip: int = 0, limit: int = 100,
+                             search: Optional[str] = None, category: Optional[str] = None,
+                             difficulty: Optional[str] = None,
+                             ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        List flashcards selecting only the requested columns.
+        
+        Filters apply with the same precedence as the list endpoint; ids
+        replaces them and the pagination. The categories table is only
+        joined when the category name is selected or filtered on.
+        """
+        query = self.db.query(Flashcard)
+        if "category" in fields or (category and not search and ids is None):
+            query = query.outerjoin(Category, Flashcard.category_id == Category.id)
+        
+        if ids is not None:
+            return project_rows(query.filter(Flashcard.id.in_(ids)), FLASHCARD_FIELDS, fields)
+        if search:
+            query = query.filter(or_(Flashcard.question.contains(search), Flashcard.answer.contains(search)))
+        elif category:
+            query = query.filter(Category.name == category)
+        elif difficulty:
+            query = query.filter(Flashcard.difficulty == difficulty)
+        
+        return project_rows(query.offset(skip).limit(limit), FLASHCARD_FIELDS, fields)
+    
     def get_or_create_category(self, category_name: str) -> Category:
-        """Get existing category or create a new one"""
+        """Get existing category or create a new one; a new one is flushed and committed by the caller"""
         category = self.db.query(Category).filter(Category.name == category_name).first()
         if not category:
             category = Category(name=category_name)
             self.db.add(category)
-            self.db.commit()
-            self.db.refresh(category)
+            self.db.flush()
         
         return category
     
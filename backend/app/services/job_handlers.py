@@ -0,0 +1,127 @@
+"""Handlers for long-running background jobs (AI generation, YouTube extraction)"""
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from backend.app.core.database import SessionLocal
+from backend.app.services.ai_service import AIService
+from backend.app.services.flashcard_service import FlashcardService
+from backend.app.services.job_service import JobContext, JobService, job_handler
+from backend.app.services.transcript_fetchers import get_transcript_fetcher
+from backend.app.services.watch_history_service import WatchHistoryService
+from backend.app.services.youtube_service import YouTubeService
+
+logger = logging.getLogger(__name__)
+
+@job_handler("flashcards.generate")
+def generate_flashcards(context: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate flashcards from text with OpenAI and save them.
+
+    The text is either in the payload or, for YouTube cards, read from
+    source_youtube_card_id when the job runs (only start_ms..end_ms when
+    a window is given), so transcripts are not copied into the jobs table.
+    """
+    text = payload.get("text")
+    if text is None:
+        text = _source_text(payload)
+        if not text:
+            # The card was deleted, or lost its transcript, after the job was queued
+            return {"flashcard_ids": [], "count": 0}
+    
+    context.report_progress(0.1, "Generating flashcards")
+    cards = AIService().generate_flashcards_from_text(text, payload.get("max_cards", 5))
+    
+    context.report_progress(0.8, f"Saving {len(cards)} flashcards")
+    db = SessionLocal()
+    try:
+        service = FlashcardService(db)
+        flashcard_ids = []
+        for card in cards:
+            flashcard = service.create_generated_flashcard(card, payload.get("owner_id"), payload.get("category"),
+                                                           payload.get("source_youtube_card_id"))
+            if flashcard:
+                flashcard_ids.append(flashcard.id)
+    finally:
+        db.close()
+    
+    return {"flashcard_ids": flashcard_ids, "count": len(flashcard_ids)}
+
+def _source_text(payload: Dict[str, Any]) -> Optional[str]:
+    """Transcript text of the payload's source YouTube card, or None if the card is gone"""
+    card_id = payload["source_youtube_card_id"]
+    db = SessionLocal()
+    try:
+        service = YouTubeService(db)
+        card = service.get_youtube_card_by_id(card_id)
+        if not card:
+            return None
+        if "start_ms" in payload or "end_ms" in payload:
+            return service.get_window_text(card_id, payload.get("start_ms"), payload.get("end_ms"))
+        return card.transcript
+    finally:
+        db.close()
+
+@job_handler("youtube.transcript")
+def extract_youtube_transcript(context: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch the transcript for a YouTube card and optionally queue flashcard generation"""
+    card_id = payload["card_id"]
+    
+    db = SessionLocal()
+    try:
+        service = YouTubeService(db)
+        card = service.get_youtube_card_by_id(card_id)
+        if not card:
+            raise ValueError(f"YouTube card {card_id} not found")
+        
+        video_id = card.video_id or service.extract_video_id(card.url)
+        if not video_id:
+            raise ValueError(f"Could not find a video ID in URL: {card.url}")
+        
+        context.report_progress(0.2, "Fetching transcript")
+        video = get_transcript_fetcher().fetch(video_id, payload.get("languages") or ("en",))
+        service.save_fetched_video(card, video)
+        transcript = video.transcript
+        
+        result: Dict[str, Any] = {"card_id": card_id, "video_id": video_id, "transcript_length": len(transcript),
+                                  "segments": len(video.segments)}
+        if payload.get("generate_flashcards") and transcript:
+            generation_job = JobService(db).enqueue_job("flashcards.generate", {
+                "max_cards": payload.get("max_flashcards", 10),
+                "owner_id": payload.get("owner_id"),
+                "source_youtube_card_id": card_id
+            })
+            result["generation_job_id"] = generation_job.id
+    finally:
+        db.close()
+    
+    return result
+
+@job_handler("youtube.watch_history")
+def import_watch_history(context: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Stream-import an uploaded watch-history export; the upload is removed once the job is done with it"""
+    path = payload["path"]
+    total = max(os.path.getsize(path), 1)
+    succeeded = False
+    
+    def progress(stats: Dict[str, int]) -> None:
+        # Characters approximate bytes closely enough for a progress bar
+        context.report_progress(min(stats["characters"] / total, 0.99),
+                                f"{stats['imported']} imported, {stats['existing']} already known")
+    
+    db = SessionLocal()
+    try:
+        with open(path, "rb") as f:
+            stats = WatchHistoryService(db).import_file(f, payload.get("batch_size"), progress)
+        succeeded = True
+    finally:
+        db.close()
+        # Imports are idempotent, so the file is kept for retries until the last attempt
+        if succeeded or context.attempt >= context.max_attempts:
+            try:
+                os.remove(path)
+            except OSError as e:
+                # Raising here would replace the import's own error
+                logger.warning("Could not remove watch-history upload %s: %s", path, e)
+    
+    return stats
@@ -0,0 +1,318 @@
+"""Durable background job queue backed by the SQLite jobs table"""
+import logging
+import os
+import threading
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.core.database import SessionLocal
+from backend.app.models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+def _utcnow() -> datetime:
+    """Naive UTC timestamp, matching how SQLite stores DateTime columns"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class JobService:
+    """Service class for job queue operations using SQLAlchemy"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue_job(self, kind: str, payload: Optional[Dict[str, Any]] = None, max_attempts: Optional[int] = None) -> Job:
+        """Add a new job to the queue"""
+        if kind not in _handlers:
+            _load_handlers()
+        if kind not in _handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        job = Job(
+            kind=kind,
+            status=JOB_QUEUED,
+            payload=payload or {},
+            progress=0.0,
+            attempts=0,
+            max_attempts=max_attempts or settings.job_max_attempts
+        )
+
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+
+        job_pool.notify()
+        return job
+
+    def get_job_by_id(self, job_id: int) -> Optional[Job]:
+        """Get a specific job by ID"""
+        return self.db.query(Job).filter(Job.id == job_id).first()
+
+    def get_jobs(self, status: Optional[str] = None, skip: int = 0, limit: int = 100) -> List[Job]:
+        """Get jobs, newest first, optionally filtered by status"""
+        query = self.db.query(Job)
+        if status:
+            query = query.filter(Job.status == status)
+        return query.order_by(Job.created_at.desc(), Job.id.desc()).offset(skip).limit(limit).all()
+
+    def claim_next_job(self, worker_id: str, lease_seconds: int) -> Optional[Job]:
+        """
+        Atomically claim the oldest runnable job for a worker.
+
+        A job is runnable when it is queued and its retry backoff has passed,
+        or when it is running but its lease has expired (the worker that
+        owned it died or the process was restarted). The claim is a single
+        UPDATE ... RETURNING so two workers can never own the same job.
+        """
+        now = _utcnow()
+        runnable = or_(
+            and_(Job.status == JOB_QUEUED, or_(Job.run_after.is_(None), Job.run_after <= now)),
+            and_(Job.status == JOB_RUNNING, Job.lease_expires_at < now)
+        )
+        candidate = (
+            select(Job.id)
+            .where(runnable)
+            .order_by(Job.created_at, Job.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Job)
+            .where(Job.id == candidate)
+            .where(runnable)
+            .values(
+                status=JOB_RUNNING,
+                worker_id=worker_id,
+                attempts=Job.attempts + 1,
+                lease_expires_at=now + timedelta(seconds=lease_seconds),
+                run_after=None,
+                started_at=now,
+                error=None
+            )
+            .returning(Job.id)
+        )
+
+        job_id = self.db.execute(stmt).scalar()
+        self.db.commit()
+        if job_id is None:
+            return None
+
+        job = self.get_job_by_id(job_id)
+        if job.attempts > job.max_attempts:
+            # Lease expired on the final attempt, e.g. the job keeps crashing the process
+            self._finish(job, JOB_FAILED, error="Job lease expired after the maximum number of attempts")
+            return None
+
+        return job
+
+    def update_progress(self, job_id: int, worker_id: str, progress: float, message: Optional[str] = None,
+                        lease_seconds: Optional[int] = None) -> bool:
+        """Record job progress and extend the worker's lease"""
+        values: Dict[str, Any] = {"progress": max(0.0, min(1.0, progress))}
+        if message is not None:
+            values["progress_message"] = message[:255]
+        if lease_seconds:
+            values["lease_expires_at"] = _utcnow() + timedelta(seconds=lease_seconds)
+
+        result = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == worker_id, Job.status == JOB_RUNNING)
+            .values(**values)
+        )
+        self.db.commit()
+
+        return result.rowcount > 0
+
+    def complete_job(self, job_id: int, worker_id: str, result: Any = None) -> Optional[Job]:
+        """Mark a job as succeeded and store its result; None if the worker no longer holds its lease"""
+        return self._update_leased(job_id, worker_id, status=JOB_SUCCEEDED, progress=1.0, result=result, error=None,
+                                   lease_expires_at=None, finished_at=_utcnow())
+
+    def fail_job(self, job_id: int, worker_id: str, error: str) -> Optional[Job]:
+        """
+        Record a failed attempt; None if the worker no longer holds its lease.
+
+        While attempts remain the job is requeued to run after a backoff of
+        job_retry_backoff seconds, doubled for each attempt already made.
+        """
+        job = self.get_job_by_id(job_id)
+        if not job:
+            return None
+
+        if job.attempts < job.max_attempts:
+            backoff = min(settings.job_retry_backoff * 2 ** max(job.attempts - 1, 0), settings.job_retry_backoff_max)
+            return self._update_leased(job_id, worker_id, status=JOB_QUEUED, error=error, worker_id=None,
+                                       lease_expires_at=None, run_after=_utcnow() + timedelta(seconds=backoff))
+
+        return self._update_leased(job_id, worker_id, status=JOB_FAILED, error=error, lease_expires_at=None,
+                                   finished_at=_utcnow())
+
+    def _update_leased(self, job_id: int, leased_to: str, **values: Any) -> Optional[Job]:
+        """Update a running job only if the worker leased_to still holds its lease"""
+        result = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.worker_id == leased_to, Job.status == JOB_RUNNING)
+            .values(**values)
+        )
+        self.db.commit()
+        if not result.rowcount:
+            # The lease expired and another worker claimed the job; its outcome wins
+            logger.warning("Job %s is no longer leased to worker %s; discarding its outcome", job_id, leased_to)
+            return None
+        return self.get_job_by_id(job_id)
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None) -> Job:
+        """Move a job into a terminal state"""
+        job.status = status
+        job.result = result
+        job.error = error
+        job.lease_expires_at = None
+        job.finished_at = _utcnow()
+
+        self.db.commit()
+        self.db.refresh(job)
+
+        return job
+
+class JobContext:
+    """Handle passed to job handlers for reporting progress"""
+
+    def __init__(self, job_id: int, worker_id: str, attempt: int, max_attempts: int, lease_seconds: int):
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.attempt = attempt
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+
+    def report_progress(self, progress: float, message: Optional[str] = None) -> None:
+        """Update job progress; also acts as a heartbeat that renews the lease"""
+        db = SessionLocal()
+        try:
+            JobService(db).update_progress(self.job_id, self.worker_id, progress, message, self.lease_seconds)
+        finally:
+            db.close()
+
+JobHandler = Callable[[JobContext, Dict[str, Any]], Any]
+
+_handlers: Dict[str, JobHandler] = {}
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register a function as the handler for a job kind"""
+    def decorator(func: JobHandler) -> JobHandler:
+        _handlers[kind] = func
+        return func
+    return decorator
+
+def _load_handlers() -> None:
+    """Import the modules that register job handlers"""
+    from backend.app.services import job_handlers  # noqa: F401
+
+class JobWorkerPool:
+    """In-process pool of worker threads that execute jobs from the jobs table"""
+
+    def __init__(self, num_workers: int, poll_interval: float, lease_seconds: int):
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Condition()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        if self.running or self.num_workers <= 0:
+            return
+
+        _load_handlers()
+        self._stop.clear()
+        prefix = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._threads = [
+            threading.Thread(target=self._worker_loop, args=(f"{prefix}-{index}",), name=f"job-worker-{index}", daemon=True)
+            for index in range(self.num_workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Signal workers to stop after their current job and wait for them"""
+        self._stop.set()
+        self.notify(all_workers=True)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self, all_workers: bool = False) -> None:
+        """Wake idle workers so newly queued jobs start without waiting for the next poll"""
+        with self._wake:
+            if all_workers:
+                self._wake.notify_all()
+            else:
+                self._wake.notify()
+
+    def _worker_loop(self, worker_id: str) -> None:
+        while not self._stop.is_set():
+            try:
+                ran_job = self._run_next(worker_id)
+            except Exception:
+                logger.exception("Job worker %s failed to poll the queue", worker_id)
+                ran_job = False
+
+            if not ran_job:
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+
+    def _run_next(self, worker_id: str) -> bool:
+        db = SessionLocal()
+        try:
+            job = JobService(db).claim_next_job(worker_id, self.lease_seconds)
+            if not job:
+                return False
+            job_id, kind, payload, attempt = job.id, job.kind, dict(job.payload or {}), job.attempts
+            max_attempts = job.max_attempts
+        finally:
+            db.close()
+
+        context = JobContext(job_id, worker_id, attempt, max_attempts, self.lease_seconds)
+        handler = _handlers.get(kind)
+
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind: {kind}")
+            result = handler(context, payload)
+        except Exception as e:
+            logger.warning("Job %s (%s) attempt %s failed: %s", job_id, kind, attempt, e)
+            error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            self._record(lambda service: service.fail_job(job_id, worker_id, error))
+        else:
+            self._record(lambda service: service.complete_job(job_id, worker_id, result))
+
+        return True
+
+    @staticmethod
+    def _record(action: Callable[[JobService], Any]) -> None:
+        db = SessionLocal()
+        try:
+            action(JobService(db))
+        finally:
+            db.close()
+
+# Global worker pool, started and stopped with the application
+job_pool = JobWorkerPool(
+    num_workers=settings.job_workers,
+    poll_interval=settings.job_poll_interval,
+    lease_seconds=settings.job_lease_seconds
+)
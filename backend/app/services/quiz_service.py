@@ -1,11 +1,13 @@
 """Quiz service for business logic using SQLAlchemy ORM"""
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, insert, or_, select
 from datetime import datetime
 
+from backend.app.core.batch import fetch_by_ids
 from backend.app.models import Quiz, QuizQuestion, QuizAttempt, QuizAnswer, Flashcard, User
 from backend.app.schemas.quiz import QuizCreate, QuizAttemptCreate, QuizAnswerCreate
+from backend.app.services.distractor_service import DistractorService
 
 class QuizService:
     """Service class for quiz operations using SQLAlchemy"""
@@ -15,40 +17,57 @@ class QuizService:
     
     def create_quiz(self, quiz_data: QuizCreate) -> Quiz:
         """Create a new quiz from flashcards"""
+        # Load all requested flashcards in one query, keeping the requested order
+        flashcard_ids = quiz_data.flashcard_ids or []
+        flashcards = {}
+        if flashcard_ids:
+            flashcards = {
+                flashcard.id: flashcard
+                for flashcard in self.db.query(Flashcard).filter(Flashcard.id.in_(flashcard_ids)).all()
+            }
+        selected = [flashcards[flashcard_id] for flashcard_id in dict.fromkeys(flashcard_ids) if flashcard_id in flashcards]
+        
         # Create quiz
         db_quiz = Quiz(
             title=quiz_data.title,
             description=quiz_data.description,
-            total_questions=len(quiz_data.flashcard_ids) if quiz_data.flashcard_ids else 0
+            total_questions=len(selected)
         )
         
         self.db.add(db_quiz)
+        self.db.flush()
+        
+        # Add questions from flashcards, with distractors from the in-memory index,
+        # in one executemany rather than one INSERT ... RETURNING per question
+        distractors = DistractorService(self.db)
+        rows = []
+        for order, flashcard in enumerate(selected, 1):
+            options = distractors.get_options(flashcard.id, flashcard.answer)
+            rows.append({
+                "quiz_id": db_quiz.id,
+                "flashcard_id": flashcard.id,
+                "question_order": order,
+                "question_text": flashcard.question,
+                "correct_answer": flashcard.answer,
+                "options": options if len(options) > 1 else [],
+                "question_type": "multiple_choice" if len(options) > 1 else "open_text"
+            })
+        if rows:
+            self.db.execute(insert(QuizQuestion), rows)
+        
         self.db.commit()
         self.db.refresh(db_quiz)
         
-        # Add questions from flashcards
-        if quiz_data.flashcard_ids:
-            for order, flashcard_id in enumerate(quiz_data.flashcard_ids, 1):
-                flashcard = self.db.query(Flashcard).filter(Flashcard.id == flashcard_id).first()
-                if flashcard:
-                    quiz_question = QuizQuestion(
-                        quiz_id=db_quiz.id,
-                        flashcard_id=flashcard_id,
-                        question_order=order,
-                        question_text=flashcard.question,
-                        correct_answer=flashcard.answer,
-                        question_type="open_text"
-                    )
-                    self.db.add(quiz_question)
-            
-            self.db.commit()
-        
         return db_quiz
     
     def get_quiz_by_id(self, quiz_id: int) -> Optional[Quiz]:
         """Get a quiz by ID with questions"""
         return self.db.query(Quiz).filter(Quiz.id == quiz_id).first()
     
+    def get_quizzes_by_ids(self, quiz_ids: Sequence[int]) -> Tuple[List[Quiz], List[int]]:
+        """Get quizzes in the order of quiz_ids, plus the ids that do not exist"""
+        return fetch_by_ids(self.db, Quiz, quiz_ids)
+    
     def get_all_quizzes(self, skip: int = 0, limit: int = 100) -> List[Quiz]:
         """Get all quizzes with pagination"""
         return self.db.query(Quiz).offset(skip).limit(limit).all()
@@ -178,6 +197,15 @@ class QuizService:
         if not quiz:
             return False
         
+        # Delete dependent rows in bulk; cascading through the relationships
+        # would load every question's answers one question at a time
+        attempt_ids = select(QuizAttempt.id).where(QuizAttempt.quiz_id == quiz_id)
+        question_ids = select(QuizQuestion.id).where(QuizQuestion.quiz_id == quiz_id)
+        self.db.query(QuizAnswer).filter(
+            or_(QuizAnswer.attempt_id.in_(attempt_ids), QuizAnswer.question_id.in_(question_ids))
+        ).delete(synchronize_session=False)
+        self.db.query(QuizAttempt).filter(QuizAttempt.quiz_id == quiz_id).delete(synchronize_session=False)
+        self.db.query(QuizQuestion).filter(QuizQuestion.quiz_id == quiz_id).delete(synchronize_session=False)
         self.db.delete(quiz)
         self.db.commit()
         
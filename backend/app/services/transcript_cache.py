@@ -0,0 +1,171 @@
+"""Size-capped on-disk store of fetched transcripts, keyed by video ID and language"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from backend.app.core.compression import compress_text, decompress_text
+from backend.app.core.config import settings
+from backend.app.core.metrics import registry
+
+cache_requests = registry.counter("transcript_cache_requests_total", "Transcript cache lookups by result", ("result",))
+cache_evictions = registry.counter("transcript_cache_evictions_total", "Transcript cache entries evicted by the size cap")
+cache_bytes = registry.gauge("transcript_cache_bytes", "Compressed size of the transcript cache on disk")
+
+ENTRY_SUFFIX = ".transcript"
+
+class TranscriptCache:
+    """
+    Compressed transcript entries, one file per (video ID, languages) key.
+
+    File modification times double as the LRU clock: hits touch the file
+    and eviction removes the oldest files once the directory outgrows
+    max_bytes. Videos without a transcript are stored as negative entries
+    that expire after negative_ttl seconds, since captions can be added
+    later. Safe to share between threads; several processes may share the
+    directory, in which case the size cap is enforced approximately.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, negative_ttl: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(video_id: str, languages: Sequence[str]) -> str:
+        return f"{video_id}:{','.join(languages)}"
+
+    def _path(self, video_id: str, languages: Sequence[str]) -> str:
+        # Languages come from requests, so file names are hashed rather than built from them
+        digest = hashlib.sha256(self.key(video_id, languages).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ENTRY_SUFFIX)
+
+    def get(self, video_id: str, languages: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        The cached entry, or None on a miss.
+
+        Negative entries come back as {"missing": True, "error": ...}.
+        """
+        path = self._path(video_id, languages)
+        try:
+            with open(path, "rb") as f:
+                entry = json.loads(decompress_text(f.read()))
+        except (OSError, ValueError):
+            # Absent, or a truncated write from a crashed process
+            return self._miss()
+
+        if entry.get("missing"):
+            if time.time() - entry.get("cached_at", 0) > self.negative_ttl:
+                self._remove(path)
+                return self._miss()
+            with self._lock:
+                self.negative_hits += 1
+            cache_requests.inc(result="negative_hit")
+            return entry
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        cache_requests.inc(result="hit")
+        return entry
+
+    def put(self, video_id: str, languages: Sequence[str], entry: Dict[str, Any]) -> None:
+        """Store a fetched transcript entry"""
+        self._write(self._path(video_id, languages), dict(entry, cached_at=time.time()))
+
+    def put_missing(self, video_id: str, languages: Sequence[str], error: str) -> None:
+        """Remember that a video has no transcript in these languages"""
+        self._write(self._path(video_id, languages), {"missing": True, "error": error, "cached_at": time.time()})
+
+    def clear(self) -> int:
+        """Remove every entry; returns the number removed"""
+        with self._lock:
+            entries = self._scan()
+            for _, _, path in entries:
+                self._remove(path)
+            self._size = 0
+        cache_bytes.set(0)
+        return len(entries)
+
+    def size(self) -> int:
+        """Compressed bytes on disk"""
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            return self._size
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+        cache_requests.inc(result="miss")
+        return None
+
+    def _write(self, path: str, entry: Dict[str, Any]) -> None:
+        data = compress_text(json.dumps(entry))
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so readers never see a partial entry
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temp_path, path)
+
+        size = self.size()
+        with self._lock:
+            self._size = size + len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+            cache_bytes.set(self._size)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits; caller holds the lock"""
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            cache_evictions.inc()
+        self._size = total
+
+    def _scan(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every entry"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for item in scan:
+                    if item.name.endswith(ENTRY_SUFFIX):
+                        try:
+                            stat = item.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, item.path))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+# Shared by every fetcher in the process, so the hit counters and size cap are process-wide
+transcript_cache = TranscriptCache(
+    settings.transcript_cache_dir,
+    settings.transcript_cache_max_bytes,
+    settings.transcript_cache_negative_ttl
+)
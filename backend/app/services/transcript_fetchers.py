@@ -0,0 +1,168 @@
+"""Pluggable transcript sources: YouTube itself, or a local fixture directory, optionally behind a disk cache"""
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from backend.app.core.config import settings
+from backend.app.services.transcript_cache import TranscriptCache, transcript_cache
+
+class TranscriptNotFoundError(LookupError):
+    """Raised when a fetcher has no transcript for a video"""
+
+class FetchedVideo:
+    """Transcript and whatever metadata the source provides for one video"""
+
+    def __init__(self, video_id: str, transcript: str, segments: Optional[List[Dict]] = None,
+                 title: Optional[str] = None, channel: Optional[str] = None,
+                 description: Optional[str] = None, duration: Optional[int] = None):
+        self.video_id = video_id
+        self.transcript = transcript
+        self.segments = segments or []
+        self.title = title
+        self.channel = channel
+        self.description = description
+        self.duration = duration
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "transcript": self.transcript,
+            "segments": self.segments,
+            "title": self.title,
+            "channel": self.channel,
+            "description": self.description,
+            "duration": self.duration,
+        }
+
+    @classmethod
+    def from_dict(cls, video_id: str, data: Dict[str, Any]) -> "FetchedVideo":
+        return cls(video_id, data["transcript"], segments=data.get("segments"), title=data.get("title"),
+                   channel=data.get("channel"), description=data.get("description"), duration=data.get("duration"))
+
+def _join_segments(segments: List[Dict]) -> str:
+    return " ".join(segment["text"].strip() for segment in segments if segment.get("text", "").strip())
+
+def _duration(segments: List[Dict]) -> Optional[int]:
+    if not segments:
+        return None
+    last = segments[-1]
+    return int(last.get("start", 0) + last.get("duration", 0))
+
+class TranscriptFetcher:
+    """Base class for transcript sources; fetch() must be safe to call from several threads"""
+    name = "base"
+
+    def fetch(self, video_id: str, languages: Sequence[str] = ("en",)) -> FetchedVideo:
+        raise NotImplementedError
+
+class YouTubeTranscriptFetcher(TranscriptFetcher):
+    """Fetch captions from YouTube with youtube-transcript-api"""
+    name = "youtube"
+
+    def fetch(self, video_id: str, languages: Sequence[str] = ("en",)) -> FetchedVideo:
+        from youtube_transcript_api import (
+            NoTranscriptFound, TranscriptsDisabled, VideoUnavailable, YouTubeTranscriptApi
+        )
+
+        try:
+            if hasattr(YouTubeTranscriptApi, "get_transcript"):
+                segments = YouTubeTranscriptApi.get_transcript(video_id, languages=list(languages))
+            else:
+                segments = YouTubeTranscriptApi().fetch(video_id, languages=list(languages)).to_raw_data()
+        except (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable) as e:
+            # Answers about the video itself; network and blocking errors are left to propagate
+            raise TranscriptNotFoundError(f"No transcript for video {video_id}: {type(e).__name__}") from e
+
+        return FetchedVideo(video_id, _join_segments(segments), segments=segments, duration=_duration(segments))
+
+class FixtureTranscriptFetcher(TranscriptFetcher):
+    """
+    Read transcripts from a directory instead of YouTube.
+
+    ``<video_id>.json`` may hold ``title``, ``channel``, ``description``,
+    ``duration`` and either ``transcript`` text or ``segments`` in the
+    youtube-transcript-api format; ``<video_id>.txt`` is plain transcript
+    text. ``latency`` adds a per-fetch delay to mimic network round trips.
+    """
+    name = "fixtures"
+
+    def __init__(self, directory: str, latency: float = 0.0):
+        self.directory = directory
+        self.latency = latency
+
+    def fetch(self, video_id: str, languages: Sequence[str] = ("en",)) -> FetchedVideo:
+        if self.latency:
+            time.sleep(self.latency)
+
+        json_path = os.path.join(self.directory, f"{video_id}.json")
+        if os.path.exists(json_path):
+            with open(json_path, "r") as f:
+                data = json.load(f)
+            segments = data.get("segments") or []
+            return FetchedVideo(
+                video_id,
+                data.get("transcript") or _join_segments(segments),
+                segments=segments,
+                title=data.get("title"),
+                channel=data.get("channel"),
+                description=data.get("description"),
+                duration=data.get("duration") or _duration(segments)
+            )
+
+        text_path = os.path.join(self.directory, f"{video_id}.txt")
+        if os.path.exists(text_path):
+            with open(text_path, "r") as f:
+                return FetchedVideo(video_id, f.read().strip())
+
+        raise TranscriptNotFoundError(f"No fixture transcript for video {video_id}")
+
+class CachingTranscriptFetcher(TranscriptFetcher):
+    """
+    Serve transcripts from a TranscriptCache, calling the wrapped fetcher
+    only on a miss. "No transcript" answers are cached too; other errors
+    are not, so transient failures are retried on the next fetch. With
+    refresh set, every fetch goes to the wrapped fetcher and overwrites the
+    cached entry, negative or not.
+    """
+
+    def __init__(self, fetcher: TranscriptFetcher, cache: TranscriptCache, refresh: bool = False):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.refresh = refresh
+        self.name = fetcher.name
+
+    def fetch(self, video_id: str, languages: Sequence[str] = ("en",)) -> FetchedVideo:
+        entry = None if self.refresh else self.cache.get(video_id, languages)
+        if entry is not None:
+            if entry.get("missing"):
+                raise TranscriptNotFoundError(entry.get("error") or f"No transcript for video {video_id}")
+            return FetchedVideo.from_dict(video_id, entry)
+
+        try:
+            video = self.fetcher.fetch(video_id, languages)
+        except TranscriptNotFoundError as e:
+            self.cache.put_missing(video_id, languages, str(e))
+            raise
+        self.cache.put(video_id, languages, video.to_dict())
+        return video
+
+# Fetcher factories by name, selected with the transcript_fetcher setting
+TRANSCRIPT_FETCHERS: Dict[str, Callable[[], TranscriptFetcher]] = {
+    "youtube": YouTubeTranscriptFetcher,
+    "fixtures": lambda: FixtureTranscriptFetcher(settings.transcript_fixture_dir, settings.transcript_fixture_latency),
+}
+
+def get_transcript_fetcher(name: Optional[str] = None, cached: Optional[bool] = None,
+                           refresh: bool = False) -> TranscriptFetcher:
+    """
+    Build the configured transcript fetcher, behind the shared disk cache
+    unless it is disabled. refresh bypasses cached entries but still
+    updates them.
+    """
+    name = name or settings.transcript_fetcher
+    if name not in TRANSCRIPT_FETCHERS:
+        raise ValueError(f"Unknown transcript fetcher: {name}")
+    fetcher = TRANSCRIPT_FETCHERS[name]()
+    if settings.transcript_cache_enabled if cached is None else cached:
+        fetcher = CachingTranscriptFetcher(fetcher, transcript_cache, refresh=refresh)
+    return fetcher
@@ -0,0 +1,114 @@
+"""Streaming import of Google Takeout YouTube watch-history exports"""
+import codecs
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.core.json_stream import JSONArrayItemParser
+from backend.app.core.youtube_urls import canonical_url, extract_video_id
+from backend.app.models import YouTubeCard
+
+ProgressCallback = Callable[[Dict[str, int]], None]
+
+def iter_text_chunks(stream: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Read a binary file in chunks and decode it as UTF-8 without splitting characters"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            break
+        yield decoder.decode(data)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+def parse_watch_entry(entry: Any) -> Optional[Dict[str, Any]]:
+    """
+    Card fields for one watch-history entry, or None for entries without a
+    video (ads, removed videos, searches).
+    """
+    if not isinstance(entry, dict):
+        return None
+    video_id = extract_video_id(entry.get("titleUrl") or "")
+    if not video_id:
+        return None
+
+    title = entry.get("title") or ""
+    if title.startswith("Watched "):
+        title = title[len("Watched "):]
+    subtitles = entry.get("subtitles") or []
+    channel = subtitles[0].get("name") if subtitles and isinstance(subtitles[0], dict) else None
+
+    return {
+        "video_id": video_id,
+        "url": canonical_url(video_id),
+        "title": (title or f"YouTube video {video_id}")[:200],
+        "channel": channel[:100] if channel else None,
+    }
+
+class WatchHistoryService:
+    """Service class for importing watch history into YouTube cards"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def import_chunks(self, chunks: Iterable[str], batch_size: Optional[int] = None,
+                      progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """
+        Import a watch-history JSON document fed as text chunks.
+
+        Entries are parsed one at a time and collected into batches of
+        unique video IDs; each batch is checked against the indexed video_id
+        column and its new cards are inserted in one transaction. Memory
+        holds one chunk and one batch, whatever the size of the export.
+        """
+        batch_size = batch_size or settings.watch_history_batch_size
+        stats = {"entries": 0, "videos": 0, "imported": 0, "existing": 0, "skipped": 0, "characters": 0}
+        parser = JSONArrayItemParser()
+        batch: Dict[str, Dict[str, Any]] = {}
+
+        for chunk in chunks:
+            stats["characters"] += len(chunk)
+            for entry in parser.feed(chunk):
+                stats["entries"] += 1
+                card = parse_watch_entry(entry)
+                if card is None:
+                    stats["skipped"] += 1
+                    continue
+                stats["videos"] += 1
+                if card["video_id"] in batch:
+                    stats["existing"] += 1
+                    continue
+                batch[card["video_id"]] = card
+                if len(batch) >= batch_size:
+                    self._insert_batch(batch, stats)
+                    batch = {}
+                    if progress:
+                        progress(dict(stats))
+
+        if batch:
+            self._insert_batch(batch, stats)
+        if progress:
+            progress(dict(stats))
+
+        return stats
+
+    def import_file(self, stream: BinaryIO, batch_size: Optional[int] = None,
+                    progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """Import a watch-history export from a binary file object"""
+        return self.import_chunks(iter_text_chunks(stream), batch_size, progress)
+
+    def _insert_batch(self, batch: Dict[str, Dict[str, Any]], stats: Dict[str, int]) -> None:
+        existing = {
+            video_id for (video_id,) in
+            self.db.query(YouTubeCard.video_id).filter(YouTubeCard.video_id.in_(list(batch)))
+        }
+        rows: List[Dict[str, Any]] = [card for video_id, card in batch.items() if video_id not in existing]
+        if rows:
+            self.db.execute(insert(YouTubeCard), rows)
+        self.db.commit()
+
+        stats["imported"] += len(rows)
+        stats["existing"] += len(existing)
@@ -1,10 +1,37 @@
 """YouTube service for business logic using SQLAlchemy ORM"""
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import datetime
 
-from backend.app.models import YouTubeCard
+from backend.app.core.batch import fetch_by_ids
+from backend.app.core.config import settings
+from backend.app.core.projection import project_rows
+from backend.app.core import youtube_urls
+from backend.app.models import Flashcard, TranscriptSegment, YouTubeCard
 from backend.app.schemas.youtube import YouTubeCardCreate, YouTubeCardUpdate
+from backend.app.services.transcript_fetchers import FetchedVideo, TranscriptFetcher, get_transcript_fetcher
+
+# Columns list endpoints can return with fields=; transcripts are only served by the detail view
+YOUTUBE_CARD_FIELDS = {
+    name: getattr(YouTubeCard, name)
+    for name in ("id", "title", "url", "video_id", "description", "channel", "duration",
+                 "transcript_size", "flashcard_count", "extracted_at")
+}
+
+def segment_rows(card_id: int, segments: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert youtube-transcript-api segments (seconds) to transcript_segments rows (milliseconds)"""
+    rows = []
+    for segment in segments:
+        text = (segment.get("text") or "").strip()
+        if not text:
+            continue
+        start_ms = int(round(float(segment.get("start", 0)) * 1000))
+        end_ms = start_ms + int(round(float(segment.get("duration", 0)) * 1000))
+        rows.append({"card_id": card_id, "start_ms": start_ms, "end_ms": end_ms, "text": text})
+    return rows
 
 class YouTubeService:
     """Service class for YouTube operations using SQLAlchemy"""
@@ -16,25 +43,199 @@ class YouTubeService:
         """Get all YouTube cards with pagination"""
         return self.db.query(YouTubeCard).offset(skip).limit(limit).all()
     
+    def get_youtube_cards_by_ids(self, card_ids: Sequence[int]) -> Tuple[List[YouTubeCard], List[int]]:
+        """Get YouTube cards in the order of card_ids with one query, plus the ids that do not exist"""
+        return fetch_by_ids(self.db, YouTubeCard, card_ids)
+    
     def get_youtube_card_by_id(self, card_id: int) -> Optional[YouTubeCard]:
         """Get a specific YouTube card by ID"""
         return self.db.query(YouTubeCard).filter(YouTubeCard.id == card_id).first()
     
+    @staticmethod
+    def extract_video_id(url: str) -> Optional[str]:
+        """Extract the video ID from a YouTube watch, short or embed URL"""
+        return youtube_urls.extract_video_id(url)
+    
+    @staticmethod
+    def canonical_url(video_id: str) -> str:
+        """Standard watch URL for a video ID"""
+        return youtube_urls.canonical_url(video_id)
+    
+    def get_youtube_card_by_video_id(self, video_id: str) -> Optional[YouTubeCard]:
+        """Get a YouTube card by its canonical video ID"""
+        return self.db.query(YouTubeCard).filter(YouTubeCard.video_id == video_id).first()
+    
+    @staticmethod
+    def fetch_transcript(video_id: str, languages: Sequence[str] = ("en",)) -> str:
+        """Fetch a video transcript as plain text from the configured transcript fetcher"""
+        return get_transcript_fetcher().fetch(video_id, languages).transcript
+    
+    def ingest_urls(self, urls: Sequence[str], languages: Sequence[str] = ("en",),
+                    fetcher: Optional[TranscriptFetcher] = None,
+                    max_workers: Optional[int] = None, refresh: bool = False) -> List[Dict[str, Any]]:
+        """
+        Fetch transcripts for many videos concurrently and upsert their cards.
+        
+        URLs are reduced to video IDs first, so different links to the same
+        video are fetched once, and videos whose card already has a
+        transcript are not fetched again unless refresh is set (which also
+        bypasses the transcript cache). Transcripts are fetched in a thread
+        pool bounded by youtube_extract_workers; the database is only
+        touched afterwards, from this thread, and all cards are created or
+        updated in one transaction. Returns one result per input URL, in
+        input order.
+        """
+        fetcher = fetcher or get_transcript_fetcher(refresh=refresh)
+        results: List[Dict[str, Any]] = []
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        for url in urls:
+            video_id = self.extract_video_id(url)
+            result = {"url": url, "video_id": video_id, "status": "failed", "card_id": None,
+                      "transcript_length": 0, "error": None}
+            if video_id:
+                pending.setdefault(video_id, []).append(result)
+            else:
+                result["error"] = "Could not find a YouTube video ID in the URL"
+            results.append(result)
+        
+        if not refresh and pending:
+            for video_id, card_id, transcript_size in (
+                self.db.query(YouTubeCard.video_id, YouTubeCard.id, YouTubeCard.transcript_size)
+                .filter(YouTubeCard.video_id.in_(list(pending)), YouTubeCard.transcript_size > 0)
+            ):
+                for result in pending.pop(video_id):
+                    result.update(status="existing", card_id=card_id, transcript_length=transcript_size)
+        
+        if not pending:
+            return results
+        
+        def fetch(video_id: str):
+            try:
+                return video_id, fetcher.fetch(video_id, languages), None
+            except Exception as e:
+                return video_id, None, f"{type(e).__name__}: {e}"
+        
+        workers = max(1, min(max_workers or settings.youtube_extract_workers, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transcripts") as pool:
+            fetched = list(pool.map(fetch, pending))
+        
+        try:
+            self._upsert_videos(pending, fetched)
+        except IntegrityError:
+            # Another request created one of these videos meanwhile; it is an update now
+            self.db.rollback()
+            self._upsert_videos(pending, fetched)
+        
+        return results
+    
+    def _upsert_videos(self, pending: Dict[str, List[Dict[str, Any]]], fetched: List) -> None:
+        """Create or update one card per fetched video in a single transaction"""
+        existing = {
+            card.video_id: card
+            for card in self.db.query(YouTubeCard).filter(YouTubeCard.video_id.in_(list(pending))).all()
+        }
+        for video_id, video, error in fetched:
+            if error:
+                for result in pending[video_id]:
+                    result["error"] = error
+                continue
+            
+            card = existing.get(video_id)
+            status = "updated" if card else "created"
+            if card is None:
+                card = YouTubeCard(url=self.canonical_url(video_id), video_id=video_id, flashcard_count=0)
+                self.db.add(card)
+            self._apply_video(card, video)
+            existing[video_id] = card
+            for result in pending[video_id]:
+                result.update(status=status, transcript_length=len(video.transcript))
+        
+        self.db.flush()
+        for video_id, video, error in fetched:
+            if not error:
+                self.replace_segments(existing[video_id].id, video.segments)
+        for video_id, items in pending.items():
+            for result in items:
+                if result["status"] != "failed":
+                    result["card_id"] = existing[video_id].id
+        self.db.commit()
+    
+    def save_fetched_video(self, card: YouTubeCard, video: FetchedVideo) -> YouTubeCard:
+        """Store a fetched transcript, its metadata and its timed segments on an existing card"""
+        self._apply_video(card, video)
+        self.replace_segments(card.id, video.segments)
+        self.db.commit()
+        self.db.refresh(card)
+        
+        return card
+    
+    def replace_segments(self, card_id: int, segments: Sequence[Dict[str, Any]]) -> int:
+        """Replace a card's timed segments in the current transaction; returns the number stored"""
+        self.db.query(TranscriptSegment).filter(TranscriptSegment.card_id == card_id).delete()
+        rows = segment_rows(card_id, segments)
+        if rows:
+            self.db.execute(insert(TranscriptSegment), rows)
+        return len(rows)
+    
+    def get_segments(self, card_id: int, start_ms: Optional[int] = None,
+                     end_ms: Optional[int] = None) -> List[TranscriptSegment]:
+        """
+        Segments of a card that overlap [start_ms, end_ms), in time order.
+        
+        Both lookups are range scans on the (card_id, start_ms) index: the
+        segments starting inside the window, plus the one segment that
+        started before it and may still be running at start_ms.
+        """
+        query = self.db.query(TranscriptSegment).filter(TranscriptSegment.card_id == card_id)
+        segments = []
+        if start_ms:
+            previous = (
+                query.filter(TranscriptSegment.start_ms < start_ms)
+                .order_by(TranscriptSegment.start_ms.desc())
+                .first()
+            )
+            if previous is not None and previous.end_ms > start_ms:
+                segments.append(previous)
+            query = query.filter(TranscriptSegment.start_ms >= start_ms)
+        if end_ms is not None:
+            query = query.filter(TranscriptSegment.start_ms < end_ms)
+        
+        return segments + query.order_by(TranscriptSegment.start_ms).all()
+    
+    def get_window_text(self, card_id: int, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> str:
+        """Transcript text spoken between start_ms and end_ms, read from the segments table"""
+        return " ".join(segment.text for segment in self.get_segments(card_id, start_ms, end_ms))
+    
+    @staticmethod
+    def _apply_video(card: YouTubeCard, video: FetchedVideo) -> None:
+        card.transcript = video.transcript
+        card.title = (video.title or card.title or f"YouTube video {video.video_id}")[:200]
+        if video.channel:
+            card.channel = video.channel[:100]
+        if video.description:
+            card.description = video.description
+        if video.duration is not None:
+            card.duration = video.duration
+    
     def get_youtube_card_by_url(self, url: str) -> Optional[YouTubeCard]:
-        """Get a YouTube card by URL"""
+        """Get a YouTube card by URL; any link to the same video finds the same card"""
+        video_id = self.extract_video_id(url)
+        if video_id:
+            return self.get_youtube_card_by_video_id(video_id)
         return self.db.query(YouTubeCard).filter(YouTubeCard.url == url).first()
     
     def create_youtube_card(self, card_data: YouTubeCardCreate) -> YouTubeCard:
-        """Create a new YouTube card"""
-        # Check if card with this URL already exists
+        """Create a new YouTube card, or return the existing card for the same video"""
         existing_card = self.get_youtube_card_by_url(card_data.url)
         if existing_card:
             return existing_card
         
-        # Create new card
+        # YouTube links are stored in canonical form, keyed by video ID
+        video_id = self.extract_video_id(card_data.url)
         db_card = YouTubeCard(
             title=card_data.title,
-            url=card_data.url,
+            url=self.canonical_url(video_id) if video_id else card_data.url,
+            video_id=video_id,
             description=card_data.description,
             transcript=card_data.transcript,
             duration=card_data.duration,
@@ -43,7 +244,15 @@ class YouTubeService:
         )
         
         self.db.add(db_card)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # Created concurrently by another request
+            self.db.rollback()
+            existing_card = self.get_youtube_card_by_url(card_data.url)
+            if existing_card:
+                return existing_card
+            raise
         self.db.refresh(db_card)
         
         return db_card
@@ -59,6 +268,10 @@ class YouTubeService:
         for field, value in update_dict.items():
             setattr(db_card, field, value)
         
+        # Timings of a hand-edited transcript are unknown, so its old segments no longer apply
+        if "transcript" in update_dict:
+            self.replace_segments(card_id, [])
+        
         self.db.commit()
         self.db.refresh(db_card)
         
@@ -70,29 +283,62 @@ class YouTubeService:
         if not db_card:
             return False
         
+        self.db.query(TranscriptSegment).filter(TranscriptSegment.card_id == card_id).delete()
+        # Flashcards outlive their source video
+        self.db.query(Flashcard).filter(Flashcard.source_youtube_card_id == card_id).update(
+            {Flashcard.source_youtube_card_id: None}, synchronize_session=False
+        )
         self.db.delete(db_card)
         self.db.commit()
         
         return True
     
-    def search_youtube_cards(self, query: str, skip: int = 0, limit: int = 100) -> List[YouTubeCard]:
-        """Search YouTube cards by title, description, or channel"""
+    @staticmethod
+    def _search_filter(query: str):
         from sqlalchemy import or_
         
-        search_filter = or_(
+        return or_(
             YouTubeCard.title.contains(query),
             YouTubeCard.description.contains(query),
             YouTubeCard.channel.contains(query)
         )
-        
+    
+    def search_youtube_cards(self, query: str, skip: int = 0, limit: int = 100) -> List[YouTubeCard]:
+        """Search YouTube cards by title, description, or channel"""
         return (
             self.db.query(YouTubeCard)
-            .filter(search_filter)
+            .filter(self._search_filter(query))
             .offset(skip)
             .limit(limit)
             .all()
         )
     
+    def get_youtube_card_fields(self, fields: List[str], skip: int = 0, limit: int = 100,
+                                search: Optional[str] = None, channel: Optional[str] = None,
+                                with_transcripts: Optional[bool] = None,
+                                without_flashcards: Optional[bool] = None,
+                                ids: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """
+        List YouTube cards selecting only the requested columns.
+        
+        Filters apply with the same precedence as the list endpoint; ids
+        replaces them and the pagination. Rows are plain dicts, so
+        unrequested columns are never loaded.
+        """
+        query = self.db.query(YouTubeCard)
+        if ids is not None:
+            return project_rows(query.filter(YouTubeCard.id.in_(ids)), YOUTUBE_CARD_FIELDS, fields)
+        if search:
+            query = query.filter(self._search_filter(search))
+        elif channel:
+            query = query.filter(YouTubeCard.channel == channel)
+        elif with_transcripts:
+            query = query.filter(YouTubeCard.transcript_size > 0)
+        elif without_flashcards:
+            query = query.filter(YouTubeCard.flashcard_count == 0)
+        
+        return project_rows(query.offset(skip).limit(limit), YOUTUBE_CARD_FIELDS, fields)
+    
     def get_youtube_cards_by_channel(self, channel: str, skip: int = 0, limit: int = 100) -> List[YouTubeCard]:
         """Get YouTube cards by channel"""
         return (
@@ -103,16 +349,28 @@ class YouTubeService:
             .all()
         )
     
-    def update_flashcard_count(self, card_id: int, count: int) -> bool:
-        """Update the flashcard count for a YouTube card"""
-        db_card = self.get_youtube_card_by_id(card_id)
-        if not db_card:
-            return False
+    def recount_flashcards(self, card_id: Optional[int] = None) -> int:
+        """
+        Recompute flashcard_count from the flashcards that name each card as
+        their source, for one card or all of them, in a single UPDATE.
         
-        db_card.flashcard_count = count
+        Counts are maintained on every create and delete, so this only
+        repairs rows written outside FlashcardService. Returns the number of
+        cards updated.
+        """
+        count = (
+            select(func.count(Flashcard.id))
+            .where(Flashcard.source_youtube_card_id == YouTubeCard.id)
+            .scalar_subquery()
+        )
+        statement = update(YouTubeCard).values(flashcard_count=count)
+        if card_id is not None:
+            statement = statement.where(YouTubeCard.id == card_id)
+        
+        updated = self.db.execute(statement.execution_options(synchronize_session="fetch")).rowcount
         self.db.commit()
         
-        return True
+        return updated
     
     def get_youtube_card_count(self) -> int:
         """Get total number of YouTube cards"""
@@ -131,8 +389,7 @@ class YouTubeService:
         """Get YouTube cards that have transcripts"""
         return (
             self.db.query(YouTubeCard)
-            .filter(YouTubeCard.transcript.isnot(None))
-            .filter(YouTubeCard.transcript != "")
+            .filter(YouTubeCard.transcript_size > 0)
             .offset(skip)
             .limit(limit)
             .all()
@@ -0,0 +1,105 @@
+"""add youtube video id
+
+Revision ID: 59bc51f72b47
+Revises: 2470267b8127
+Create Date: 2026-10-19 03:29:06.852404
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.app.core.youtube_urls import canonical_url, extract_video_id
+
+
+# revision identifiers, used by Alembic.
+revision: str = '59bc51f72b47'
+down_revision: Union[str, Sequence[str], None] = '2470267b8127'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+youtube_cards = sa.table(
+    'youtube_cards',
+    sa.column('id', sa.Integer),
+    sa.column('url', sa.String),
+    sa.column('video_id', sa.String),
+    sa.column('transcript_data', sa.LargeBinary),
+    sa.column('transcript_size', sa.Integer),
+    sa.column('flashcard_count', sa.Integer),
+)
+
+
+def _backfill_video_ids() -> None:
+    """
+    Set video_id and the canonical URL on every card, merging cards that
+    point at the same video.
+
+    The card with the most flashcards (then a transcript, then the lowest id)
+    is kept; it inherits a transcript and the flashcard counts from the cards
+    merged into it.
+    """
+    connection = op.get_bind()
+    groups = {}
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(youtube_cards.c.id, youtube_cards.c.url, youtube_cards.c.flashcard_count,
+                      youtube_cards.c.transcript_size)
+            .where(youtube_cards.c.id > last_id)
+            .order_by(youtube_cards.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        for card_id, url, flashcard_count, transcript_size in rows:
+            video_id = extract_video_id(url or '')
+            if video_id:
+                groups.setdefault(video_id, []).append((card_id, flashcard_count or 0, transcript_size or 0))
+        last_id = rows[-1][0]
+
+    updates = []
+    for video_id, cards in groups.items():
+        cards.sort(key=lambda card: (-card[1], -(card[2] > 0), card[0]))
+        keeper_id, _, keeper_size = cards[0]
+        duplicates = cards[1:]
+        if duplicates:
+            donor = next((card for card in duplicates if card[2] > 0), None)
+            if not keeper_size and donor:
+                transcript = sa.select(youtube_cards.c.transcript_data).where(youtube_cards.c.id == donor[0]).scalar_subquery()
+                connection.execute(
+                    youtube_cards.update().where(youtube_cards.c.id == keeper_id)
+                    .values(transcript_data=transcript, transcript_size=donor[2])
+                )
+            connection.execute(youtube_cards.delete().where(youtube_cards.c.id.in_([card[0] for card in duplicates])))
+        updates.append({
+            'card_id': keeper_id,
+            'video_id': video_id,
+            'url': canonical_url(video_id),
+            'flashcard_count': sum(card[1] for card in cards),
+        })
+
+    for start in range(0, len(updates), BATCH_SIZE):
+        connection.execute(
+            youtube_cards.update().where(youtube_cards.c.id == sa.bindparam('card_id')),
+            updates[start:start + BATCH_SIZE]
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.add_column('youtube_cards', sa.Column('video_id', sa.String(length=11), nullable=True))
+    _backfill_video_ids()
+    op.create_index(op.f('ix_youtube_cards_video_id'), 'youtube_cards', ['video_id'], unique=True)
+    # ### end Alembic commands ###
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f('ix_youtube_cards_video_id'), table_name='youtube_cards')
+    op.drop_column('youtube_cards', 'video_id')
+    # ### end Alembic commands ###
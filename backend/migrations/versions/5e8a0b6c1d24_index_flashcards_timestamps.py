@@ -0,0 +1,33 @@
+"""index flashcards created_at and updated_at
+
+The distractor index catches up on cards created or edited by other
+processes by these timestamps, so both are indexed.
+
+Revision ID: 5e8a0b6c1d24
+Revises: c41e7d2a9f3b
+Create Date: 2026-10-19 11:24:51.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a0b6c1d24'
+down_revision: Union[str, Sequence[str], None] = 'c41e7d2a9f3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_flashcards_created_at'), 'flashcards', ['created_at'], unique=False)
+    op.create_index(op.f('ix_flashcards_updated_at'), 'flashcards', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_flashcards_updated_at'), table_name='flashcards')
+    op.drop_index(op.f('ix_flashcards_created_at'), table_name='flashcards')
@@ -0,0 +1,32 @@
+"""add job run_after
+
+Failed jobs are requeued with a backoff instead of being claimed again
+at once; run_after holds the time the retry becomes runnable.
+
+Revision ID: 9d3f6a1b7e52
+Revises: 5e8a0b6c1d24
+Create Date: 2026-10-19 11:48:06.935114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6a1b7e52'
+down_revision: Union[str, Sequence[str], None] = '5e8a0b6c1d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('jobs', sa.Column('run_after', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('run_after')
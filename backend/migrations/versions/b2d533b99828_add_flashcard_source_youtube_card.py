@@ -0,0 +1,65 @@
+"""add flashcard source youtube card
+
+flashcard_count was set by hand before this revision and nothing recorded
+where a flashcard came from, so every count is recomputed from the new
+source column (zero until cards are generated from a video).
+
+Revision ID: b2d533b99828
+Revises: 033db6273f0e
+Create Date: 2026-10-19 03:36:04.416895
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d533b99828'
+down_revision: Union[str, Sequence[str], None] = '033db6273f0e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+youtube_cards = sa.table(
+    'youtube_cards',
+    sa.column('id', sa.Integer),
+    sa.column('flashcard_count', sa.Integer),
+)
+flashcards = sa.table(
+    'flashcards',
+    sa.column('id', sa.Integer),
+    sa.column('source_youtube_card_id', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite cannot add a foreign key to an existing table, so it is rebuilt in batch mode
+    with op.batch_alter_table('flashcards') as batch_op:
+        batch_op.add_column(sa.Column('source_youtube_card_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_flashcards_source_youtube_card_id'), ['source_youtube_card_id'], unique=False)
+        batch_op.create_foreign_key('fk_flashcards_source_youtube_card_id', 'youtube_cards',
+                                    ['source_youtube_card_id'], ['id'], ondelete='SET NULL')
+
+    op.execute(youtube_cards.update().values(flashcard_count=(
+        sa.select(sa.func.count(flashcards.c.id))
+        .where(flashcards.c.source_youtube_card_id == youtube_cards.c.id)
+        .scalar_subquery()
+    )))
+
+    with op.batch_alter_table('youtube_cards') as batch_op:
+        batch_op.alter_column('flashcard_count', existing_type=sa.INTEGER(), nullable=False, server_default='0')
+        batch_op.create_index(batch_op.f('ix_youtube_cards_flashcard_count'), ['flashcard_count'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('youtube_cards') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_youtube_cards_flashcard_count'))
+        batch_op.alter_column('flashcard_count', existing_type=sa.INTEGER(), nullable=True, server_default=None)
+
+    with op.batch_alter_table('flashcards') as batch_op:
+        batch_op.drop_constraint('fk_flashcards_source_youtube_card_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_flashcards_source_youtube_card_id'))
+        batch_op.drop_column('source_youtube_card_id')
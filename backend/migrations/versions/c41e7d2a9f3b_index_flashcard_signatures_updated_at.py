@@ -0,0 +1,31 @@
+"""index flashcard signatures updated_at
+
+The near-duplicate index catches up on signatures rewritten by other
+processes by their updated_at, so the column is indexed.
+
+Revision ID: c41e7d2a9f3b
+Revises: 8b69273a02c8
+Create Date: 2026-10-19 11:02:17.483920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7d2a9f3b'
+down_revision: Union[str, Sequence[str], None] = '8b69273a02c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_flashcard_signatures_updated_at'), 'flashcard_signatures', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_flashcard_signatures_updated_at'), table_name='flashcard_signatures')
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - YouTube ingest throughput benchmark
+
+Writes fixture transcripts to a temporary directory and ingests them through
+YouTubeService.ingest_urls with the fixture fetcher, which sleeps for
+--latency seconds per video to stand in for the YouTube round trip. Reports
+videos per second for each transcript pool size. With --cache the fetcher sits
+behind a transcript cache and each run is repeated with refresh, which should
+be served from disk without any fetch latency:
+
+    python benchmarks/ingest_youtube.py --videos 64 --latency 0.2 --workers 1,4,16 --cache
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def write_fixtures(directory: str, run: int, videos: int) -> list:
+    urls = []
+    for index in range(videos):
+        video_id = f"bench{run:02d}{index:04d}"
+        with open(os.path.join(directory, f"{video_id}.json"), "w") as f:
+            json.dump({
+                "title": f"Benchmark video {index}",
+                "channel": "Benchmarks",
+                "segments": [
+                    {"text": f"Sentence {line} of benchmark video {index}.", "start": line * 4.0, "duration": 4.0}
+                    for line in range(200)
+                ]
+            }, f)
+        urls.append(f"https://www.youtube.com/watch?v={video_id}")
+    return urls
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure YouTube ingest throughput against fixture transcripts")
+    parser.add_argument("--videos", type=int, default=64, help="Videos per run")
+    parser.add_argument("--latency", type=float, default=0.2, help="Simulated fetch latency per video in seconds")
+    parser.add_argument("--workers", default="1,4,16", help="Comma-separated transcript pool sizes")
+    parser.add_argument("--cache", action="store_true", help="Fetch through the transcript cache and time a warm re-extract")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="levelup-ingest-")
+    fixtures = os.path.join(workdir, "fixtures")
+    os.makedirs(fixtures)
+    os.chdir(workdir)
+    os.environ["data_dir"] = "data"
+    sys.path.insert(0, PROJECT_ROOT)
+
+    from backend.app.core.database import SessionLocal, init_db
+    from backend.app.services.transcript_cache import TranscriptCache
+    from backend.app.services.transcript_fetchers import CachingTranscriptFetcher, FixtureTranscriptFetcher
+    from backend.app.services.youtube_service import YouTubeService
+
+    init_db()
+    fetcher = FixtureTranscriptFetcher(fixtures, latency=args.latency)
+    if args.cache:
+        fetcher = CachingTranscriptFetcher(fetcher, TranscriptCache(os.path.join(workdir, "cache"), 1 << 30, 3600))
+
+    def ingest(urls: list, workers: int, refresh: bool):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            results = YouTubeService(db).ingest_urls(urls, fetcher=fetcher, max_workers=workers, refresh=refresh)
+            return time.perf_counter() - start, sum(1 for result in results if result["status"] == "failed")
+        finally:
+            db.close()
+
+    print(f"{'run':>5} {'workers':>7} {'videos':>6} {'seconds':>8} {'videos/s':>9} {'failed':>6}")
+    for run, workers in enumerate(int(value) for value in args.workers.split(",")):
+        urls = write_fixtures(fixtures, run, args.videos)
+        runs = [("cold", False)] + ([("warm", True)] if args.cache else [])
+        for label, refresh in runs:
+            elapsed, failed = ingest(urls, workers, refresh)
+            print(f"{label:>5} {workers:>7} {len(urls):>6} {elapsed:>8.2f} {len(urls) / elapsed:>9.1f} {failed:>6}")
+
+if __name__ == "__main__":
+    main()
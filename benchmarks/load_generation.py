@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - Flashcard generation load test
+
+Starts the OpenAI stub server and the application (one instance per
+job-worker setting), drives the generation endpoints at increasing client
+concurrency, and reports throughput and p50/p95/p99 latency:
+
+    python benchmarks/load_generation.py --concurrency 1,4,16 --job-workers 1,4
+
+Modes:
+  jobs    POST /api/v1/flashcards/generate, then poll /api/v1/jobs/{id}
+          until the job finishes (latency = enqueue to completion)
+  stream  POST /api/v1/flashcards/generate/stream (latency = full stream,
+          ttfc = time to first flashcard event)
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_TEXT = (
+    "Spaced repetition schedules reviews at increasing intervals. Cards that are "
+    "answered correctly are shown less often, while difficult cards come back sooner."
+)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not start")
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def start_stub(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    command = [
+        sys.executable, os.path.join(PROJECT_ROOT, "benchmarks", "openai_stub.py"),
+        "--port", str(port),
+        "--latency", str(args.stub_latency),
+        "--token-rate", str(args.stub_token_rate),
+        "--error-rate", str(args.stub_error_rate),
+    ]
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT)
+    wait_for(f"http://127.0.0.1:{port}/stub/stats")
+    return process
+
+def start_app(port: int, stub_port: int, job_workers: int, data_dir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY="stub",
+        OPENAI_BASE_URL=f"http://127.0.0.1:{stub_port}/v1",
+        job_workers=str(job_workers),
+        job_poll_interval="0.05",
+        data_dir=os.path.relpath(data_dir, PROJECT_ROOT),
+        rate_limit_backend="off",  # Every client shares one IP, so the ai limit would refuse most requests
+    )
+    command = [
+        sys.executable, "-m", "uvicorn", "backend.app.main:app",
+        "--port", str(port), "--log-level", "warning",
+    ]
+    process = subprocess.Popen(command, cwd=PROJECT_ROOT, env=env)
+    wait_for(f"http://127.0.0.1:{port}/health")
+    return process
+
+def run_job_request(base_url: str, max_cards: int, timeout: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    response = requests.post(f"{base_url}/api/v1/flashcards/generate",
+                             json={"text": SAMPLE_TEXT, "max_cards": max_cards}, timeout=timeout)
+    if response.status_code != 202:
+        return {"ok": False, "latency": time.perf_counter() - start}
+
+    job_id = response.json()["id"]
+    while time.perf_counter() - start < timeout:
+        job = requests.get(f"{base_url}/api/v1/jobs/{job_id}", timeout=timeout).json()
+        if job["status"] in ("succeeded", "failed"):
+            return {"ok": job["status"] == "succeeded", "latency": time.perf_counter() - start}
+        time.sleep(0.05)
+
+    return {"ok": False, "latency": time.perf_counter() - start}
+
+def run_stream_request(base_url: str, max_cards: int, timeout: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    first_card: Optional[float] = None
+    ok = False
+    with requests.post(f"{base_url}/api/v1/flashcards/generate/stream",
+                       json={"text": SAMPLE_TEXT, "max_cards": max_cards}, stream=True, timeout=timeout) as response:
+        if response.status_code == 200:
+            for line in response.iter_lines(decode_unicode=True):
+                if line == "event: flashcard" and first_card is None:
+                    first_card = time.perf_counter() - start
+                elif line == "event: done":
+                    ok = True
+    return {"ok": ok, "latency": time.perf_counter() - start, "ttfc": first_card}
+
+def run_level(base_url: str, mode: str, concurrency: int, total: int, max_cards: int, timeout: float) -> Dict[str, Any]:
+    worker = run_job_request if mode == "jobs" else run_stream_request
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: _safe(worker, base_url, max_cards, timeout), range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [result["latency"] for result in results if result["ok"]]
+    ttfcs = [result["ttfc"] for result in results if result.get("ttfc") is not None]
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": sum(1 for result in results if not result["ok"]),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "ttfc_p50": percentile(ttfcs, 50) if ttfcs else None,
+    }
+
+def _safe(worker, base_url: str, max_cards: int, timeout: float) -> Dict[str, Any]:
+    try:
+        return worker(base_url, max_cards, timeout)
+    except requests.RequestException:
+        return {"ok": False, "latency": timeout}
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    header = f"{'mode':<7} {'workers':>7} {'conc':>5} {'reqs':>5} {'errs':>5} {'req/s':>8} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'ttfc s':>7}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        ttfc = f"{row['ttfc_p50']:.3f}" if row["ttfc_p50"] is not None else "-"
+        print(f"{row['mode']:<7} {row['job_workers']:>7} {row['concurrency']:>5} {row['requests']:>5} {row['errors']:>5} "
+              f"{row['throughput']:>8.2f} {row['p50']:>7.3f} {row['p95']:>7.3f} {row['p99']:>7.3f} {ttfc:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test flashcard generation against the OpenAI stub")
+    parser.add_argument("--mode", choices=["jobs", "stream", "both"], default="both")
+    parser.add_argument("--concurrency", default="1,4,16", help="Comma-separated client concurrency levels")
+    parser.add_argument("--job-workers", default="2", help="Comma-separated job_workers settings to compare")
+    parser.add_argument("--requests", type=int, default=32, help="Requests per concurrency level")
+    parser.add_argument("--max-cards", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--stub-latency", type=float, default=0.3)
+    parser.add_argument("--stub-token-rate", type=float, default=200.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    modes = ["jobs", "stream"] if args.mode == "both" else [args.mode]
+    levels = [int(value) for value in args.concurrency.split(",")]
+    worker_settings = [int(value) for value in args.job_workers.split(",")]
+
+    stub_port = free_port()
+    stub = start_stub(stub_port, args)
+    rows: List[Dict[str, Any]] = []
+    try:
+        for job_workers in worker_settings:
+            with tempfile.TemporaryDirectory(prefix="levelup-load-") as data_dir:
+                app_port = free_port()
+                server = start_app(app_port, stub_port, job_workers, data_dir)
+                base_url = f"http://127.0.0.1:{app_port}"
+                try:
+                    for mode in modes:
+                        if mode == "stream" and job_workers != worker_settings[0]:
+                            continue  # Streaming does not use the job workers
+                        for concurrency in levels:
+                            row = run_level(base_url, mode, concurrency, args.requests, args.max_cards, args.timeout)
+                            row["job_workers"] = job_workers if mode == "jobs" else "-"
+                            rows.append(row)
+                            print(f"  {mode} workers={row['job_workers']} concurrency={concurrency}: "
+                                  f"{row['throughput']:.2f} req/s, p95 {row['p95']:.3f}s", flush=True)
+                finally:
+                    server.terminate()
+                    server.wait()
+        upstream = requests.get(f"http://127.0.0.1:{stub_port}/stub/stats").json()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    print()
+    print_table(rows)
+    print(f"\nUpstream completions served by stub: {upstream}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"results": rows, "upstream": upstream}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
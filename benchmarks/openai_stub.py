@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - Local OpenAI-compatible stub server
+
+Implements enough of the Chat Completions API (streaming and non-streaming)
+to exercise AIService and the ai_committer loop without calling OpenAI.
+Latency, token rate, error rate and canned responses are configurable from
+the command line or at runtime through POST /stub/config.
+
+    python benchmarks/openai_stub.py --port 8001 --latency 0.3 --token-rate 80
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub python run.py
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+
+DEFAULT_CONFIG: Dict[str, Any] = {
+    "latency": 0.2,       # Seconds before the first token (or the whole non-streaming reply)
+    "jitter": 0.05,       # Random extra latency, up to this many seconds
+    "token_rate": 100.0,  # Completion tokens per second; 0 disables generation delay
+    "error_rate": 0.0,    # Fraction of requests answered with an error
+    "error_status": 500,  # Status code for injected errors (429 simulates rate limiting)
+    "chars_per_token": 4,
+    "responses": [],      # Canned responses: [{"match": "substring", "content": "..."}]
+}
+
+config: Dict[str, Any] = dict(DEFAULT_CONFIG)
+stats: Dict[str, int] = {"requests": 0, "streaming": 0, "errors": 0, "completion_tokens": 0}
+
+app = FastAPI(title="OpenAI stub")
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(message.get("content") or "") for message in messages)
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // config["chars_per_token"])
+
+def _canned_content(prompt: str) -> str:
+    """Pick a response for the prompt: configured canned responses first, then built-in ones"""
+    for response in config["responses"]:
+        if response.get("match", "") in prompt:
+            return response["content"]
+
+    flashcards = re.search(r"Create (\d+) flashcards", prompt)
+    if flashcards:
+        count = int(flashcards.group(1))
+        return json.dumps({
+            "flashcards": [
+                {
+                    "question": f"Stub question {index + 1}: what does this passage explain?",
+                    "answer": f"Stub answer {index + 1} summarising the key idea of the passage.",
+                    "category": "Stub",
+                    "difficulty": ("easy", "medium", "hard")[index % 3]
+                }
+                for index in range(count)
+            ]
+        }, indent=2)
+
+    if '"title"' in prompt and '"notes"' in prompt:
+        # ai_committer next-task suggestion
+        return json.dumps({
+            "title": "Stub task",
+            "notes": "Task suggested by the local OpenAI stub",
+            "priority": "low"
+        })
+
+    return "This is a response from the local OpenAI stub server."
+
+def _split_tokens(content: str) -> List[str]:
+    size = config["chars_per_token"]
+    return [content[index:index + size] for index in range(0, len(content), size)]
+
+async def _first_token_delay() -> None:
+    await asyncio.sleep(config["latency"] + random.uniform(0, config["jitter"]))
+
+def _injected_error() -> Optional[JSONResponse]:
+    if config["error_rate"] and random.random() < config["error_rate"]:
+        stats["errors"] += 1
+        return JSONResponse(
+            status_code=config["error_status"],
+            content={"error": {"message": "Injected stub error", "type": "stub_error", "code": None}}
+        )
+    return None
+
+@app.post("/v1/chat/completions")
+async def chat_completions(body: Dict[str, Any]):
+    """OpenAI-compatible chat completion endpoint"""
+    stats["requests"] += 1
+    error = _injected_error()
+    if error:
+        return error
+
+    model = body.get("model", "stub-model")
+    prompt = _prompt_text(body.get("messages", []))
+    content = _canned_content(prompt)
+    tokens = _split_tokens(content)
+    max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+    finish_reason = "stop"
+    if max_tokens and len(tokens) > max_tokens:
+        tokens, finish_reason = tokens[:max_tokens], "length"
+
+    usage = {
+        "prompt_tokens": _count_tokens(prompt),
+        "completion_tokens": len(tokens),
+        "total_tokens": _count_tokens(prompt) + len(tokens)
+    }
+    stats["completion_tokens"] += len(tokens)
+    completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    token_delay = 1.0 / config["token_rate"] if config["token_rate"] else 0.0
+
+    if not body.get("stream"):
+        await _first_token_delay()
+        await asyncio.sleep(token_delay * len(tokens))
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": finish_reason
+            }],
+            "usage": usage
+        }
+
+    stats["streaming"] += 1
+    include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+    def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}]
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    async def events():
+        await _first_token_delay()
+        yield chunk({"role": "assistant", "content": ""})
+        for token in tokens:
+            if token_delay:
+                await asyncio.sleep(token_delay)
+            yield chunk({"content": token})
+        yield chunk({}, finish_reason)
+        if include_usage:
+            usage_chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage
+            }
+            yield f"data: {json.dumps(usage_chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@app.get("/v1/models")
+async def list_models():
+    """Minimal model listing"""
+    return {"object": "list", "data": [{"id": "gpt-3.5-turbo", "object": "model", "owned_by": "stub"}]}
+
+@app.get("/stub/stats")
+async def get_stats():
+    """Counters for requests served by the stub"""
+    return stats
+
+@app.post("/stub/config")
+async def update_config(changes: Dict[str, Any]):
+    """Change stub behaviour at runtime, e.g. {"latency": 1.0, "error_rate": 0.1}"""
+    unknown = set(changes) - set(DEFAULT_CONFIG)
+    if unknown:
+        return JSONResponse(status_code=400, content={"detail": f"Unknown settings: {sorted(unknown)}"})
+    config.update(changes)
+    return config
+
+@app.post("/stub/reset")
+async def reset_stats():
+    """Reset request counters"""
+    for key in stats:
+        stats[key] = 0
+    return stats
+
+def main():
+    """Run the stub server"""
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=DEFAULT_CONFIG["latency"], help="Seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_CONFIG["jitter"], help="Random extra latency in seconds")
+    parser.add_argument("--token-rate", type=float, default=DEFAULT_CONFIG["token_rate"], help="Completion tokens per second (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"], help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=DEFAULT_CONFIG["error_status"])
+    parser.add_argument("--responses", help="JSON file with canned responses: [{\"match\": \"...\", \"content\": \"...\"}]")
+    args = parser.parse_args()
+
+    config.update(
+        latency=args.latency,
+        jitter=args.jitter,
+        token_rate=args.token_rate,
+        error_rate=args.error_rate,
+        error_status=args.error_status
+    )
+    if args.responses:
+        with open(args.responses, "r") as f:
+            config["responses"] = json.load(f)
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - Rate limiter overhead benchmark
+
+Calls RateLimitMiddleware around an empty ASGI app and reports the time it
+adds per request, next to the bare app, for a route group without a rate
+(reads), a limited group (ai) on each bucket store, and a refused request:
+
+    python benchmarks/rate_limit.py --requests 100000 --clients 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+async def empty_app(scope, receive, send):
+    pass
+
+async def discard(message):
+    pass
+
+def request_scope(method: str, path: str, client: str) -> dict:
+    return {"type": "http", "method": method, "path": path, "query_string": b"", "headers": [],
+            "client": (client, 50000)}
+
+async def time_requests(app, scopes: list, requests: int) -> float:
+    """Seconds per request, cycling through the scopes"""
+    count = len(scopes)
+    started = time.perf_counter()
+    for i in range(requests):
+        await app(scopes[i % count], None, discard)
+    return (time.perf_counter() - started) / requests
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-request overhead of the rate limit middleware")
+    parser.add_argument("--requests", type=int, default=100_000, help="Requests per case (a tenth for sqlite)")
+    parser.add_argument("--clients", type=int, default=1000, help="Distinct client IPs")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="levelup-rate-limit-"))
+    sys.path.insert(0, PROJECT_ROOT)
+    from backend.app.core.rate_limit import RateLimitMiddleware
+
+    ips = [f"10.0.{i // 256}.{i % 256}" for i in range(args.clients)]
+    reads = [request_scope("GET", "/api/v1/flashcards/", ip) for ip in ips]
+    generate = [request_scope("POST", "/api/v1/flashcards/generate", ip) for ip in ips]
+    generous = {"ai": f"{10 ** 9}/second"}
+
+    cases = [
+        ("bare app", empty_app, reads, args.requests),
+        ("reads (no rate)", RateLimitMiddleware(empty_app, limits=generous, backend="memory"), reads, args.requests),
+        ("ai, memory", RateLimitMiddleware(empty_app, limits=generous, backend="memory"), generate, args.requests),
+        ("ai, refused", RateLimitMiddleware(empty_app, limits={"ai": "1/day"}, backend="memory"), generate,
+         args.requests),
+        ("ai, sqlite", RateLimitMiddleware(empty_app, limits=generous, backend="sqlite"), generate, args.requests // 10),
+    ]
+
+    async def run():
+        results = []
+        for name, app, scopes, requests in cases:
+            await time_requests(app, scopes, min(requests, 1000))  # Warm up
+            results.append((name, await time_requests(app, scopes, requests)))
+        return results
+
+    results = asyncio.run(run())
+    baseline = results[0][1]
+    print(f"{'case':<18} {'µs/request':>11} {'added µs':>9}")
+    for name, seconds in results:
+        print(f"{name:<18} {seconds * 1e6:>11.2f} {(seconds - baseline) * 1e6:>9.2f}")
+
+if __name__ == "__main__":
+    main()
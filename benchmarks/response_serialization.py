@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - Response serialization and compression benchmark
+
+Seeds a temporary database with YouTube cards and flashcards, then requests
+large list pages, projected (fields=) pages and a transcript-heavy detail
+view through the full ASGI stack with each Accept-Encoding. Reports p50/p99
+latency and bytes on the wire, plus the render time of the old
+jsonable_encoder + json path against FastJSONResponse for projected rows:
+
+    python benchmarks/response_serialization.py --cards 1000 --requests 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure serialization latency and response size for large pages")
+    parser.add_argument("--cards", type=int, default=1000, help="YouTube cards and flashcards to seed")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint and encoding")
+    parser.add_argument("--transcript-words", type=int, default=9000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="levelup-serialization-")
+    os.chdir(workdir)
+    os.symlink(os.path.join(PROJECT_ROOT, "frontend"), "frontend")
+    os.environ["data_dir"] = "data"
+    sys.path.insert(0, PROJECT_ROOT)
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from fastapi.testclient import TestClient
+    from backend.app.core.database import SessionLocal, init_db
+    from backend.app.core.http_compression import brotli
+    from backend.app.core.responses import FastJSONResponse, orjson
+    from backend.app.main import app
+    from backend.app.models import Flashcard, YouTubeCard
+    from backend.app.services.youtube_service import YouTubeService
+
+    init_db()
+    rng = random.Random(7)
+    words = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9))) for _ in range(2000)]
+    db = SessionLocal()
+    for index in range(args.cards):
+        db.add(YouTubeCard(title=f"Video {index} " + " ".join(rng.choices(words, k=6)),
+                           url=f"https://www.youtube.com/watch?v=bench{index:06d}", video_id=f"bench{index:06d}",
+                           description=" ".join(rng.choices(words, k=40)), channel=f"Channel {index % 20}",
+                           duration=rng.randint(60, 3600), flashcard_count=0,
+                           transcript=" ".join(rng.choices(words, k=args.transcript_words)) if index == 0 else None))
+        db.add(Flashcard(question="What is " + " ".join(rng.choices(words, k=8)) + "?",
+                         answer=" ".join(rng.choices(words, k=20)), difficulty="medium", tags=["bench"]))
+    db.commit()
+
+    endpoints = [
+        ("youtube list", f"/api/v1/youtube/?limit={args.cards}"),
+        ("youtube fields", f"/api/v1/youtube/?limit={args.cards}&fields=title,url,channel,extracted_at"),
+        ("flashcard list", f"/api/v1/flashcards/?limit={args.cards}"),
+        ("transcript detail", "/api/v1/youtube/1"),
+    ]
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+
+    print(f"{args.cards} rows per page, orjson {'yes' if orjson else 'no'}, brotli {'yes' if brotli else 'no'}")
+    print(f"{'endpoint':<18} {'encoding':>8} {'p50 ms':>8} {'p99 ms':>8} {'wire KB':>9} {'json KB':>9}")
+    with TestClient(app) as client:
+        for name, path in endpoints:
+            for encoding in encodings:
+                headers = {"Accept-Encoding": encoding}
+                client.get(path, headers=headers)
+                timings = []
+                for _ in range(args.requests):
+                    start = time.perf_counter()
+                    response = client.get(path, headers=headers)
+                    timings.append((time.perf_counter() - start) * 1000)
+                wire = int(response.headers.get("content-length", len(response.content)))
+                print(f"{name:<18} {encoding:>8} {percentile(timings, 0.5):>8.2f} {percentile(timings, 0.99):>8.2f} "
+                      f"{wire / 1024:>9.1f} {len(response.content) / 1024:>9.1f}")
+
+    db = SessionLocal()
+    rows = YouTubeService(db).get_youtube_card_fields(["id", "title", "url", "channel", "extracted_at"], 0, args.cards)
+    db.close()
+
+    def render(function) -> float:
+        timings = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            function()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    print()
+    print(f"render {len(rows)} projected rows: jsonable_encoder + json {render(lambda: JSONResponse(jsonable_encoder(rows))):.2f} ms, "
+          f"FastJSONResponse {render(lambda: FastJSONResponse(rows)):.2f} ms")
+
+if __name__ == "__main__":
+    main()
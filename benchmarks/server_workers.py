@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - Production server throughput per worker count
+
+Seeds a temporary database, then starts run.py in production mode once per
+worker count and drives it from several client processes over keep-alive
+connections. Reports requests per second and p50/p99 latency for a
+framework-only endpoint and a database read:
+
+    python benchmarks/server_workers.py --workers 1,2,4 --clients 8 --duration 10
+
+Client processes share the machine with the server, so compare worker
+counts against each other rather than reading the numbers as capacity.
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = [
+    ("health", "/api/v1/health"),
+    ("flashcard list", "/api/v1/flashcards/?limit=20"),
+]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for(port: int, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/api/v1/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def client(port: int, path: str, duration: float, results) -> None:
+    """Request path back to back on one keep-alive connection"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers={"Accept-Encoding": "identity"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    results.put((latencies, errors))
+
+def drive(port: int, path: str, clients: int, duration: float) -> Tuple[List[float], int]:
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=client, args=(port, path, duration, results)) for _ in range(clients)]
+    for process in processes:
+        process.start()
+    latencies, errors = [], 0
+    for _ in processes:
+        client_latencies, client_errors = results.get()
+        latencies.extend(client_latencies)
+        errors += client_errors
+    for process in processes:
+        process.join()
+    return latencies, errors
+
+def seed(workdir: str, flashcards: int) -> None:
+    """Create the database in a child process, so this one never opens the engine"""
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from backend.app.core.database import SessionLocal, init_db\n"
+        "from backend.app.models import Flashcard\n"
+        "init_db(); db = SessionLocal()\n"
+        "db.add_all([Flashcard(question=f'Question {i}?', answer=f'Answer {i}', difficulty='medium', tags=['bench'])"
+        " for i in range(int(sys.argv[2]))])\n"
+        "db.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", code, PROJECT_ROOT, str(flashcards)], cwd=workdir, check=True,
+                   env=dict(os.environ, data_dir="data"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare requests per second across production worker counts")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=8, help="Client processes, each with one connection")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per endpoint and worker count")
+    parser.add_argument("--flashcards", type=int, default=200)
+    parser.add_argument("--preload", action="store_true", help="Fork workers from a preloaded gunicorn master")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="levelup-workers-")
+    os.symlink(os.path.join(PROJECT_ROOT, "frontend"), os.path.join(workdir, "frontend"))
+    seed(workdir, args.flashcards)
+
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients, {args.duration:.0f}s per run")
+    print(f"{'workers':>7} {'endpoint':<16} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for workers in [int(value) for value in args.workers.split(",")]:
+        port = free_port()
+        env = dict(os.environ, data_dir="data", server_mode="production", workers=str(workers),
+                   host="127.0.0.1", port=str(port), server_preload=str(args.preload).lower(),
+                   query_budget_mode="off")
+        server = subprocess.Popen([sys.executable, os.path.join(PROJECT_ROOT, "run.py")], cwd=workdir, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for(port)
+            for name, path in ENDPOINTS:
+                drive(port, path, args.clients, 1.0)  # Warm every worker's caches and connections
+                latencies, errors = drive(port, path, args.clients, args.duration)
+                print(f"{workers:>7} {name:<16} {len(latencies) / args.duration:>9.0f} "
+                      f"{percentile(latencies, 0.5) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} {errors:>7}")
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - Import time and cold start benchmark
+
+Each measurement runs in a fresh interpreter, so nothing is cached in
+sys.modules. Reports the median of several runs for importing the app,
+running its lifespan startup and answering the first request, on a new
+and on an existing database, next to the pieces startup changed: the
+Alembic head check that replaces create_all, and the OpenAI SDK import
+that now waits for the first AI call:
+
+    python benchmarks/startup_time.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_START = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+from backend.app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    status = client.get("/api/v1/flashcards/").status_code
+    answered = time.perf_counter()
+print(json.dumps({"import": imported - started, "startup": ready - imported, "first request": answered - ready,
+                  "total": answered - started, "status": status, "openai imported": "openai" in sys.modules}))
+"""
+
+DEFERRED = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+from backend.app.core.database import Base, engine, init_db
+from backend.app import models
+engine.connect().close()  # Time both on an open pooled connection
+started = time.perf_counter()
+init_db()
+checked = time.perf_counter()
+Base.metadata.create_all(bind=engine)
+created = time.perf_counter()
+import openai
+imported = time.perf_counter()
+print(json.dumps({"init_db (schema at head)": checked - started, "create_all (schema at head)": created - checked,
+                  "import openai": imported - created}))
+"""
+
+def measure(code: str, workdir: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", code, PROJECT_ROOT], cwd=workdir, check=True,
+                            capture_output=True, text=True, env=dict(os.environ, data_dir="data")).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def median_runs(code: str, runs: int, fresh_database: bool) -> dict:
+    workdir = tempfile.mkdtemp(prefix="levelup-startup-")
+    os.symlink(os.path.join(PROJECT_ROOT, "frontend"), os.path.join(workdir, "frontend"))
+    results = []
+    for _ in range(runs):
+        if fresh_database:
+            shutil.rmtree(os.path.join(workdir, "data"), ignore_errors=True)
+        results.append(measure(code, workdir))
+    return {key: statistics.median(result[key] for result in results) if isinstance(results[0][key], float)
+            else results[0][key] for key in results[0]}
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure app import time and cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    args = parser.parse_args()
+
+    for label, fresh in (("new database", True), ("existing database", False)):
+        result = median_runs(COLD_START, args.runs, fresh)
+        print(f"{label}: import {result['import'] * 1000:.0f} ms, startup {result['startup'] * 1000:.0f} ms, "
+              f"first request {result['first request'] * 1000:.0f} ms, total {result['total'] * 1000:.0f} ms "
+              f"(status {result['status']}, openai imported at startup: {result['openai imported']})")
+
+    print()
+    print("startup's schema check against create_all, and the SDK import it defers:")
+    for key, value in median_runs(DEFERRED, args.runs, False).items():
+        print(f"  {key:<28} {value * 1000:>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
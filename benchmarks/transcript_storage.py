@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+LevelUp AI - Transcript storage benchmark
+
+Builds two databases with the same YouTube cards: one with the old plain-text
+transcript column and one with the current compressed, deferred column. It
+compares database file size and the time to list and serialise cards:
+
+    python benchmarks/transcript_storage.py --cards 500 --words 9000 --limit 10,100
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_transcript(rng: random.Random, vocabulary: list, words: int) -> str:
+    """Speech-like text: short sentences drawn from a fixed vocabulary"""
+    sentences, count = [], 0
+    while count < words:
+        length = rng.randint(6, 18)
+        sentences.append(" ".join(rng.choice(vocabulary) for _ in range(length)).capitalize() + ".")
+        count += length
+    return " ".join(sentences)
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare plain and compressed transcript storage")
+    parser.add_argument("--cards", type=int, default=500)
+    parser.add_argument("--words", type=int, default=9000, help="Words per transcript (about an hour of speech)")
+    parser.add_argument("--limit", default="10,100", help="Comma-separated list page sizes")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="levelup-transcripts-")
+    os.chdir(workdir)
+    os.environ["data_dir"] = "data"
+    sys.path.insert(0, PROJECT_ROOT)
+
+    from backend.app.core.compression import available_codec
+    from backend.app.core.database import SessionLocal, init_db
+    from backend.app.models import YouTubeCard
+    from backend.app.schemas.youtube import YouTubeCardResponse, YouTubeCardSummary
+    from backend.app.services.youtube_service import YouTubeService
+
+    rng = random.Random(42)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 9))) for _ in range(3000)]
+    rows = [
+        (f"Video {index}", f"https://www.youtube.com/watch?v=bench{index:06d}", "Benchmark video",
+         make_transcript(rng, vocabulary, args.words), 3600, "Benchmarks", 0)
+        for index in range(args.cards)
+    ]
+
+    # Old layout: transcript stored as plain text and selected by every list query
+    plain_path = os.path.join(workdir, "plain.db")
+    plain = sqlite3.connect(plain_path)
+    plain.execute("""CREATE TABLE youtube_cards (id INTEGER PRIMARY KEY, title VARCHAR(200), url VARCHAR(500) UNIQUE,
+                     description TEXT, transcript TEXT, duration INTEGER, channel VARCHAR(100),
+                     extracted_at DATETIME DEFAULT CURRENT_TIMESTAMP, flashcard_count INTEGER)""")
+    plain.executemany("INSERT INTO youtube_cards (title, url, description, transcript, duration, channel, flashcard_count) "
+                      "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    plain.commit()
+    plain.execute("VACUUM")
+
+    # Current layout through the application models
+    init_db()
+    db = SessionLocal()
+    for title, url, description, transcript, duration, channel, flashcard_count in rows:
+        db.add(YouTubeCard(title=title, url=url, description=description, transcript=transcript,
+                           duration=duration, channel=channel, flashcard_count=flashcard_count))
+    db.commit()
+    db.close()
+    compressed_path = os.path.join(workdir, "data", "levelup.db")
+    vacuum = sqlite3.connect(compressed_path)
+    vacuum.execute("VACUUM")
+    vacuum.close()
+
+    print(f"{args.cards} cards, {args.words} words per transcript, codec {available_codec()}")
+    print(f"  plain DB size:      {os.path.getsize(plain_path) / 1e6:8.2f} MB")
+    print(f"  compressed DB size: {os.path.getsize(compressed_path) / 1e6:8.2f} MB")
+    print()
+
+    plain.row_factory = sqlite3.Row
+    print(f"{'limit':>6} {'plain list ms':>14} {'plain KB':>9} {'summary list ms':>16} {'summary KB':>11} {'detail ms':>10}")
+    for limit in (int(value) for value in args.limit.split(",")):
+        def plain_list():
+            cards = [dict(row) for row in plain.execute("SELECT * FROM youtube_cards LIMIT ?", (limit,))]
+            return json.dumps(cards)
+
+        def summary_list():
+            db = SessionLocal()
+            try:
+                cards = YouTubeService(db).get_all_youtube_cards(0, limit)
+                return json.dumps([YouTubeCardSummary.model_validate(card).model_dump(mode="json") for card in cards])
+            finally:
+                db.close()
+
+        def detail():
+            db = SessionLocal()
+            try:
+                card = YouTubeService(db).get_youtube_card_by_id(1)
+                return YouTubeCardResponse.model_validate(card).model_dump_json()
+            finally:
+                db.close()
+
+        print(f"{limit:>6} {timed(plain_list, args.repeat):>14.2f} {len(plain_list()) / 1024:>9.1f} "
+              f"{timed(summary_list, args.repeat):>16.2f} {len(summary_list()) / 1024:>11.1f} {timed(detail, args.repeat):>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,6 @@ class LevelUpApp {
     initialize() {
         this.loadStats();
         this.setupEventListeners();
-        this.checkAPIHealth();
     }
 
     setupEventListeners() {
@@ -30,30 +29,23 @@ class LevelUpApp {
         document.addEventListener('keydown', this.handleKeyboardNavigation.bind(this));
     }
 
-    async checkAPIHealth() {
-        try {
-            const response = await fetch('/health');
-            if (response.ok) {
-                console.log('API is healthy');
-            }
-        } catch (error) {
-            console.error('API health check failed:', error);
-            this.showNotification('API connection issues detected', 'warning');
-        }
-    }
-
     async loadStats() {
         try {
-            // Load flashcards count
-            const flashcardsResponse = await fetch(`${this.apiBaseUrl}/flashcards/`);
-            if (flashcardsResponse.ok) {
-                const flashcards = await flashcardsResponse.json();
-                this.stats.totalFlashcards = flashcards.length;
+            // One request for every home page number; also serves as the API health check
+            const response = await fetch(`${this.apiBaseUrl}/dashboard`);
+            if (!response.ok) {
+                throw new Error(`Dashboard request failed with status ${response.status}`);
             }
 
+            const dashboard = await response.json();
+            this.stats.totalFlashcards = dashboard.flashcards.total;
+            this.stats.quizzesTaken = dashboard.attempts.completed;
+            this.stats.averageScore = Math.round(dashboard.attempts.average_score);
+
             this.updateStatsDisplay();
         } catch (error) {
             console.error('Error loading stats:', error);
+            this.showNotification('API connection issues detected', 'warning');
         }
     }
 
@@ -180,8 +172,9 @@ function hideCreateFlashcardForm() {
 }
 
 async function extractFromYouTube() {
-    const url = document.getElementById('youtube-url').value;
-    if (!url) {
+    const input = document.getElementById('youtube-url').value;
+    const urls = input.split(/[\s,]+/).filter(url => url);
+    if (urls.length === 0) {
         app.showNotification('Please enter a YouTube URL', 'warning');
         return;
     }
@@ -194,7 +187,7 @@ async function extractFromYouTube() {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ url: url })
+            body: JSON.stringify({ urls: urls })
         });
 
         if (!response.ok) {
@@ -202,7 +195,22 @@ async function extractFromYouTube() {
         }
 
         const result = await response.json();
-        app.showNotification('Content extracted successfully!', 'success');
+        const saved = result.created + result.updated + result.existing;
+        if (result.failed && !saved) {
+            app.showNotification(`Failed to extract: ${result.results[0].error}`, 'error');
+            return;
+        }
+        // Generation is only queued when the server has an OpenAI key; each queued video carries its job ID
+        const generating = result.results.some(item => item.generation_job_id);
+        const extracted = result.failed
+            ? `Extracted ${saved} video(s), ${result.failed} failed`
+            : `Extracted ${saved} video(s)`;
+        app.showNotification(
+            generating
+                ? `${extracted}; flashcards are being generated`
+                : `${extracted}; flashcard generation is unavailable, so only the transcripts were saved`,
+            result.failed || !generating ? 'warning' : 'success'
+        );
         
         // Clear the input
         document.getElementById('youtube-url').value = '';
@@ -212,7 +220,7 @@ async function extractFromYouTube() {
         
     } catch (error) {
         console.error('Error extracting YouTube content:', error);
-        app.showNotification('Failed to extract YouTube content. Feature coming soon!', 'error');
+        app.showNotification('Failed to extract YouTube content', 'error');
     }
 }
 
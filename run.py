@@ -3,32 +3,121 @@
 LevelUp AI - Application Runner
 
 This script starts the FastAPI application with proper configuration.
+With server_mode=production it runs several worker processes instead of
+a single reloading one.
 """
 
 import sys
 import os
+import warnings
 import uvicorn
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+APP = "backend.app.main:app"
+
+def run_development(settings):
+    """One process, reloading on code changes in debug mode"""
+    uvicorn.run(
+        APP,
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug,
+        log_level="info" if settings.debug else "warning"
+    )
+
+def run_production(settings, workers: int):
+    """
+    Several uvicorn worker processes sharing one listening socket.
+
+    Each worker imports the app itself, so it opens its own SQLite
+    connections. With server_preload the app is imported once by a
+    gunicorn master and the workers are forked from it; the engine
+    discards inherited connections after the fork.
+    """
+    if settings.server_preload:
+        try:
+            import gunicorn  # noqa: F401
+        except ImportError:
+            print("⚠️  server_preload needs gunicorn (pip install gunicorn); starting workers without preload")
+        else:
+            run_gunicorn(settings, workers)
+            return
+
+    uvicorn.run(
+        APP,
+        host=settings.host,
+        port=settings.port,
+        workers=workers,
+        loop=settings.server_loop,
+        http=settings.server_http,
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.keepalive_timeout,
+        timeout_graceful_shutdown=settings.graceful_timeout,
+        log_level="warning",
+        access_log=False
+    )
+
+def run_gunicorn(settings, workers: int):
+    """gunicorn master with preloaded app and uvicorn workers"""
+    from gunicorn.app.base import BaseApplication
+    try:
+        from uvicorn_worker import UvicornWorker
+    except ImportError:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            from uvicorn.workers import UvicornWorker
+
+    # Workers are forked from the master, so a class defined here needs no import path
+    worker_class = type("LevelUpWorker", (UvicornWorker,), {
+        "CONFIG_KWARGS": {"loop": settings.server_loop, "http": settings.server_http}
+    })
+
+    class Server(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{settings.host}:{settings.port}",
+                "workers": workers,
+                "worker_class": worker_class,
+                "preload_app": True,
+                "keepalive": settings.keepalive_timeout,
+                "backlog": settings.server_backlog,
+                "graceful_timeout": settings.graceful_timeout,
+                "loglevel": "warning",
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from backend.app.main import app
+            return app
+
+    Server().run()
+
 def main():
     """Run the FastAPI application"""
     from backend.app.core.config import settings
-    
+
+    production = settings.server_mode == "production"
+    workers = (settings.workers or os.cpu_count() or 1) if production else 1
+
     print(f"🚀 Starting {settings.app_name} v{settings.app_version}")
     print(f"🌐 Server will be available at: http://{settings.host}:{settings.port}")
     print(f"📖 API documentation: http://{settings.host}:{settings.port}/docs")
     print(f"🔧 Debug mode: {settings.debug}")
+    if production:
+        print(f"⚙️  Production mode: {workers} workers, loop={settings.server_loop}, http={settings.server_http}"
+              f"{', preloaded' if settings.server_preload else ''}")
     print("-" * 50)
-    
-    uvicorn.run(
-        "backend.app.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.debug,
-        log_level="info" if settings.debug else "warning"
-    )
+
+    if production:
+        # Create or check the schema once, so workers starting together never race on create_all
+        from backend.app.core.database import init_db
+        init_db()
+        run_production(settings, workers)
+    else:
+        run_development(settings)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,71 @@
+"""Shared fixtures: the app on a throwaway database in a temporary working directory"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Settings, the engine and the asset manifest read these at import, so set them before importing the app
+WORKDIR = tempfile.mkdtemp(prefix="levelup-tests-")
+os.chdir(WORKDIR)
+os.symlink(os.path.join(PROJECT_ROOT, "frontend"), "frontend")
+os.environ.update({
+    "data_dir": "data",
+    "query_budget_mode": "raise",  # Any endpoint over its @query_budget fails its test
+    "rate_limit_backend": "off",
+    "job_workers": "0",  # Tests run job handlers directly
+    "startup_warmup": "false",
+    "transcript_fetcher": "fixtures",
+    "transcript_fixture_dir": os.path.join(WORKDIR, "data", "transcript_fixtures"),
+    "transcript_cache_dir": os.path.join(WORKDIR, "data", "transcript_cache"),
+})
+sys.path.insert(0, PROJECT_ROOT)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from backend.app.core.database import Base, SessionLocal, engine, init_db  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.services.dashboard_service import dashboard_cache  # noqa: E402
+from backend.app.services.dedupe_service import flashcard_index  # noqa: E402
+from backend.app.services.distractor_service import distractor_index  # noqa: E402
+
+def reset_state() -> None:
+    """Empty every table and the in-process indexes and caches built from them"""
+    init_db()
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    flashcard_index.clear()
+    distractor_index.clear()
+    dashboard_cache.clear()
+
+@pytest.fixture
+def client():
+    reset_state()
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def statements():
+    """SQL text of every statement the engine runs while the test holds the fixture"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
@@ -0,0 +1,57 @@
+"""ids= batch fetch: request order, missing ids and a single query"""
+from backend.app.core.batch import MISSING_IDS_HEADER
+from backend.app.models import YouTubeCard
+
+def create_flashcards(client, count: int) -> None:
+    for i in range(count):
+        response = client.post("/api/v1/flashcards/", json={
+            "question": f"Question {i} about topic{i}?",
+            "answer": f"Distinct answer {i} mentioning term{i}",
+            "category": f"cat{i}",
+        })
+        assert response.status_code == 201
+
+def test_flashcards_in_request_order_with_missing_ids(client):
+    create_flashcards(client, 5)
+    response = client.get("/api/v1/flashcards/?ids=4,2,99,4,1")
+    assert [card["id"] for card in response.json()] == [4, 2, 1]
+    assert [card["category"] for card in response.json()] == ["cat3", "cat1", "cat0"]
+    assert response.headers[MISSING_IDS_HEADER] == "99"
+
+def test_flashcards_loaded_with_one_query(client, statements):
+    create_flashcards(client, 5)
+    statements.clear()
+    response = client.get("/api/v1/flashcards/?ids=1,2,3,4,5")
+    assert len(response.json()) == 5
+    assert MISSING_IDS_HEADER not in response.headers
+    flashcard_queries = [statement for statement in statements if "FROM flashcards" in statement]
+    assert len(flashcard_queries) == 1 and " IN (" in flashcard_queries[0]
+    assert not [statement for statement in statements if statement.lstrip().startswith("SELECT categories.")]
+
+def test_projected_flashcards_keep_request_order(client):
+    create_flashcards(client, 3)
+    response = client.get("/api/v1/flashcards/?ids=3,7,1&fields=question,category")
+    assert response.json() == [
+        {"id": 3, "question": "Question 2 about topic2?", "category": "cat2"},
+        {"id": 1, "question": "Question 0 about topic0?", "category": "cat0"},
+    ]
+    assert response.headers[MISSING_IDS_HEADER] == "7"
+
+def test_quizzes_and_youtube_cards(client, db):
+    create_flashcards(client, 3)
+    for title in ("First", "Second"):
+        client.post("/api/v1/quiz/", json={"title": title, "flashcard_ids": [1, 2]})
+    response = client.get("/api/v1/quiz/?ids=2,5,1")
+    assert [quiz["title"] for quiz in response.json()] == ["Second", "First"]
+    assert response.headers[MISSING_IDS_HEADER] == "5"
+
+    db.add(YouTubeCard(title="Video", url="https://www.youtube.com/watch?v=abcdefghijk", video_id="abcdefghijk"))
+    db.commit()
+    response = client.get("/api/v1/youtube/?ids=2,1")
+    assert [card["title"] for card in response.json()] == ["Video"]
+    assert response.headers[MISSING_IDS_HEADER] == "2"
+
+def test_invalid_ids_rejected(client):
+    assert client.get("/api/v1/flashcards/?ids=1,a").status_code == 400
+    too_many = ",".join(str(i) for i in range(1, 502))
+    assert client.get(f"/api/v1/flashcards/?ids={too_many}").status_code == 400
@@ -0,0 +1,29 @@
+"""CORS headers reach browsers on every response, including the limiters' refusals"""
+from fastapi.middleware.cors import CORSMiddleware
+
+from backend.app.core.concurrency import ConcurrencyLimitMiddleware, Saturated
+from backend.app.main import app
+
+ORIGIN = {"Origin": "https://example.com"}
+
+def find_middleware(client, cls):
+    layer = client.app.middleware_stack
+    while not isinstance(layer, cls):
+        layer = layer.app
+    return layer
+
+class FullQueue:
+    name = "reads"
+
+    async def acquire(self):
+        raise Saturated("queue_full")
+
+def test_cors_is_the_outermost_middleware():
+    assert app.user_middleware[0].cls is CORSMiddleware
+
+def test_503_from_the_concurrency_limiter_has_cors_headers(client, monkeypatch):
+    monkeypatch.setattr(find_middleware(client, ConcurrencyLimitMiddleware), "limiters", {"reads": FullQueue()})
+    response = client.get("/api/v1/flashcards/", headers=ORIGIN)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
+    assert response.headers["access-control-allow-origin"] == ORIGIN["Origin"]
@@ -0,0 +1,8 @@
+"""The dashboard answers on its documented URL without a redirect"""
+import pytest
+
+@pytest.mark.parametrize("path", ["/api/v1/dashboard", "/api/v1/dashboard/"])
+def test_dashboard_is_served_without_redirect(client, path):
+    response = client.get(path, follow_redirects=False)
+    assert response.status_code == 200
+    assert response.json()["flashcards"]["total"] == 0
@@ -0,0 +1,58 @@
+"""Creating flashcards: one commit per card, and generated cards whose source YouTube card was deleted"""
+import pytest
+from sqlalchemy import event
+
+from backend.app.models import Category, Flashcard, YouTubeCard
+from backend.app.schemas.flashcard import FlashcardCreate
+from backend.app.services.flashcard_service import FlashcardService, SourceCardNotFoundError
+
+from conftest import reset_state
+
+@pytest.fixture
+def commits(db):
+    """Number of commits on the db session while the test holds the fixture"""
+    count = [0]
+
+    def after_commit(session):
+        count[0] += 1
+
+    event.listen(db, "after_commit", after_commit)
+    yield count
+    event.remove(db, "after_commit", after_commit)
+
+@pytest.fixture
+def source_card(db):
+    reset_state()
+    card = YouTubeCard(title="Source", url="https://www.youtube.com/watch?v=dQw4w9WgXcQ", video_id="dQw4w9WgXcQ")
+    db.add(card)
+    db.commit()
+    return card
+
+def test_new_category_and_source_count_in_one_commit(db, source_card, commits):
+    flashcard = FlashcardService(db).create_flashcard(FlashcardCreate(
+        question="What is 2+2?", answer="4", category="Maths", source_youtube_card_id=source_card.id
+    ))
+    assert commits[0] == 1
+    assert flashcard.category.name == "Maths"
+    db.refresh(source_card)
+    assert source_card.flashcard_count == 1
+
+def test_missing_source_card_leaves_nothing_behind(db, source_card):
+    with pytest.raises(SourceCardNotFoundError):
+        FlashcardService(db).create_flashcard(FlashcardCreate(
+            question="What is 2+2?", answer="4", category="Maths", source_youtube_card_id=source_card.id + 1
+        ))
+    assert db.query(Category).count() == 0
+    assert db.query(Flashcard).count() == 0
+
+def test_generated_card_for_deleted_source_is_skipped(db, source_card):
+    service = FlashcardService(db)
+    card = {"question": "What is 2+2?", "answer": "4"}
+    assert service.create_generated_flashcard(card, category="Maths", source_youtube_card_id=source_card.id)
+
+    db.delete(source_card)
+    db.commit()
+    skipped = service.create_generated_flashcard({"question": "Capital of France?", "answer": "Paris"},
+                                                 category="Geography", source_youtube_card_id=source_card.id)
+    assert skipped is None
+    assert [category.name for category in db.query(Category)] == ["Maths"]
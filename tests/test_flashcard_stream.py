@@ -0,0 +1,149 @@
+"""Streaming generation over Server-Sent Events against an in-process stub of the OpenAI stream"""
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import List, Optional
+
+import pytest
+
+from backend.app.core.config import settings
+
+def chunk(content: Optional[str] = None, finish_reason: Optional[str] = None) -> SimpleNamespace:
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=None)
+
+class StubStream:
+    """Yields the scripted deltas, then optionally fails like a dropped connection"""
+
+    def __init__(self, deltas: List[str], error: Optional[Exception] = None):
+        self.deltas = deltas
+        self.error = error
+        self.closed = False
+
+    def __iter__(self):
+        for delta in self.deltas:
+            yield chunk(delta)
+        if self.error:
+            raise self.error
+        yield chunk(finish_reason="stop")
+
+    def close(self):
+        self.closed = True
+
+class StubOpenAI:
+    """Stands in for openai.OpenAI; chat.completions.create returns the next scripted stream"""
+    streams: List[StubStream] = []
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        assert request["stream"] is True
+        return StubOpenAI.streams.pop(0)
+
+@pytest.fixture
+def stub_stream(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "stub")
+    monkeypatch.setattr("openai.OpenAI", StubOpenAI)
+
+    def script(deltas: List[str], error: Optional[Exception] = None) -> StubStream:
+        stream = StubStream(deltas, error)
+        StubOpenAI.streams = [stream]
+        return stream
+    return script
+
+def sse_events(body: str) -> List[tuple]:
+    events = []
+    for message in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in message.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+def stream(client, **body):
+    response = client.post("/api/v1/flashcards/generate/stream", json={"text": "Some study notes", **body})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return sse_events(response.text)
+
+# A response split mid-key and mid-string, wrapped in a code fence, with one
+# object that is not valid JSON, one without a question, and one cut off by the end of the stream
+DELTAS = [
+    '```json\n{"flashcards": [{"question": "What is 2+2?", "ans',
+    'wer": "4", "difficulty": "easy"}, {"question": "Capital of ',
+    'France?", "answer": "Paris"}, {"question": oops}, {"answer": "no question"},',
+    ' {"question": "Cut off", "answer": "Par',
+]
+
+def test_flashcard_event_per_card_before_done(client, stub_stream):
+    stub = stub_stream(DELTAS)
+    events = stream(client, max_cards=10)
+    assert [name for name, _ in events] == ["flashcard", "flashcard", "done"]
+    assert [data["question"] for _, data in events[:2]] == ["What is 2+2?", "Capital of France?"]
+    assert events[-1][1] == {"count": 2}
+    assert stub.closed
+
+def test_max_cards_stops_the_stream_early(client, stub_stream):
+    stub = stub_stream(DELTAS)
+    events = stream(client, max_cards=1)
+    assert [name for name, _ in events] == ["flashcard", "done"]
+    assert stub.closed
+
+def test_persisted_cards_are_saved_and_category_applied(client, stub_stream):
+    stub_stream(DELTAS)
+    events = stream(client, max_cards=10, persist=True, category="Maths")
+    saved = [data for name, data in events if name == "flashcard"]
+    assert [card["category"] for card in saved] == ["Maths", "Maths"]
+    assert all(card["id"] for card in saved)
+    assert len(client.get("/api/v1/flashcards/").json()) == 2
+
+def test_error_mid_stream_ends_with_error_event(client, stub_stream):
+    stub_stream(DELTAS[:2], error=ConnectionError("stream dropped"))
+    events = stream(client, max_cards=10)
+    assert [name for name, _ in events] == ["flashcard", "error"]
+    assert events[-1][1]["count"] == 1
+    assert "stream dropped" in events[-1][1]["detail"]
+
+def test_without_api_key(client, monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", None)
+    response = client.post("/api/v1/flashcards/generate/stream", json={"text": "notes"})
+    assert response.status_code == 503
+
+class TimelineStream(StubStream):
+    """Sends one whole card per delta and notes on the timeline when each is produced"""
+
+    def __init__(self, cards: List[dict], timeline: List[tuple]):
+        super().__init__([json.dumps(card) + "," for card in cards])
+        self.deltas[0] = '{"flashcards": [' + self.deltas[0]
+        self.timeline = timeline
+
+    def __iter__(self):
+        for number, delta in enumerate(self.deltas, start=1):
+            self.timeline.append(("produced", number))
+            yield chunk(delta)
+        yield chunk("]}", finish_reason="stop")
+
+def test_first_card_is_sent_before_the_last_is_generated(client, stub_stream):
+    # TestClient buffers the whole body, so drive the app over ASGI and note when each body chunk is sent
+    timeline = []
+    cards = [{"question": f"Question {i}?", "answer": f"Answer {i}"} for i in range(1, 4)]
+    StubOpenAI.streams = [TimelineStream(cards, timeline)]
+    body = json.dumps({"text": "Some study notes", "max_cards": 10}).encode()
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "scheme": "http", "server": ("testserver", 80), "client": ("testclient", 50000), "root_path": "",
+             "path": "/api/v1/flashcards/generate/stream", "raw_path": b"/api/v1/flashcards/generate/stream",
+             "query_string": b"", "headers": [(b"host", b"testserver"), (b"content-type", b"application/json")]}
+
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.Event().wait()  # The client stays connected until the response ends
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            timeline.extend(("sent", name) for name, _ in sse_events(message["body"].decode()))
+
+    asyncio.run(client.app(scope, receive, send))
+    assert timeline.index(("sent", "flashcard")) < timeline.index(("produced", len(cards)))
+    assert [entry for entry in timeline if entry[0] == "sent"] == [("sent", "flashcard")] * 3 + [("sent", "done")]
@@ -0,0 +1,74 @@
+"""flashcards.generate jobs for YouTube cards carry the card ID and read the transcript when they run"""
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.models import Job
+from backend.app.services import job_handlers
+from backend.app.services.transcript_cache import transcript_cache
+
+VIDEO_ID = "dQw4w9WgXcQ"
+SEGMENTS = [
+    {"text": "Water boils at one hundred degrees.", "start": 0.0, "duration": 4.0},
+    {"text": "Ice melts at zero degrees.", "start": 4.0, "duration": 4.0},
+]
+
+class StubAIService:
+    """Records the text each generation was asked for"""
+    texts = []
+
+    def generate_flashcards_from_text(self, text, max_cards=5):
+        StubAIService.texts.append(text)
+        return [{"question": f"Question {i}?", "answer": f"Answer {i}"} for i in range(max_cards)]
+
+@pytest.fixture
+def youtube_card(client, monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "stub")
+    monkeypatch.setattr(job_handlers, "AIService", StubAIService)
+    StubAIService.texts = []
+    os.makedirs(settings.transcript_fixture_dir, exist_ok=True)
+    path = os.path.join(settings.transcript_fixture_dir, f"{VIDEO_ID}.json")
+    with open(path, "w") as f:
+        json.dump({"title": "Boiling and melting", "segments": SEGMENTS}, f)
+    transcript_cache.clear()
+    response = client.post("/api/v1/youtube/extract", json={
+        "url": f"https://youtu.be/{VIDEO_ID}", "generate_flashcards": True, "max_flashcards": 2
+    })
+    os.remove(path)
+    assert response.status_code == 200
+    [result] = response.json()["results"]
+    return result
+
+def run_job(db, job_id: int) -> dict:
+    job = db.get(Job, job_id)
+    assert job.kind == "flashcards.generate"
+    context = SimpleNamespace(job_id=job_id, attempt=1, report_progress=lambda *args: None)
+    return job_handlers.generate_flashcards(context, job.payload)
+
+def test_extract_queues_card_id_not_transcript(client, db, youtube_card):
+    payload = db.get(Job, youtube_card["generation_job_id"]).payload
+    assert "text" not in payload
+    assert payload["source_youtube_card_id"] == youtube_card["card_id"]
+
+    result = run_job(db, youtube_card["generation_job_id"])
+    assert result["count"] == 2
+    assert StubAIService.texts == [" ".join(segment["text"] for segment in SEGMENTS)]
+
+def test_window_job_reads_the_window_when_it_runs(client, db, youtube_card):
+    response = client.post(f"/api/v1/youtube/{youtube_card['card_id']}/generate-flashcards",
+                           params={"start_ms": 4000, "max_flashcards": 1})
+    assert response.status_code == 202
+    payload = db.get(Job, response.json()["id"]).payload
+    assert "text" not in payload
+    assert (payload["start_ms"], payload["end_ms"]) == (4000, None)
+
+    assert run_job(db, response.json()["id"])["count"] == 1
+    assert StubAIService.texts == ["Ice melts at zero degrees."]
+
+def test_job_for_deleted_card_is_a_no_op(client, db, youtube_card):
+    assert client.delete(f"/api/v1/youtube/{youtube_card['card_id']}").status_code == 204
+    assert run_job(db, youtube_card["generation_job_id"]) == {"flashcard_ids": [], "count": 0}
+    assert StubAIService.texts == []
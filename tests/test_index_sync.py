@@ -0,0 +1,65 @@
+"""In-process indexes follow writes made by other worker processes"""
+from backend.app.core.config import settings
+from backend.app.services.dedupe_service import DedupeService, NearDuplicateIndex
+from backend.app.services.distractor_service import DistractorIndex, DistractorService
+
+def create(client, question: str, answer: str) -> int:
+    response = client.post("/api/v1/flashcards/", json={"question": question, "answer": answer})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+def test_dedupe_index_picks_up_other_workers_writes(client, db):
+    # The app's own index stands in for another worker; this one belongs to "our" process
+    index = NearDuplicateIndex(settings.dedupe_num_perm, settings.dedupe_bands)
+    service = DedupeService(db, index)
+    kept = create(client, "What is the boiling point of water at sea level?", "100 degrees Celsius")
+    edited = create(client, "Which planet is known as the red planet?", "Mars")
+    deleted = create(client, "Who wrote the play Romeo and Juliet?", "William Shakespeare")
+    service.ensure_loaded()
+    assert set(index.signatures()) == {kept, edited, deleted}
+
+    added = create(client, "What is the chemical symbol for gold?", "Au")
+    assert client.put(f"/api/v1/flashcards/{edited}",
+                      json={"question": "What is the largest planet in the solar system?", "answer": "Jupiter"}
+                      ).status_code == 200
+    assert client.delete(f"/api/v1/flashcards/{deleted}").status_code == 204
+
+    db.rollback()  # End the read transaction, as a new request's session would
+    service.ensure_loaded()
+    assert set(index.signatures()) == {kept, edited, added}
+    jupiter = service.signature_for("What is the largest planet in the solar system?", "Jupiter")
+    assert [match[0] for match in index.query(jupiter, 0.99)] == [edited]
+
+def test_dedupe_index_skips_catch_up_when_nothing_changed(client, db, statements):
+    create(client, "What is the chemical symbol for gold?", "Au")
+    service = DedupeService(db, NearDuplicateIndex(settings.dedupe_num_perm, settings.dedupe_bands))
+    service.ensure_loaded()
+    del statements[:]
+    service.ensure_loaded()
+    assert len(statements) == 1 and "table_versions" in statements[0]
+
+def test_distractor_index_picks_up_other_workers_writes(client, db):
+    index = DistractorIndex()
+    cards = {answer: create(client, f"Question about {answer}?", answer)
+             for answer in ("Red apple", "Green apple", "Yellow banana", "Purple grape")}
+    DistractorService(db, index).ensure_loaded()
+    assert len(index) == 4
+
+    assert client.put(f"/api/v1/flashcards/{cards['Green apple']}", json={"answer": "Green pear"}).status_code == 200
+    assert client.delete(f"/api/v1/flashcards/{cards['Purple grape']}").status_code == 204
+    added = create(client, "Question about cherries?", "Red cherry")
+
+    db.rollback()  # End the read transaction, as a new request's session would
+    DistractorService(db, index).ensure_loaded()
+    assert len(index) == 4
+    options = set(index.distractors(cards["Red apple"], 3))
+    assert options == {"Green pear", "Yellow banana", "Red cherry"}
+    assert index.distractors(added, 3)
+
+def test_distractor_index_skips_catch_up_when_nothing_changed(client, db, statements):
+    create(client, "What is the chemical symbol for gold?", "Au")
+    index = DistractorIndex()
+    DistractorService(db, index).ensure_loaded()
+    del statements[:]
+    DistractorService(db, index).ensure_loaded()
+    assert len(statements) == 1 and "table_versions" in statements[0]
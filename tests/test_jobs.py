@@ -0,0 +1,82 @@
+"""Job queue leases, retry backoff and watch-history upload cleanup"""
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.services import job_handlers
+from backend.app.services.job_service import JobService, _utcnow
+
+from conftest import reset_state
+
+@pytest.fixture
+def jobs(db):
+    reset_state()
+    return JobService(db)
+
+def expire_lease(jobs, job) -> None:
+    job.lease_expires_at = _utcnow() - timedelta(seconds=1)
+    jobs.db.commit()
+
+def test_outcome_of_a_worker_that_lost_its_lease_is_discarded(jobs):
+    job = jobs.enqueue_job("flashcards.generate", {"text": "notes"})
+    assert jobs.claim_next_job("worker-a", 60).id == job.id
+    expire_lease(jobs, job)
+    assert jobs.claim_next_job("worker-b", 60).id == job.id
+
+    assert jobs.complete_job(job.id, "worker-a", {"count": 1}) is None
+    assert jobs.fail_job(job.id, "worker-a", "late failure") is None
+    job = jobs.get_job_by_id(job.id)
+    assert (job.status, job.worker_id, job.error) == ("running", "worker-b", None)
+
+    job = jobs.complete_job(job.id, "worker-b", {"count": 2})
+    assert (job.status, job.result, job.progress) == ("succeeded", {"count": 2}, 1.0)
+
+def test_failed_attempts_back_off_before_the_retry(jobs, monkeypatch):
+    monkeypatch.setattr(settings, "job_retry_backoff", 5.0)
+    job = jobs.enqueue_job("flashcards.generate", {"text": "notes"}, max_attempts=3)
+
+    for attempt, backoff in ((1, 5), (2, 10)):
+        claimed = jobs.claim_next_job("worker", 60)
+        assert (claimed.id, claimed.attempts) == (job.id, attempt)
+        failed = jobs.fail_job(job.id, "worker", "boom")
+        assert failed.status == "queued"
+        assert failed.run_after - _utcnow() == pytest.approx(timedelta(seconds=backoff), abs=timedelta(seconds=1))
+        assert jobs.claim_next_job("worker", 60) is None  # Not runnable until run_after
+        failed.run_after = _utcnow() - timedelta(seconds=1)
+        jobs.db.commit()
+
+    assert jobs.claim_next_job("worker", 60).attempts == 3
+    job = jobs.fail_job(job.id, "worker", "boom")
+    assert (job.status, job.error) == ("failed", "boom")
+    assert job.finished_at is not None
+
+@pytest.fixture
+def failing_import(tmp_path, monkeypatch):
+    def import_file(self, f, batch_size=None, progress=None):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(job_handlers.WatchHistoryService, "import_file", import_file)
+    path = tmp_path / "watch-history.json"
+    path.write_text("[]")
+    return path
+
+def run_import(path, attempt: int, max_attempts: int) -> None:
+    context = SimpleNamespace(attempt=attempt, max_attempts=max_attempts, report_progress=lambda *args: None)
+    with pytest.raises(RuntimeError, match="database is locked"):
+        job_handlers.import_watch_history(context, {"path": str(path)})
+
+def test_upload_is_kept_until_the_jobs_last_attempt(failing_import, monkeypatch):
+    monkeypatch.setattr(settings, "job_max_attempts", 1)  # The job's own max_attempts decides
+    run_import(failing_import, attempt=1, max_attempts=2)
+    assert failing_import.exists()
+    run_import(failing_import, attempt=2, max_attempts=2)
+    assert not failing_import.exists()
+
+def test_failed_cleanup_does_not_hide_the_import_error(failing_import, monkeypatch):
+    def remove(path):
+        raise PermissionError("upload is read-only")
+
+    monkeypatch.setattr(job_handlers.os, "remove", remove)
+    run_import(failing_import, attempt=2, max_attempts=2)
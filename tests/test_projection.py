@@ -0,0 +1,67 @@
+"""fields= projection: the emitted SQL selects only the requested columns, and responses shrink"""
+from backend.app.models import YouTubeCard
+
+def select_columns(statements, table: str) -> str:
+    """The column list of the one SELECT that reads the table"""
+    selects = [statement for statement in statements
+               if statement.lstrip().startswith("SELECT") and f"FROM {table}" in statement]
+    assert len(selects) == 1, selects
+    return selects[0].split("FROM")[0]
+
+def create_flashcards(client, count: int) -> None:
+    for i in range(count):
+        response = client.post("/api/v1/flashcards/", json={
+            "question": f"Question {i} about topic{i}?",
+            "answer": f"A fairly long answer number {i} that pads out the full response, mentioning term{i}",
+            "category": "Science",
+            "tags": ["physics", "chemistry"],
+        })
+        assert response.status_code == 201
+
+def test_flashcard_projection_selects_only_requested_columns(client, statements):
+    create_flashcards(client, 3)
+    statements.clear()
+    response = client.get("/api/v1/flashcards/?fields=question")
+    assert response.json()[0] == {"id": 1, "question": "Question 0 about topic0?"}
+
+    columns = select_columns(statements, "flashcards")
+    assert "flashcards.id" in columns and "flashcards.question" in columns
+    for unrequested in ("flashcards.answer", "flashcards.tags", "flashcards.created_at", "categories.name"):
+        assert unrequested not in columns
+    assert "JOIN categories" not in " ".join(statements)
+
+def test_category_projection_joins_categories(client, statements):
+    create_flashcards(client, 1)
+    statements.clear()
+    response = client.get("/api/v1/flashcards/?fields=category")
+    assert response.json() == [{"id": 1, "category": "Science"}]
+    assert "categories.name" in select_columns(statements, "flashcards")
+
+def test_flashcard_projection_shrinks_response(client):
+    create_flashcards(client, 20)
+    full = client.get("/api/v1/flashcards/", headers={"Accept-Encoding": "identity"})
+    projected = client.get("/api/v1/flashcards/?fields=question", headers={"Accept-Encoding": "identity"})
+    assert len(projected.json()) == len(full.json()) == 20
+    assert len(projected.content) < len(full.content) / 2
+
+def test_youtube_projection_never_loads_transcripts(client, db, statements):
+    card = YouTubeCard(title="Lecture", url="https://www.youtube.com/watch?v=abcdefghijk", video_id="abcdefghijk",
+                       description="A long description " * 50)
+    card.transcript = "word " * 5000
+    db.add(card)
+    db.commit()
+
+    statements.clear()
+    projected = client.get("/api/v1/youtube/?fields=title", headers={"Accept-Encoding": "identity"})
+    assert projected.json() == [{"id": 1, "title": "Lecture"}]
+    columns = select_columns(statements, "youtube_cards")
+    assert "youtube_cards.title" in columns
+    assert "transcript_data" not in columns and "youtube_cards.description" not in columns
+
+    full = client.get("/api/v1/youtube/", headers={"Accept-Encoding": "identity"})
+    assert len(projected.content) < len(full.content)
+
+def test_unknown_field_rejected(client):
+    response = client.get("/api/v1/flashcards/?fields=question,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["detail"]
@@ -0,0 +1,61 @@
+"""Statement budgets hold in raise mode, on a fresh database and with rows that have relationships"""
+import pytest
+
+from backend.app.models import YouTubeCard
+
+FLASHCARD_READS = [
+    "/api/v1/flashcards/",
+    "/api/v1/flashcards/?search=Question",
+    "/api/v1/flashcards/?category=cat1",
+    "/api/v1/flashcards/?difficulty=hard",
+    "/api/v1/flashcards/my-flashcards/",
+    "/api/v1/flashcards/1",
+    "/api/v1/flashcards/stats/overview",
+    "/api/v1/flashcards/categories/",
+]
+OTHER_READS = [
+    "/api/v1/quiz/",
+    "/api/v1/quiz/1",
+    "/api/v1/quiz/1/questions",
+    "/api/v1/quiz/1/statistics",
+    "/api/v1/youtube/",
+    "/api/v1/youtube/1",
+    "/api/v1/dashboard",
+]
+
+def populate(client, db, cards: int = 6) -> None:
+    db.add(YouTubeCard(title="Video", url="https://www.youtube.com/watch?v=abcdefghijk", video_id="abcdefghijk"))
+    db.commit()
+    for i in range(cards):
+        response = client.post("/api/v1/flashcards/", json={
+            "question": f"Question {i} about topic{i}?",
+            "answer": f"Distinct answer {i} mentioning term{i}",
+            "category": f"cat{i}",
+            "difficulty": "hard",
+            "source_youtube_card_id": 1,
+        })
+        assert response.status_code == 201
+    for title in ("First", "Second"):
+        assert client.post("/api/v1/quiz/", json={"title": title, "flashcard_ids": [1, 2, 3, 4]}).status_code == 201
+
+@pytest.mark.parametrize("path", FLASHCARD_READS + OTHER_READS)
+def test_fresh_database_within_budget(client, path):
+    # The first request also creates the default user
+    assert client.get(path).status_code in (200, 404)
+
+@pytest.mark.parametrize("path", FLASHCARD_READS + OTHER_READS)
+def test_populated_database_within_budget(client, db, path):
+    populate(client, db)
+    assert client.get(path).status_code == 200
+
+def test_flashcard_list_loads_categories_with_the_rows(client, db, statements):
+    populate(client, db)
+    statements.clear()
+    response = client.get("/api/v1/flashcards/")
+    assert {card["category"] for card in response.json()} == {f"cat{i}" for i in range(6)}
+    assert not [statement for statement in statements if statement.lstrip().startswith("SELECT categories.")]
+    assert len(statements) == 3  # User, table versions, flashcards joined to categories
+
+def test_quiz_delete_within_budget(client, db):
+    populate(client, db)
+    assert client.delete("/api/v1/quiz/1").status_code == 204
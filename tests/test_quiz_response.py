@@ -0,0 +1,9 @@
+"""Quiz list and detail responses describe the quiz without its questions or answers"""
+def test_quiz_responses_do_not_embed_answers(client):
+    for i in range(2):
+        assert client.post("/api/v1/flashcards/", json={"question": f"Question {i}?", "answer": f"Answer {i}"}
+                           ).status_code == 201
+    quiz = client.post("/api/v1/quiz/", json={"title": "Quiz", "flashcard_ids": [1, 2]}).json()
+    for body in (quiz, client.get(f"/api/v1/quiz/{quiz['id']}").json(), client.get("/api/v1/quiz/").json()[0]):
+        assert set(body) == {"id", "title", "description", "total_questions", "created_at"}
+    assert len(client.get(f"/api/v1/quiz/{quiz['id']}/questions").json()) == quiz["total_questions"] == 2
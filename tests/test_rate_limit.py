@@ -0,0 +1,72 @@
+"""Token-bucket refill math and the 429 response of the rate limit middleware"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+
+from backend.app.core import rate_limit
+from backend.app.core.rate_limit import MemoryBuckets, RateLimitMiddleware, SQLiteBuckets, parse_rate
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Both clocks the bucket stores read, frozen until the test advances now[0]"""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=lambda: now[0], time=lambda: now[0]))
+    return now
+
+def test_parse_rate():
+    assert parse_rate("20/minute") == (20, 20 / 60)
+    assert parse_rate("5/ hour") == (5, 5 / 3600)
+    for rate in ("0/minute", "ten/minute", "5/fortnight", "5"):
+        with pytest.raises(ValueError):
+            parse_rate(rate)
+
+@pytest.mark.parametrize("store", ["memory", "sqlite"])
+def test_bucket_refill(store, clock, tmp_path):
+    buckets = MemoryBuckets() if store == "memory" else SQLiteBuckets(str(tmp_path / "rate_limits.db"))
+    take = lambda: buckets.take("ai:ip:1.2.3.4", 2, 1.0)  # noqa: E731 - 2 tokens, refilled at 1 per second
+
+    assert take() == 0
+    assert take() == 0
+    assert take() == pytest.approx(1.0)  # Empty: a full token is a second away
+    clock[0] += 0.25
+    assert take() == pytest.approx(0.75)  # Refused takes do not spend the partial token
+    clock[0] += 0.75
+    assert take() == 0
+    assert take() == pytest.approx(1.0)
+
+    clock[0] += 3600
+    assert [take() for _ in range(3)] == [0, 0, pytest.approx(1.0)]  # Refill stops at capacity
+
+def test_buckets_are_per_key(clock):
+    buckets = MemoryBuckets()
+    assert buckets.take("ai:ip:1.2.3.4", 1, 1.0) == 0
+    assert buckets.take("ai:ip:1.2.3.4", 1, 1.0) > 0
+    assert buckets.take("ai:ip:5.6.7.8", 1, 1.0) == 0
+
+async def ok(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+def test_429_with_retry_after(clock):
+    client = TestClient(RateLimitMiddleware(ok, limits={"ai": "2/minute"}, backend="memory"))
+    generate = lambda: client.post("/api/v1/flashcards/generate")  # noqa: E731
+
+    assert [generate().status_code for _ in range(2)] == [200, 200]
+    refused = generate()
+    assert refused.status_code == 429
+    assert refused.headers["Retry-After"] == "30"  # One token every 30 s
+    assert "ai" in refused.json()["detail"]
+
+    # Other groups have their own buckets, or no limit at all
+    assert client.get("/api/v1/flashcards/").status_code == 200
+    clock[0] += 29
+    assert generate().headers["Retry-After"] == "1"
+    clock[0] += 1
+    assert generate().status_code == 200
+
+def test_retry_after_is_at_least_one_second(clock):
+    client = TestClient(RateLimitMiddleware(ok, limits={"ai": "10/second"}, backend="memory"))
+    responses = [client.post("/api/v1/flashcards/generate") for _ in range(11)]
+    assert responses[-1].status_code == 429
+    assert responses[-1].headers["Retry-After"] == "1"  # 0.1 s rounded up
@@ -0,0 +1,85 @@
+"""Asset builds keep the previous hashed files for a grace period; build bookkeeping is never served"""
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.cli import build_assets as build_module
+from backend.app.cli.build_assets import build_assets
+from backend.app.core.static_assets import AssetManifest, PrecompressedStaticFiles
+
+CSS = "body { color: #333; margin: 0 auto; }\n" * 50
+
+@pytest.fixture
+def assets(tmp_path):
+    source, output = tmp_path / "static", tmp_path / "dist"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "app.css").write_text(CSS)
+
+    def build(css=None, **kwargs):
+        if css is not None:
+            (source / "css" / "app.css").write_text(css)
+        return build_assets(str(source), str(output), **kwargs)["css/app.css"]["hashed"]
+    build.source, build.output = source, output
+    return build
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(build_module, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+def test_rebuild_keeps_replaced_files_for_the_grace_period(assets, clock):
+    first = assets()
+    second = assets(CSS + "p { margin: 0; }\n", grace_period=60)
+    assert (assets.output / first).exists() and (assets.output / (first + ".gz")).exists()
+    assert json.loads((assets.output / "retired.json").read_text()) == {first: clock[0]}
+
+    clock[0] += 30
+    third = assets(CSS + "a { color: blue; }\n", grace_period=60)
+    assert (assets.output / first).exists() and (assets.output / second).exists()
+    assert set(json.loads((assets.output / "retired.json").read_text())) == {first, second}
+
+    clock[0] += 45  # First retired 75 s ago, second 45 s ago
+    assets(CSS, grace_period=60)  # Back to the first build's content, so its file is current again
+    assert (assets.output / first).exists() and (assets.output / second).exists()
+    assert set(json.loads((assets.output / "retired.json").read_text())) == {second, third}
+
+    clock[0] += 61
+    assets(grace_period=60)
+    assert not (assets.output / second).exists() and not (assets.output / third).exists()
+    assert json.loads((assets.output / "retired.json").read_text()) == {}
+
+@pytest.fixture
+def client(assets):
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(assets.source), build_directory=str(assets.output),
+                                                  manifest=AssetManifest(str(assets.output))))
+    return TestClient(app)
+
+def test_build_bookkeeping_and_variants_are_not_served(assets, client):
+    hashed = assets()
+    assert client.get("/static/manifest.json").status_code == 404
+    assert client.get(f"/static/{hashed}.gz").status_code == 404
+
+    response = client.get(f"/static/{hashed}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.text == CSS
+
+def test_source_files_with_build_names_are_still_served(assets, client):
+    assets()
+    (assets.source / "manifest.json").write_text('{"name": "LevelUp"}')
+    response = client.get("/static/manifest.json")
+    assert response.json() == {"name": "LevelUp"}
+    assert response.headers["Cache-Control"] == "no-cache"
+
+def test_retired_files_are_served_as_immutable(assets, client):
+    first = assets()
+    assets(CSS + "p { margin: 0; }\n")
+    assert client.get("/static/retired.json").status_code == 404
+    response = client.get(f"/static/{first}")
+    assert response.status_code == 200
+    assert "immutable" in response.headers["Cache-Control"]
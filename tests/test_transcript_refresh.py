@@ -0,0 +1,58 @@
+"""refresh=true on /youtube/extract skips the transcript cache, negative entries included, and rewrites it"""
+import json
+import os
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.services.transcript_cache import transcript_cache
+
+VIDEO_ID = "dQw4w9WgXcQ"
+URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+@pytest.fixture
+def fixture_path():
+    os.makedirs(settings.transcript_fixture_dir, exist_ok=True)
+    path = os.path.join(settings.transcript_fixture_dir, f"{VIDEO_ID}.json")
+    transcript_cache.clear()
+    yield path
+    if os.path.exists(path):
+        os.remove(path)
+    transcript_cache.clear()
+
+def write_fixture(path: str, transcript: str) -> None:
+    with open(path, "w") as f:
+        json.dump({"title": "Fixture video", "transcript": transcript}, f)
+
+def extract(client, refresh: bool = False) -> dict:
+    response = client.post("/api/v1/youtube/extract",
+                           json={"url": URL, "generate_flashcards": False, "refresh": refresh})
+    assert response.status_code == 200
+    [result] = response.json()["results"]
+    return result
+
+def test_refresh_bypasses_negative_entry(client, fixture_path):
+    assert extract(client)["status"] == "failed"
+    assert transcript_cache.get(VIDEO_ID, ["en"])["missing"]
+
+    # Captions added later: the negative entry still answers until refresh
+    write_fixture(fixture_path, "Captions added later")
+    assert extract(client)["status"] == "failed"
+
+    result = extract(client, refresh=True)
+    assert result["status"] == "created"
+    entry = transcript_cache.get(VIDEO_ID, ["en"])
+    assert not entry.get("missing")
+    assert entry["transcript"] == "Captions added later"
+
+def test_refresh_overwrites_cached_transcript(client, fixture_path):
+    write_fixture(fixture_path, "First version")
+    assert extract(client)["status"] == "created"
+
+    write_fixture(fixture_path, "Second version")
+    assert transcript_cache.get(VIDEO_ID, ["en"])["transcript"] == "First version"
+
+    assert extract(client, refresh=True)["status"] == "updated"
+    assert transcript_cache.get(VIDEO_ID, ["en"])["transcript"] == "Second version"
+    card = client.get("/api/v1/youtube/").json()[0]
+    assert client.get(f"/api/v1/youtube/{card['id']}").json()["transcript"] == "Second version"